@@ -0,0 +1,7 @@
+import os
+
+# Request tracing (Server-Timing header is always returned)
+# Where finished traces are written: "none", "stdout" or "file"
+TRACE_EXPORTER = os.getenv("TRACE_EXPORTER", "none")
+# JSON-lines file used when TRACE_EXPORTER=file
+TRACE_FILE = os.getenv("TRACE_FILE", "traces.jsonl")
@@ -1,8 +1,29 @@
 # app/main.py
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 from app.routers import plan_routes
+from app.services.metrics import MetricsMiddleware, METRICS_CONTENT_TYPE, render_metrics
+from app.services.tracing import TRACE_HEADER, start_trace, server_timing_header, export_trace
 
 app = FastAPI(title="AI Workout Microservice")
 
-app.include_router(plan_routes.router)
\ No newline at end of file
+# Trace every request (joining the caller's trace ID) and report the time spent
+# in the LLM call in a Server-Timing header
+@app.middleware("http")
+async def request_tracing(request: Request, call_next):
+    trace = start_trace(request.headers.get(TRACE_HEADER))
+    response = await call_next(request)
+    response.headers["Server-Timing"] = server_timing_header(trace)
+    response.headers[TRACE_HEADER] = trace.trace_id
+    export_trace(trace, request.method, request.url.path, response.status_code)
+    return response
+
+# Request latency and in-flight metrics (outermost, so it times the whole request)
+app.add_middleware(MetricsMiddleware)
+
+# Prometheus metrics (request latency, in-flight requests, LLM latency and tokens)
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return Response(content=render_metrics(), media_type=METRICS_CONTENT_TYPE)
+
+app.include_router(plan_routes.router)
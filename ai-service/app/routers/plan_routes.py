@@ -1,13 +1,17 @@
 # app/routers/plan_routes.py
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Header, HTTPException
+from typing import Optional
 from app.schemas.plan_schemas import AIPlanRequest, WorkoutPlan
 from app.services.llm_client import generate_plan_with_llm
 
 router = APIRouter()
 
 @router.post("/ai/generate",response_model = WorkoutPlan)
-def generate_workout_plan(request_data:AIPlanRequest):
+def generate_workout_plan(
+    request_data:AIPlanRequest,
+    deadline_ms: Optional[int] = Header(None, alias="X-Request-Deadline-Ms")
+):
     """
     Endpoint to generate a personalized workout plan.
 
@@ -16,6 +20,7 @@ def generate_workout_plan(request_data:AIPlanRequest):
 
     Args:
         request_data (AIPlanRequest): Includes user_profile and last_plan (optional) and list of tuples (exercise name,equipment)
+        deadline_ms (optional): How long the caller waits for this response, used as the LLM call timeout
 
     Returns:
         WorkoutPlan: The AI-generated workout plan
@@ -23,7 +28,10 @@ def generate_workout_plan(request_data:AIPlanRequest):
 
     try:
         # Call the core logic to generate a new plan
-        new_plan = generate_plan_with_llm(request_data.user_profile, request_data.last_plan, request_data.allowed_exercises)
+        timeout = deadline_ms / 1000 if deadline_ms else None
+        new_plan = generate_plan_with_llm(
+            request_data.user_profile, request_data.last_plan, request_data.allowed_exercises, timeout=timeout
+        )
         return new_plan
 
     except Exception as e:
@@ -2,11 +2,14 @@
 
 import os
 import json
+import time
 import openai
 from datetime import datetime
 from typing import Optional, List, Tuple
 from dotenv import load_dotenv
 from app.services.prompt_templates import system_prompt_generate_plan
+from app.services.tracing import span
+from app.services.metrics import observe_llm_call
 
 from app.schemas.plan_schemas import (
     UserProfile,
@@ -26,7 +29,8 @@ openai.api_base = "https://openrouter.ai/api/v1"
 def generate_plan_with_llm(
     user: UserProfile,
     last_plan: Optional[LastWorkoutPlan],
-    allowed_exercises: List[Tuple[str, str]]
+    allowed_exercises: List[Tuple[str, str]],
+    timeout: Optional[float] = None
 ) -> WorkoutPlan:
     """
     Generates a new WorkoutPlan using OpenRouter-hosted LLM,
@@ -37,6 +41,7 @@ def generate_plan_with_llm(
         user (UserProfile): The user's profile.
         last_plan (LastWorkoutPlan | None): Previous plan for context.
         allowed_exercises (List[Tuple[str, str]]): Valid exercises.
+        timeout (float | None): Seconds the LLM call may take (the caller's remaining deadline).
 
     Returns:
         WorkoutPlan: A new plan that adheres to the schema and uses only valid exercises.
@@ -79,30 +84,41 @@ def generate_plan_with_llm(
     )
 
     # Call the LLM
-    response = openai.ChatCompletion.create(
-        model="mistralai/mistral-7b-instruct:free",
-        messages=[
-            {"role": "system", "content": system_prompt_generate_plan},
-            {"role": "user", "content": user_prompt}
-        ],
-        temperature=0,
-        max_tokens=2000
-    )
+    model = "mistralai/mistral-7b-instruct:free"
+    with span("llm", model=model) as attributes:
+        start = time.perf_counter()
+        outcome, usage = "error", None
+        try:
+            response = openai.ChatCompletion.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": system_prompt_generate_plan},
+                    {"role": "user", "content": user_prompt}
+                ],
+                temperature=0,
+                max_tokens=2000,
+                request_timeout=timeout
+            )
+            outcome, usage = "ok", response.get("usage") or {}
+            attributes["total_tokens"] = usage.get("total_tokens")
+        finally:
+            observe_llm_call(model, outcome, time.perf_counter() - start, usage)
 
     response_text = response["choices"][0]["message"]["content"]
 
     print("Raw LLM response:\n", response_text)
 
-    try:
-        plan_dict = json.loads(response_text)
-        print("JSON parsed successfully.")
-    except json.JSONDecodeError:
-        print("Failed to parse JSON from LLM!")
-        raise ValueError("LLM returned invalid JSON:\n" + response_text)
-
-    try:
-        return WorkoutPlan(**plan_dict)
-    except Exception as e:
-        print("JSON did not match WorkoutPlan schema!")
-        raise ValueError(f"JSON structure mismatch with WorkoutPlan schema:\n{e}\n\nRaw output:\n{plan_dict}")
+    with span("parse"):
+        try:
+            plan_dict = json.loads(response_text)
+            print("JSON parsed successfully.")
+        except json.JSONDecodeError:
+            print("Failed to parse JSON from LLM!")
+            raise ValueError("LLM returned invalid JSON:\n" + response_text)
+
+        try:
+            return WorkoutPlan(**plan_dict)
+        except Exception as e:
+            print("JSON did not match WorkoutPlan schema!")
+            raise ValueError(f"JSON structure mismatch with WorkoutPlan schema:\n{e}\n\nRaw output:\n{plan_dict}")
 
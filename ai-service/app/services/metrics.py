@@ -0,0 +1,66 @@
+# app/services/metrics.py
+# Prometheus metrics of the AI service, served at GET /metrics: request latency,
+# in-flight requests, and LLM call latency and token usage.
+
+from typing import Optional
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+from app.services.observability import RequestMetricsMiddleware
+
+# Latency buckets (seconds): requests and LLM calls take seconds, not milliseconds
+LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+LLM_BUCKETS = (0.25, 0.5, 1.0, 2.5, 5.0, 7.5, 10.0, 15.0, 20.0, 30.0, 45.0, 60.0)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time spent handling HTTP requests",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being handled",
+    ["method"],
+)
+
+LLM_LATENCY = Histogram(
+    "llm_request_duration_seconds",
+    "Time spent waiting for the LLM completion",
+    ["model", "outcome"],
+    buckets=LLM_BUCKETS,
+)
+
+LLM_TOKENS = Counter(
+    "llm_tokens_total",
+    "Tokens consumed by LLM calls, as reported by the provider",
+    ["model", "kind"],
+)
+
+METRICS_CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+
+class MetricsMiddleware(RequestMetricsMiddleware):
+    """
+    Records the latency and in-flight count of every HTTP request into REQUEST_LATENCY
+    and REQUESTS_IN_PROGRESS (see observability.RequestMetricsMiddleware).
+    """
+
+    def __init__(self, app):
+        super().__init__(app, REQUEST_LATENCY, REQUESTS_IN_PROGRESS)
+
+
+def observe_llm_call(model: str, outcome: str, seconds: float, usage: Optional[dict] = None) -> None:
+    """
+    Records one LLM call: its latency, and the prompt/completion token counts if reported.
+    """
+    LLM_LATENCY.labels(model, outcome).observe(seconds)
+    for kind in ("prompt_tokens", "completion_tokens"):
+        if usage and usage.get(kind):
+            LLM_TOKENS.labels(model, kind.split("_")[0]).inc(usage[kind])
+
+
+def render_metrics() -> bytes:
+    """
+    Returns all metrics in the Prometheus text exposition format.
+    """
+    return generate_latest()
@@ -0,0 +1,23 @@
+# app/services/tracing.py
+# Request tracing for the AI service: joins the caller's trace ID, records spans
+# (the LLM call, response parsing) and reports them in a Server-Timing header.
+# The trace itself is the shared observability module; this adds the exporter.
+
+from app.core.config import TRACE_EXPORTER, TRACE_FILE
+from app.services.observability import (
+    TRACE_HEADER,
+    Trace,
+    server_timing_header,
+    span,
+    start_trace,
+    write_trace,
+)
+
+SERVICE_NAME = "ai-service"
+
+
+def export_trace(trace: Trace, method: str, path: str, status_code: int) -> None:
+    """
+    Writes the finished trace as one JSON line to the configured exporter.
+    """
+    write_trace(trace, SERVICE_NAME, method, path, status_code, TRACE_EXPORTER, TRACE_FILE)
@@ -8,3 +8,99 @@ AI_SERVICE_URL = os.getenv("AI_SERVICE_URL", "http://localhost:8002")
 # JWT secret and algorithm settings
 SECRET_KEY = os.getenv("SECRET_KEY", "your_super_secret_key")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
+
+# Shared HTTP client settings for backend -> microservice calls
+# Connection pool limits (applied per upstream client)
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+
+# Seconds an idle keep-alive connection is kept open before being closed
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+
+# Enable HTTP/2 (requires the optional 'h2' package, falls back to HTTP/1.1)
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "false").lower() == "true"
+
+# Per-upstream timeouts (seconds)
+DB_SERVICE_TIMEOUT = float(os.getenv("DB_SERVICE_TIMEOUT", "5"))
+AI_SERVICE_TIMEOUT = float(os.getenv("AI_SERVICE_TIMEOUT", "30"))
+
+# Exercise catalog cache (seconds)
+# How long a fetched catalog is considered fresh
+CATALOG_CACHE_TTL = float(os.getenv("CATALOG_CACHE_TTL", "300"))
+# Start a background refresh this long before the cached catalog expires
+CATALOG_REFRESH_AHEAD = float(os.getenv("CATALOG_REFRESH_AHEAD", "60"))
+# How long past expiry the last good catalog may still be served if the DB service is down
+CATALOG_STALE_MAX = float(os.getenv("CATALOG_STALE_MAX", "3600"))
+
+# Max number of username -> user_id entries remembered for tokens without a user_id claim
+USER_ID_CACHE_SIZE = int(os.getenv("USER_ID_CACHE_SIZE", "1024"))
+
+# Password hashing
+# bcrypt cost factor; stored hashes with a different cost are re-hashed on login
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# Worker threads dedicated to hashing (bcrypt releases the GIL)
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))
+# Max hashing jobs waiting for a worker before new ones are rejected with 503
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "64"))
+
+# Max number of verified JWTs whose decoded claims are cached (until the token expires)
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "4096"))
+
+# Asynchronous plan generation jobs (POST /generate-plan?mode=async)
+# Background workers running the generation pipeline
+PLAN_JOB_WORKERS = int(os.getenv("PLAN_JOB_WORKERS", "4"))
+# Max jobs waiting for a worker before new ones are rejected with 503
+PLAN_JOB_QUEUE_SIZE = int(os.getenv("PLAN_JOB_QUEUE_SIZE", "100"))
+# Seconds finished jobs are kept for polling
+PLAN_JOB_TTL = float(os.getenv("PLAN_JOB_TTL", "3600"))
+# Job store backend ("memory" is the only built-in store)
+PLAN_JOB_STORE = os.getenv("PLAN_JOB_STORE", "memory")
+
+# Idempotency-Key support for /generate-plan
+# Seconds a completed result is replayed for retries with the same key
+IDEMPOTENCY_TTL = float(os.getenv("IDEMPOTENCY_TTL", "3600"))
+# Max number of keys remembered (least recently used are evicted first)
+IDEMPOTENCY_MAX_KEYS = int(os.getenv("IDEMPOTENCY_MAX_KEYS", "10000"))
+
+# Resilience of upstream calls
+# Consecutive failures that open an endpoint's circuit breaker
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "5"))
+# Seconds an open breaker rejects calls before letting a probe through
+BREAKER_RESET_TIMEOUT = float(os.getenv("BREAKER_RESET_TIMEOUT", "30"))
+# Total attempts for idempotent (GET) requests, including the first one
+RETRY_MAX_ATTEMPTS = int(os.getenv("RETRY_MAX_ATTEMPTS", "3"))
+# Base delay (seconds) of the jittered exponential backoff between retries
+RETRY_BASE_DELAY = float(os.getenv("RETRY_BASE_DELAY", "0.05"))
+# Seconds to wait before sending a hedged duplicate of a slow read
+HEDGE_DELAY = float(os.getenv("HEDGE_DELAY", "0.1"))
+# Default end-to-end latency budget (seconds) of an incoming request
+REQUEST_DEADLINE = float(os.getenv("REQUEST_DEADLINE", "45"))
+
+# Backend cache of serialized plans (GET /plans, GET /plan/{id})
+# Max number of cached entries (plan lists + single plans)
+PLAN_CACHE_MAX_ENTRIES = int(os.getenv("PLAN_CACHE_MAX_ENTRIES", "5000"))
+# Max approximate size of all cached entries, in bytes of JSON
+PLAN_CACHE_MAX_BYTES = int(os.getenv("PLAN_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+# Seconds an entry is served before it is re-fetched (bounds staleness across backend workers)
+PLAN_CACHE_TTL = float(os.getenv("PLAN_CACHE_TTL", "60"))
+
+# Request tracing (Server-Timing header is always returned)
+# Where finished traces are written: "none", "stdout" or "file"
+TRACE_EXPORTER = os.getenv("TRACE_EXPORTER", "none")
+# JSON-lines file used when TRACE_EXPORTER=file
+TRACE_FILE = os.getenv("TRACE_FILE", "traces.jsonl")
+
+# Admission control of AI plan generation
+# Max AI calls in flight at once (across all users)
+AI_MAX_CONCURRENCY = int(os.getenv("AI_MAX_CONCURRENCY", "8"))
+# Max requests waiting for a free AI slot before new ones are rejected with 503
+AI_MAX_QUEUE = int(os.getenv("AI_MAX_QUEUE", "16"))
+# Max seconds a request waits for an AI slot (also capped by the request deadline)
+AI_QUEUE_TIMEOUT = float(os.getenv("AI_QUEUE_TIMEOUT", "10"))
+# Max AI calls one user may have queued or running at once
+AI_USER_MAX_CONCURRENT = int(os.getenv("AI_USER_MAX_CONCURRENT", "1"))
+# Per-user token bucket: sustained plan generations per minute, and burst size
+PLAN_RATE_LIMIT_PER_MINUTE = float(os.getenv("PLAN_RATE_LIMIT_PER_MINUTE", "2"))
+PLAN_RATE_LIMIT_BURST = int(os.getenv("PLAN_RATE_LIMIT_BURST", "3"))
+# Max users whose token buckets are kept (least recently used are dropped, i.e. refilled)
+PLAN_RATE_LIMIT_MAX_USERS = int(os.getenv("PLAN_RATE_LIMIT_MAX_USERS", "100000"))
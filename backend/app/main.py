@@ -1,11 +1,61 @@
 # main.py
 # Entry point for the FastAPI application
 
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, Response
 from app.routers import user_routes,plan_routes  # Import user routes
+from app.services.http_client import start_http_clients, close_http_clients, get_pool_stats
+from app.services.password_service import get_hashing_stats
+from app.services.admission_service import get_admission_stats
+from app.services.auth_dependency import get_token_cache_stats
+from app.services.plan_cache_service import plan_cache
+from app.services.job_service import start_job_workers, stop_job_workers
+from app.services.resilience import DEADLINE_HEADER, set_request_deadline, get_breaker_stats
+from app.services.metrics import MetricsMiddleware, METRICS_CONTENT_TYPE, render_metrics
+from app.services.tracing import TRACE_HEADER, start_trace, server_timing_header, export_trace
+from app.core.config import REQUEST_DEADLINE
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Open the shared pooled HTTP clients once for the whole application
+    await start_http_clients()
+    # Start the background workers of asynchronous plan generation jobs
+    await start_job_workers()
+    yield
+    await stop_job_workers()
+    # Close pooled connections on shutdown
+    await close_http_clients()
+
 
 # Create the FastAPI app instance
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
+
+# Give every request a latency budget that caps all upstream calls it makes.
+# A caller may pass a tighter budget in the X-Request-Deadline-Ms header.
+@app.middleware("http")
+async def request_deadline(request: Request, call_next):
+    budget = REQUEST_DEADLINE
+    header = request.headers.get(DEADLINE_HEADER)
+    if header and header.isdigit():
+        budget = min(budget, int(header) / 1000)
+    set_request_deadline(budget)
+    return await call_next(request)
+
+# Trace every request: spans of upstream calls are summed up in a Server-Timing
+# header and the trace ID is echoed back (and forwarded to the other services).
+# Registered last so it wraps the deadline middleware and sees the whole request.
+@app.middleware("http")
+async def request_tracing(request: Request, call_next):
+    trace = start_trace(request.headers.get(TRACE_HEADER))
+    response = await call_next(request)
+    response.headers["Server-Timing"] = server_timing_header(trace)
+    response.headers[TRACE_HEADER] = trace.trace_id
+    export_trace(trace, request.method, request.url.path, response.status_code)
+    return response
+
+# Request latency and in-flight metrics (outermost, so it times the whole request)
+app.add_middleware(MetricsMiddleware)
 
 # Register the auth router (includes /register endpoint)
 app.include_router(user_routes.router)
@@ -15,3 +65,23 @@ app.include_router(plan_routes.router)
 @app.get("/")
 def root():
     return {"message": "AI Workout Companion API is running!"}
+
+# Connection pool usage of the upstream HTTP clients, the hashing pool and the AI slots (for monitoring)
+@app.get("/health/pools")
+def pool_stats():
+    return {**get_pool_stats(), "password_hashing": get_hashing_stats(), "ai_admission": get_admission_stats()}
+
+# Hit/miss counters of the in-process caches (for monitoring)
+@app.get("/health/caches")
+def cache_stats():
+    return {"token_cache": get_token_cache_stats(), "plan_cache": plan_cache.stats()}
+
+# Circuit breaker state per upstream endpoint (for monitoring)
+@app.get("/health/breakers")
+def breaker_stats():
+    return get_breaker_stats()
+
+# Prometheus metrics (request latency, in-flight requests, upstream calls)
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return Response(content=render_metrics(), media_type=METRICS_CONTENT_TYPE)
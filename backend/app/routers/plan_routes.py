@@ -1,139 +1,242 @@
 # routers/plan_routes.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from app.services.auth_dependency import get_current_user  # Dependency to extract current user from JWT token
-from app.services.db_service import get_user_by_username, get_user_profile_by_id, get_latest_user_plan
-from app.services.db_service import save_workout_plan_to_db, db_service_get, db_service_delete
-from app.services.ai_service import get_generated_plan_by_ai
-from app.services.cache_service import get_allowed_exercise_names
-from app.schemas.plan_schemas import WorkoutPlanResponse,GeneratedPlanResponse
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import JSONResponse, StreamingResponse
+from app.services.auth_dependency import get_current_user, get_current_principal  # Dependencies to extract current user from JWT token
+from app.services.db_service import db_service_delete, get_plan, get_user_plans_page, open_user_plans_export, get_user_plans_batch
+from app.services.plan_generation_service import generate_plan_for_user
+from app.services.job_service import submit_plan_job, get_job, stream_job_events, to_public_job
+from app.services.idempotency_service import run_idempotent
+from app.services.plan_cache_service import plan_cache
+from app.schemas.plan_schemas import WorkoutPlanResponse,GeneratedPlanResponse,PlanJobResponse,WorkoutPlanSummaryResponse
+from app.schemas.auth_schemas import CurrentUser
 import httpx
-from app.core.config import DB_SERVICE_URL
-import copy
-from typing import Optional,List
-import json
+from typing import Optional,List,Union
 
 
 # Initialize router for workout plan generation
 router = APIRouter()
 
+# Max plan IDs accepted by GET /plans/batch
+MAX_BATCH_IDS = 100
 
-@router.post("/generate-plan",response_model=GeneratedPlanResponse, status_code=status.HTTP_201_CREATED)
+
+@router.post(
+    "/generate-plan",
+    response_model=GeneratedPlanResponse,
+    status_code=status.HTTP_201_CREATED,
+    responses={status.HTTP_202_ACCEPTED: {"model": PlanJobResponse}}
+)
 async def generate_workout_plan(
+    response: Response,
+    mode: Optional[str] = Query(None, description="Set to 'async' to run generation as a background job"),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
     username: str = Depends(get_current_user)
 ):
     """
     Generates a new workout plan for the authenticated user.
 
+    With `?mode=async` the request returns 202 immediately with a job ID; poll
+    GET /generate-plan/jobs/{job_id} or stream its /events for the result.
+
+    With an `Idempotency-Key` header, retries using the same key attach to the
+    request already in progress or replay its result (marked with an
+    `Idempotent-Replayed: true` header) instead of generating another plan.
+
     Workflow:
-    1. Fetch full user record from the database using the username from the token.
-    2. Fetch user's profile from the database microservice.
-    3. Fetch user's latest workout plan (if exists).
-    4. (For now) Mock the AI agent's response to generate a new workout plan.
-    5. Save the generated plan into the database microservice.
-    6. Return a success message to the frontend.
+    1. Fetch the user's ID, profile and latest workout plan (if exists) from the
+       database microservice in a single request, concurrently with the exercise catalog.
+    2. Ask the AI agent to generate a new workout plan.
+    3. Save the generated plan into the database microservice.
+    4. Return a success message to the frontend.
 
     Returns:
         JSON message confirming successful plan generation and saving.
     """
 
-    #Fetch user full metadata
-    user = await get_user_by_username(username)
-    if not user or "id" not in user:
-        raise HTTPException(status_code=404, detail="User not found.")
-
-    user_id = user["id"]
-
-    #Fetch user's profile
-    user_profile = await get_user_profile_by_id(user_id)
-    if not user_profile:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User profile not found. Please complete your profile before generating a plan."
+    if mode == "async":
+        # Queue the pipeline and return the job right away
+        job, replayed = await run_idempotent(
+            username, idempotency_key, lambda: submit_plan_job(username), scope="async"
         )
+        if replayed:
+            # Report the job's current state rather than the one at submission
+            try:
+                job = await get_job(job["job_id"], username)
+            except HTTPException:
+                pass
+
+        headers = {"Location": f"/generate-plan/jobs/{job['job_id']}"}
+        if replayed:
+            headers["Idempotent-Replayed"] = "true"
+        return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=to_public_job(job), headers=headers)
+
+    result, replayed = await run_idempotent(
+        username, idempotency_key, lambda: generate_plan_for_user(username), scope="sync"
+    )
+    if replayed:
+        response.headers["Idempotent-Replayed"] = "true"
+    return result
 
-    #Fetch user's latest workout plan (if any)
-    last_plan = await get_latest_user_plan(user_id)
-    # Note: last_plan might be None if it's a new user — that's OK
 
-    #Fetch the allowed exercises name and equipment list to the ai agent
-    allowed_exercises = await get_allowed_exercise_names()
+@router.get("/generate-plan/jobs/{job_id}", response_model=PlanJobResponse)
+async def get_plan_job(job_id: str, username: str = Depends(get_current_user)):
+    """
+    Returns the status of an asynchronous plan generation job,
+    including the generated plan once it has succeeded.
 
-    #fetch the generated plan from the ai agent
-    generated_plan = await get_generated_plan_by_ai(user_profile,last_plan,allowed_exercises)
+    - Returns 404 if the job does not exist, has expired or belongs to another user
+    """
+    job = await get_job(job_id, username)
+    return to_public_job(job)
 
-    #Save the generated plan into the database microservice
-    payload = copy.deepcopy(generated_plan)
-    payload["user_id"] = user_id  # Attach the correct user ID
 
-    created_plan_id  = await save_workout_plan_to_db(payload)
+@router.get("/generate-plan/jobs/{job_id}/events")
+async def stream_plan_job(job_id: str, username: str = Depends(get_current_user)):
+    """
+    Streams the status of an asynchronous plan generation job as Server-Sent Events.
 
-    if not created_plan_id:
-        raise HTTPException(
-             status_code=status.HTTP_502_BAD_GATEWAY,
-             detail="Failed to save the workout plan to the database."
-    )
+    - Sends a 'status' event on every change; the last one contains the result or error
+    - Returns 404 if the job does not exist, has expired or belongs to another user
+    """
+    # Validate ownership before the stream starts so errors are real HTTP errors
+    await get_job(job_id, username)
 
-    try:
-        created_plan = await db_service_get(f"/workout-plans/{created_plan_id}")
-        
-    except httpx.HTTPStatusError as e:
-        raise HTTPException(
-        status_code=e.response.status_code,
-        detail=e.response.json().get("detail", str(e))
-    )
-    except Exception as e:
-        raise HTTPException(
-        status_code=502,
-        detail=f"Failed to fetch the saved workout plan: {str(e)}"
+    return StreamingResponse(
+        stream_job_events(job_id, username),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
 
 
-    #Return a success response to the frontend
-    return {"message": "Workout plan generated and saved successfully!",
-            "plan_id":created_plan_id,
-            "plan": created_plan}
-
 
-
-@router.get("/plans",response_model=List[WorkoutPlanResponse])
+@router.get("/plans",response_model=Union[List[WorkoutPlanResponse], List[WorkoutPlanSummaryResponse]])
 async def get_user_plans(
+    response: Response,
     status: Optional[str] = None,
-    current_user: str = Depends(get_current_user)
+    view: str = Query("full", pattern="^(full|summary)$", description="'full' (with days and exercises) or 'summary' (plan headers only)"),
+    limit: Optional[int] = Query(None, ge=1, le=100, description="Page size; omit to return all plans"),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    current_user: CurrentUser = Depends(get_current_principal)
 ):
     """
-    Get workout plans for the logged-in user.
+    Get workout plans for the logged-in user, newest first.
     Optionally filter by status (e.g., 'active', 'archived').
-    """
 
-    #Fetch user full metadata
-    user = await get_user_by_username(current_user)
-    if not user or "id" not in user:
-        raise HTTPException(status_code=404, detail="User not found.")
+    - view=summary returns plan headers only (no days/exercises)
+    - Pass `limit` to paginate; the next page's cursor is returned in the
+      X-Next-Cursor header (absent on the last page)
+    """
 
-    user_id = user["id"]
+    # User ID comes from the verified token claims
+    user_id = current_user.user_id
+    query = (status, view, limit, cursor)
+
+    # Serve from the plan cache when possible
+    cached = plan_cache.get_list(user_id, query)
+    if cached is not None:
+        plans, next_cursor = cached
+    else:
+        try:
+            # Send request to DB microservice
+            plans, next_cursor, catalog_revision = await get_user_plans_page(user_id, status, view, limit, cursor)
+            plan_cache.put_list(user_id, query, plans, next_cursor, catalog_revision=catalog_revision)
+
+        except httpx.HTTPStatusError as e:
+            # Pass through status + message from DB microservice (e.g. 404)
+            raise HTTPException(
+                status_code=e.response.status_code,
+                detail=e.response.json().get("detail", str(e))
+            )
+
+        except Exception as e:
+            raise HTTPException(status_code=502, detail=f"Failed to fetch plans: {str(e)}")
+
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return plans
+
+
+@router.get("/plans/batch", response_model=List[WorkoutPlanResponse])
+async def get_plans_batch(
+    ids: str = Query(..., description=f"Comma-separated plan IDs (at most {MAX_BATCH_IDS})"),
+    current_user: CurrentUser = Depends(get_current_principal)
+):
+    """
+    Fetch several of the logged-in user's workout plans in one call,
+    instead of one GET /plan/{plan_id} per plan.
 
+    - Plans already cached for this user are served from memory; the rest are
+      loaded with a single request to the database microservice.
+    - Plans that do not exist or belong to another user are left out.
+    - Results follow the order of `ids` (duplicates are returned once).
+    """
     try:
-        # Build query string
-        query_string = f"?user_id={user_id}"
-        if status:
-            query_string += f"&status={status}"
+        plan_ids = list(dict.fromkeys(int(part) for part in ids.split(",") if part.strip()))
+    except ValueError:
+        raise HTTPException(status_code=422, detail="ids must be a comma-separated list of integers")
+    if not plan_ids or len(plan_ids) > MAX_BATCH_IDS:
+        raise HTTPException(status_code=422, detail=f"ids must contain between 1 and {MAX_BATCH_IDS} plan IDs")
+
+    user_id = current_user.user_id
+    plans_by_id = {}
+    for plan_id in plan_ids:
+        cached_plan = plan_cache.get_plan(plan_id, owner=user_id)
+        if cached_plan is not None:
+            plans_by_id[plan_id] = cached_plan
+
+    missing_ids = [plan_id for plan_id in plan_ids if plan_id not in plans_by_id]
+    if missing_ids:
+        try:
+            plans, catalog_revision = await get_user_plans_batch(user_id, missing_ids)
+            for plan in plans:
+                plans_by_id[plan["id"]] = plan
+                plan_cache.put_plan(plan["id"], plan, owner=user_id, catalog_revision=catalog_revision)
+
+        except httpx.HTTPStatusError as e:
+            # Pass through status + message from DB microservice
+            raise HTTPException(
+                status_code=e.response.status_code,
+                detail=e.response.json().get("detail", str(e))
+            )
+
+        except Exception as e:
+            raise HTTPException(status_code=502, detail=f"Failed to fetch plans: {str(e)}")
+
+    return [plans_by_id[plan_id] for plan_id in plan_ids if plan_id in plans_by_id]
+
+
+@router.get("/plans/export", response_class=StreamingResponse)
+async def export_user_plans(status: Optional[str] = None, current_user: CurrentUser = Depends(get_current_principal)):
+    """
+    Streams the logged-in user's complete plan history as newline-delimited JSON
+    (application/x-ndjson), newest first, one full plan per line.
 
-        # Send request to DB microservice
-        response = await db_service_get(f"/workout-plans{query_string}")
-        return response
+    The database microservice's stream is relayed chunk by chunk without buffering,
+    so the backend's memory use does not depend on the size of the history.
+    """
+    try:
+        upstream = await open_user_plans_export(current_user.user_id, status)
 
     except httpx.HTTPStatusError as e:
-        # Pass through status + message from DB microservice (e.g. 404)
+        # Pass through status + message from DB microservice
         raise HTTPException(
             status_code=e.response.status_code,
             detail=e.response.json().get("detail", str(e))
         )
 
     except Exception as e:
-        raise HTTPException(status_code=502, detail=f"Failed to fetch plans: {str(e)}")
-    
-    
+        raise HTTPException(status_code=502, detail=f"Failed to export plans: {str(e)}")
+
+    async def relay():
+        # Close the upstream response once the relay finishes or the client disconnects
+        try:
+            async for chunk in upstream.aiter_bytes():
+                yield chunk
+        finally:
+            await upstream.aclose()
+
+    return StreamingResponse(relay(), media_type="application/x-ndjson")
 
 
 @router.get("/plan/{plan_id}", response_model=WorkoutPlanResponse)
@@ -145,8 +248,16 @@ async def get_plan_by_id(plan_id: int):
     - Returns the full nested plan structure (days, exercises, etc.)
     - Raises 404 or 502 depending on error type
     """
+    # Serve from the plan cache when possible
+    cached_plan = plan_cache.get_plan(plan_id)
+    if cached_plan is not None:
+        return cached_plan
+
     try:
-        return await db_service_get(f"/workout-plans/{plan_id}")
+        plan, owner, catalog_revision = await get_plan(plan_id)
+        # The owner lets invalidate_user drop the plan when it gets archived
+        plan_cache.put_plan(plan_id, plan, owner=owner, catalog_revision=catalog_revision)
+        return plan
     
     except httpx.HTTPStatusError as e:
         # Propagate status from the DB microservice (e.g. 404)
@@ -179,6 +290,8 @@ async def delete_plan_by_id(plan_id: int,username: str = Depends(get_current_use
 
     try:
         await db_service_delete(f"/workout-plans/{plan_id}")
+        # Drop the plan and any cached listing that contains it
+        plan_cache.invalidate_plan(plan_id)
     
     except httpx.HTTPStatusError as e:
         # Propagate status from the DB microservice (e.g. 404)
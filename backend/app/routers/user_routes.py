@@ -1,21 +1,18 @@
 # routers/user_routes.py
 
 from fastapi import APIRouter, HTTPException,Depends,status
-from app.schemas.auth_schemas import RegisterRequest,RegisterResponse,LoginRequest,TokenLoginResponse
+from app.schemas.auth_schemas import RegisterRequest,RegisterResponse,LoginRequest,TokenLoginResponse,CurrentUser
 from app.schemas.user_profile_schemas import UserProfileCreate,UserProfileResponse
-from passlib.context import CryptContext
 from app.services.token_service import create_access_token
-from app.services.auth_dependency import get_current_user
-from app.services.db_service import get_user_by_username,get_user_profile_by_id,update_user_profile
+from app.services.auth_dependency import get_current_user,get_current_principal
+from app.services.db_service import get_user_profile_by_id,update_user_profile,update_user_password
+from app.services.password_service import hash_password,verify_and_update_password
+from app.services.resilience import upstream_request
 import httpx
-from app.core.config import DB_SERVICE_URL
 
 # Create the API router for user-related endpoints
 router = APIRouter()
 
-# Password hashing configuration using bcrypt
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 
 
 @router.post("/register", response_model=RegisterResponse)
@@ -26,7 +23,7 @@ async def register_user(user: RegisterRequest):
     - Sends the data to the DB service
     - Returns the new user's ID and username
     """
-    hashed_pw = hash_password(user.password)
+    hashed_pw = await hash_password(user.password)
 
     data_to_send = {
         "username": user.username,
@@ -34,8 +31,7 @@ async def register_user(user: RegisterRequest):
     }
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(f"{DB_SERVICE_URL}/users", json=data_to_send)
+        response = await upstream_request("db", "POST", "/users", json=data_to_send)
 
         if response.status_code != 201:
             error_message = response.json()  # Parse the actual error from the DB
@@ -60,8 +56,7 @@ async def login_user(login_credentials: LoginRequest):
 
     try:
         # Make a GET request to the DB microservice to fetch user by username
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{DB_SERVICE_URL}/users/{login_credentials.username}")
+        response = await upstream_request("db", "GET", f"/users/{login_credentials.username}")
 
         # If the user does not exist in the DB
         if response.status_code != 200:
@@ -70,10 +65,15 @@ async def login_user(login_credentials: LoginRequest):
         # Parse the JSON response from the DB (must contain hashed password)
         user_data = response.json()
 
-        # Verify the password using bcrypt
-        if not verify_password(login_credentials.password, user_data["hashed_password"]):
+        # Verify the password using bcrypt (off the event loop)
+        is_valid, new_hash = await verify_and_update_password(login_credentials.password, user_data["hashed_password"])
+        if not is_valid:
             raise HTTPException(status_code=401, detail="Invalid password")
-        
+
+        # The stored hash uses an outdated bcrypt cost, replace it (best effort)
+        if new_hash:
+            await update_user_password(user_data["id"], new_hash)
+
         #Credentials are valid, generating JWT token to the user autentication
         access_token = create_access_token(data={"sub": login_credentials.username,"user_id":user_data["id"]})
 
@@ -95,24 +95,16 @@ def get_me(current_user: str = Depends(get_current_user)):
 
 
 @router.get("/profile", response_model=UserProfileResponse)
-async def get_profile(current_user: str = Depends(get_current_user)):
+async def get_profile(current_user: CurrentUser = Depends(get_current_principal)):
     """
     Returns the profile of the authenticated user.
-    Resolves user ID from username, then retrieves the profile from the DB microservice.
+    Takes the user ID from the JWT claims, then retrieves the profile from the DB microservice.
     """
-    # Fetch the user object (with ID) from the database using the username from JWT
-    user = await get_user_by_username(current_user)
-
-    if not user or "id" not in user:
-        # User does not exist or malformed response from DB service
-        raise HTTPException(status_code=404, detail="User not found")
-
-    user_id = user["id"]
+    user_id = current_user.user_id
 
     try:
         # Query the DB microservice for the user's profile by user ID
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{DB_SERVICE_URL}/users/{user_id}/profile")
+        response = await upstream_request("db", "GET", f"/users/{user_id}/profile")
 
         if response.status_code != 200:
             # Attempt to extract a clear error message from the DB response
@@ -139,7 +131,7 @@ async def get_profile(current_user: str = Depends(get_current_user)):
 @router.put("/profile", response_model=UserProfileResponse)
 async def update_profile(
     profile_data: UserProfileCreate,
-    username: str = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_principal)
 ):
     """
     Creates or updates the authenticated user's profile.
@@ -147,12 +139,8 @@ async def update_profile(
     - On first-time setup, all fields must be provided.
     - On later updates, partial changes are accepted.
     """
-    # Fetch user metadata from the database using the username from the token
-    user = await get_user_by_username(username)
-    if not user or "id" not in user:
-        raise HTTPException(status_code=404, detail="User not found")
-
-    user_id = user["id"]
+    # User ID comes from the verified token claims
+    user_id = current_user.user_id
 
     # Check if the user already has a profile
     existing_profile = await get_user_profile_by_id(user_id)
@@ -179,20 +167,3 @@ async def update_profile(
 
     return updated_profile
 
-
-
-
-#functions that we are using
-
-def hash_password(password: str) -> str:
-    """
-    Hashes the user's password securely using bcrypt.
-    """
-    return pwd_context.hash(password)
-
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """
-    Verifies a plain-text password against its bcrypt hash.
-    """
-    return pwd_context.verify(plain_password, hashed_password)
\ No newline at end of file
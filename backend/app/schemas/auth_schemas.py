@@ -30,4 +30,9 @@ class LoginResponse(BaseModel):
 #Response for successful login include user jwt token for autentication
 class TokenLoginResponse(BaseModel):
     message: str
-    token: str
\ No newline at end of file
+    token: str
+
+# Authenticated caller resolved from the JWT claims
+class CurrentUser(BaseModel):
+    username: str
+    user_id: int
@@ -58,8 +58,31 @@ class WorkoutPlanResponse(BaseModel):
     class Config:
         from_attributes = True 
 
+# Plan header only (GET /plans?view=summary)
+class WorkoutPlanSummaryResponse(BaseModel):
+    id: int
+    goal: Optional[str]
+    experience_level: Optional[str]
+    duration_weeks: Optional[int]
+    created_at: str
+    status: str
+
 #scheme of generated plan response for the frontend
 class GeneratedPlanResponse(BaseModel):
     message: str
     plan_id: int
-    plan: WorkoutPlanResponse
\ No newline at end of file
+    plan: WorkoutPlanResponse
+
+#Error details of a failed plan generation job
+class PlanJobError(BaseModel):
+    status_code: int
+    detail: str
+
+#scheme of an asynchronous plan generation job (status + final result)
+class PlanJobResponse(BaseModel):
+    job_id: str
+    status: str  # queued, running, succeeded, failed
+    created_at: str
+    updated_at: str
+    result: Optional[GeneratedPlanResponse] = None
+    error: Optional[PlanJobError] = None
@@ -0,0 +1,214 @@
+# services/admission_service.py
+# Admission control in front of the AI microservice, which is the scarce resource
+# of plan generation. Before a request may call the AI service it must pass:
+# 1. a per-user concurrency cap (one generation at a time by default)      -> 429
+# 2. a per-user token bucket (sustained rate + small burst)                 -> 429
+# 3. a global limit on concurrent AI calls with a bounded FIFO wait queue   -> 503
+# 1 and 2 are checked before the generation's database lookups; the global slot
+# of 3 is only held around the AI call itself.
+# Rejections are immediate and carry Retry-After, so a few heavy users are turned
+# away cheaply instead of queueing ahead of everyone else.
+
+import asyncio
+import math
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Tuple
+from fastapi import HTTPException, status
+from app.core.config import (
+    AI_MAX_CONCURRENCY,
+    AI_MAX_QUEUE,
+    AI_QUEUE_TIMEOUT,
+    AI_USER_MAX_CONCURRENT,
+    PLAN_RATE_LIMIT_PER_MINUTE,
+    PLAN_RATE_LIMIT_BURST,
+    PLAN_RATE_LIMIT_MAX_USERS,
+)
+from app.services.metrics import (
+    AI_ADMISSION_QUEUE_DEPTH,
+    AI_ADMISSION_IN_FLIGHT,
+    AI_ADMISSION_WAIT,
+    AI_ADMISSION_REJECTIONS,
+)
+from app.services.resilience import remaining_budget
+
+# Tokens added to a user's bucket per second
+_REFILL_RATE = PLAN_RATE_LIMIT_PER_MINUTE / 60
+
+# username -> (tokens, last refill time); least recently used users are dropped first
+_buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+# username -> generations of that user queued or running
+_user_active: Dict[str, int] = {}
+
+# Global AI slots; asyncio.Semaphore wakes waiters in FIFO order
+_slots = asyncio.Semaphore(AI_MAX_CONCURRENCY)
+_waiting = 0
+_in_flight = 0
+
+# Moving average of AI call duration (seconds), used to estimate Retry-After
+_avg_call_seconds = 10.0
+
+AI_ADMISSION_QUEUE_DEPTH.set_function(lambda: _waiting)
+AI_ADMISSION_IN_FLIGHT.set_function(lambda: _in_flight)
+
+
+class Admission:
+    """
+    A plan generation admitted for one user (yielded by ai_admission).
+    """
+
+    def __init__(self):
+        # Set once the AI call has completed; the user's token is then spent
+        self.ai_call_completed = False
+
+    @asynccontextmanager
+    async def ai_slot(self) -> AsyncIterator[None]:
+        """
+        Holds a global AI slot for the duration of the `async with` body, which
+        should be the AI call alone.
+
+        Raises:
+            HTTPException: 503 if the wait queue is full or no slot frees up in
+                           time, with a Retry-After header.
+        """
+        global _avg_call_seconds
+
+        await _acquire_slot()
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            _release_slot()
+            _avg_call_seconds = 0.8 * _avg_call_seconds + 0.2 * (time.monotonic() - start)
+        self.ai_call_completed = True
+
+
+@asynccontextmanager
+async def ai_admission(username: str) -> AsyncIterator[Admission]:
+    """
+    Admits one plan generation for the user. The per-user checks run on entry,
+    before any upstream lookups, so rejected requests cost nothing; the AI call
+    itself must run inside `async with admission.ai_slot()`, which holds a global
+    slot only while the AI service is working.
+
+    The user's rate-limit token is only spent once the AI call completes: it is
+    refunded when the body raises or is cancelled before that (lookups failed,
+    no global slot, AI call failed, client gone).
+
+    Raises:
+        HTTPException: 429 if the user already has a generation in progress or has
+                       used up their rate limit, with a Retry-After header.
+    """
+    if _user_active.get(username, 0) >= AI_USER_MAX_CONCURRENT:
+        _reject(status.HTTP_429_TOO_MANY_REQUESTS, "user_concurrency", _avg_call_seconds,
+                "A plan generation is already in progress for this user")
+
+    wait = _take_token(username)
+    if wait > 0:
+        _reject(status.HTTP_429_TOO_MANY_REQUESTS, "rate_limited", wait,
+                "Plan generation rate limit exceeded")
+
+    _user_active[username] = _user_active.get(username, 0) + 1
+    admission = Admission()
+    try:
+        yield admission
+    except BaseException:
+        # No plan came of it: give the token back
+        if not admission.ai_call_completed:
+            _refund_token(username)
+        raise
+    finally:
+        _user_active[username] -= 1
+        if not _user_active[username]:
+            del _user_active[username]
+
+
+async def _acquire_slot() -> None:
+    global _waiting, _in_flight
+
+    # Counted by hand: the semaphore's own count lags behind waiters not yet scheduled
+    if _in_flight + _waiting >= AI_MAX_CONCURRENCY + AI_MAX_QUEUE:
+        _reject(status.HTTP_503_SERVICE_UNAVAILABLE, "queue_full", _estimated_wait(),
+                "Plan generation is at capacity, please retry shortly")
+
+    # Never wait past the request's own deadline
+    timeout = AI_QUEUE_TIMEOUT
+    budget = remaining_budget()
+    if budget is not None:
+        timeout = min(timeout, budget)
+
+    start = time.monotonic()
+    _waiting += 1
+    try:
+        await asyncio.wait_for(_slots.acquire(), timeout=max(timeout, 0))
+    except asyncio.TimeoutError:
+        _reject(status.HTTP_503_SERVICE_UNAVAILABLE, "queue_timeout", _estimated_wait(),
+                "Plan generation is at capacity, please retry shortly")
+    finally:
+        _waiting -= 1
+
+    _in_flight += 1
+    AI_ADMISSION_WAIT.observe(time.monotonic() - start)
+
+
+def _release_slot() -> None:
+    global _in_flight
+    _in_flight -= 1
+    _slots.release()
+
+
+def _take_token(username: str) -> float:
+    """
+    Takes a token from the user's bucket.
+    Returns 0 on success, otherwise the seconds until the next token is available.
+    """
+    now = time.monotonic()
+    tokens, updated_at = _buckets.pop(username, (PLAN_RATE_LIMIT_BURST, now))
+    tokens = min(PLAN_RATE_LIMIT_BURST, tokens + (now - updated_at) * _REFILL_RATE)
+
+    wait = 0.0
+    if tokens >= 1:
+        tokens -= 1
+    else:
+        wait = (1 - tokens) / _REFILL_RATE if _REFILL_RATE > 0 else 60.0
+
+    _buckets[username] = (tokens, now)
+    while len(_buckets) > PLAN_RATE_LIMIT_MAX_USERS:
+        _buckets.popitem(last=False)
+    return wait
+
+
+def _refund_token(username: str) -> None:
+    bucket = _buckets.get(username)
+    if bucket is not None:
+        _buckets[username] = (min(PLAN_RATE_LIMIT_BURST, bucket[0] + 1), bucket[1])
+
+
+def _estimated_wait() -> float:
+    # Time for the current queue (plus this request) to drain through the slots
+    return _avg_call_seconds * (_waiting + 1) / AI_MAX_CONCURRENCY
+
+
+def _reject(status_code: int, reason: str, retry_after: float, detail: str) -> None:
+    AI_ADMISSION_REJECTIONS.labels(reason).inc()
+    raise HTTPException(
+        status_code=status_code,
+        detail=detail,
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+def get_admission_stats() -> dict:
+    """
+    Returns the current load of the AI admission control (for monitoring).
+    """
+    return {
+        "max_concurrency": AI_MAX_CONCURRENCY,
+        "in_flight": _in_flight,
+        "waiting": _waiting,
+        "max_queue": AI_MAX_QUEUE,
+        "active_users": len(_user_active),
+        "avg_ai_call_seconds": round(_avg_call_seconds, 3),
+    }
@@ -4,9 +4,8 @@ import httpx
 from app.schemas.user_profile_schemas import UserProfile
 from app.schemas.plan_schemas import WorkoutPlan
 from typing import Optional,List,Tuple
-from app.core.config import AI_SERVICE_URL 
+from app.services.resilience import upstream_request
 
-timeout = httpx.Timeout(30.0)
 
 async def get_generated_plan_by_ai(
 user_profile: UserProfile,
@@ -24,22 +23,18 @@ allowed_exercises:List[Tuple[str, str]]) -> WorkoutPlan:
 
   """  
 
-  url = f"{AI_SERVICE_URL}/ai/generate"
-
   payload = {
         "user_profile": user_profile,
         "last_plan": last_plan,
         "allowed_exercises": allowed_exercises
     }
 
-  # Use async HTTP client to send the request
-  async with httpx.AsyncClient(timeout=timeout) as client:
-      
-      response = await client.post(url, json = payload)
-      # Raise an exception if the status code is 4xx or 5xx
-      response.raise_for_status()
-      # Parse and return the response body as JSON (dict or list)
-      return response.json()
+  # Send through the shared AI client, guarded by breaker and request deadline
+  response = await upstream_request("ai", "POST", "/ai/generate", json = payload)
+  # Raise an exception if the status code is 4xx or 5xx
+  response.raise_for_status()
+  # Parse and return the response body as JSON (dict or list)
+  return response.json()
       
     
 
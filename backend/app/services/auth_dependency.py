@@ -1,38 +1,134 @@
 # services/auth_dependency.py
 # Provides a reusable dependency function to extract and verify JWT from Authorization header
 
+import hashlib
+import time
+from collections import OrderedDict
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from app.services.token_service import SECRET_KEY, ALGORITHM
+from app.services.db_service import get_user_by_username
+from app.schemas.auth_schemas import CurrentUser
+from app.core.config import USER_ID_CACHE_SIZE, TOKEN_CACHE_SIZE
 
 # FastAPI will automatically look for an Authorization header like: "Bearer <token>"
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/login")
 
+# Bounded LRU of username -> user_id, used only for older tokens without a user_id claim
+_user_id_cache: "OrderedDict[str, int]" = OrderedDict()
 
-def get_current_user(token: str = Depends(oauth2_scheme)) -> str:
-    """
-    Extracts and verifies the JWT token from the Authorization header.
-    Returns the username (subject) if valid.
-    Raises HTTP 401 if the token is missing, invalid, or expired.
-    """
-    credentials_exception = HTTPException(
+# Bounded LRU of token digest -> verified claims, kept until the token's 'exp'
+_token_cache: "OrderedDict[bytes, dict]" = OrderedDict()
+_token_cache_hits = 0
+_token_cache_misses = 0
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+
+def decode_token(token: str) -> dict:
+    """
+    Decodes and verifies the JWT token.
+    Returns the verified claims.
+    Raises HTTP 401 if the token is invalid, expired or has no subject.
+
+    Verified claims are cached by token digest until the token expires, so
+    repeated requests with the same token skip signature verification.
+    """
+    global _token_cache_hits, _token_cache_misses
+
+    digest = hashlib.sha256(token.encode()).digest()
+    cached = _token_cache.get(digest)
+    if cached is not None:
+        if cached["exp"] > time.time():
+            _token_cache_hits += 1
+            _token_cache.move_to_end(digest)
+            return cached
+        # Expired: evict and let jwt.decode reject it below
+        del _token_cache[digest]
+
+    _token_cache_misses += 1
+
     try:
         # Decode the token using our secret and algorithm
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
 
-        # Extract the 'sub' (subject = username) from the payload
-        username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
-
-        return username
-
     except JWTError:
         # Token is invalid, tampered with, or expired
-        raise credentials_exception
+        raise _credentials_exception()
+
+    # The 'sub' (subject = username) claim is required
+    if payload.get("sub") is None:
+        raise _credentials_exception()
+
+    # Only tokens with an expiry are cached, and the oldest entry is evicted when full
+    if isinstance(payload.get("exp"), (int, float)):
+        _token_cache[digest] = payload
+        if len(_token_cache) > TOKEN_CACHE_SIZE:
+            _token_cache.popitem(last=False)
+
+    return payload
+
+
+def get_token_cache_stats() -> dict:
+    """
+    Returns verified-token cache counters for monitoring.
+    """
+    return {
+        "size": len(_token_cache),
+        "max_size": TOKEN_CACHE_SIZE,
+        "hits": _token_cache_hits,
+        "misses": _token_cache_misses,
+    }
+
+
+def get_current_user(token: str = Depends(oauth2_scheme)) -> str:
+    """
+    Extracts and verifies the JWT token from the Authorization header.
+    Returns the username (subject) if valid.
+    Raises HTTP 401 if the token is missing, invalid, or expired.
+    """
+    return decode_token(token)["sub"]
+
+
+async def get_current_principal(token: str = Depends(oauth2_scheme)) -> CurrentUser:
+    """
+    Extracts and verifies the JWT token from the Authorization header.
+    Returns the caller's username and user ID taken from the verified claims.
+
+    Tokens issued before the user_id claim was added fall back to a
+    username lookup, remembered in a bounded LRU cache.
+    Raises HTTP 401 if the token is invalid and 404 if the user does not exist.
+    """
+    payload = decode_token(token)
+    username: str = payload["sub"]
+
+    user_id = payload.get("user_id")
+    if user_id is None:
+        user_id = await _resolve_user_id(username)
+
+    return CurrentUser(username=username, user_id=user_id)
+
+
+async def _resolve_user_id(username: str) -> int:
+    # Cache hit: mark as most recently used
+    if username in _user_id_cache:
+        _user_id_cache.move_to_end(username)
+        return _user_id_cache[username]
+
+    user = await get_user_by_username(username)
+    if not user or "id" not in user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    # Insert and evict the least recently used entry when full
+    _user_id_cache[username] = user["id"]
+    if len(_user_id_cache) > USER_ID_CACHE_SIZE:
+        _user_id_cache.popitem(last=False)
+
+    return user["id"]
@@ -1,26 +1,126 @@
 # backend/app/services/cache_service.py
+import asyncio
+import time
 from fastapi import HTTPException
-from app.services.db_service import db_service_get
+from app.services.db_service import get_catalog_exercise_names
+from app.core.config import CATALOG_CACHE_TTL, CATALOG_REFRESH_AHEAD, CATALOG_STALE_MAX
 import httpx
-from typing import List,Tuple
+from typing import List,Tuple,Optional
+
+
+# In-process cache of the exercise catalog (last good value + when it was fetched)
+_catalog: Optional[List[Tuple[str, str]]] = None
+_catalog_fetched_at: float = 0.0
+
+# Catalog revision reported by the DB service with the cached catalog, if any
+_catalog_revision: Optional[int] = None
+
+# The single in-flight fetch shared by all concurrent callers (single-flight)
+_inflight: Optional[asyncio.Task] = None
 
 
 async def get_allowed_exercise_names() -> List[Tuple[str, str]]:
     """
     Fetches and caches the list of exercise names from the database microservice.
 
+    - Fresh entries (younger than CATALOG_CACHE_TTL) are served from memory.
+    - Close to expiry, a background refresh is started while the cached value is returned.
+    - Concurrent misses share a single upstream request.
+    - If the DB service fails, the last good catalog is served for up to CATALOG_STALE_MAX.
+    - A newer catalog revision seen by note_catalog_revision drops the cached catalog.
+
     Returns:
         List[Tuple[str, str]]: A list of valid exercise names to be used by the AI generator.
     """
+    if _catalog is not None:
+        age = time.monotonic() - _catalog_fetched_at
+
+        if age < CATALOG_CACHE_TTL:
+            # Refresh-ahead: renew in the background before the entry expires
+            if age >= CATALOG_CACHE_TTL - CATALOG_REFRESH_AHEAD:
+                _start_refresh()
+            return _catalog
+
+        try:
+            return await _refresh()
+        except Exception as e:
+            # Stale-while-revalidate: keep serving the last good catalog
+            if age < CATALOG_CACHE_TTL + CATALOG_STALE_MAX:
+                print(f"[CACHE] Catalog refresh failed, serving stale catalog: {e}")
+                return _catalog
+            raise _to_http_exception(e)
+
     try:
-        return await db_service_get("/catalog-exercises/names")
+        return await _refresh()
+    except Exception as e:
+        raise _to_http_exception(e)
+
+
+def invalidate_exercise_catalog() -> None:
+    """
+    Drops the cached catalog so the next call fetches it again.
+    """
+    global _catalog, _catalog_fetched_at, _catalog_revision
+    _catalog = None
+    _catalog_fetched_at = 0.0
+    _catalog_revision = None
+
+
+def note_catalog_revision(revision: Optional[int]) -> bool:
+    """
+    Compares a catalog revision reported by the DB service (e.g. with the
+    generation context) to the revision of the cached catalog, and drops the
+    cached catalog if they differ.
+
+    Returns:
+        bool: True if the cached catalog was dropped.
+    """
+    if revision is None or _catalog is None or _catalog_revision is None or revision == _catalog_revision:
+        return False
+    print(f"[CACHE] Catalog revision changed ({_catalog_revision} -> {revision}), dropping cached catalog")
+    invalidate_exercise_catalog()
+    return True
+
+
+async def _fetch_catalog() -> List[Tuple[str, str]]:
+    # Fetch from the DB service and store as the new last good value
+    global _catalog, _catalog_fetched_at, _catalog_revision
+    catalog, revision = await get_catalog_exercise_names()
+    _catalog = catalog
+    _catalog_fetched_at = time.monotonic()
+    _catalog_revision = revision
+    return catalog
+
+
+def _start_refresh() -> asyncio.Task:
+    # Reuse the in-flight fetch if there is one, otherwise start a new one
+    global _inflight
+    if _inflight is None or _inflight.done():
+        _inflight = asyncio.create_task(_fetch_catalog())
+        _inflight.add_done_callback(_on_refresh_done)
+    return _inflight
 
-    except httpx.HTTPStatusError as e:
+
+def _on_refresh_done(task: asyncio.Task) -> None:
+    # Mark background failures as retrieved so they are only logged once
+    if not task.cancelled() and task.exception() is not None:
+        print(f"[CACHE] Catalog refresh failed: {task.exception()}")
+
+
+async def _refresh() -> List[Tuple[str, str]]:
+    # Shield so a cancelled caller does not cancel the fetch shared with others
+    return await asyncio.shield(_start_refresh())
+
+
+def _to_http_exception(e: Exception) -> HTTPException:
+    if isinstance(e, HTTPException):
+        return e
+
+    if isinstance(e, httpx.HTTPStatusError):
         # Pass through status + message from DB microservice (e.g. 404)
-        raise HTTPException(
+        return HTTPException(
             status_code=e.response.status_code,
             detail=e.response.json().get("detail", str(e))
         )
 
-    except Exception as e:
-        raise HTTPException(status_code=502, detail=f"Failed to fetch catalog-exercises: {str(e)}")
+    return HTTPException(status_code=502, detail=f"Failed to fetch catalog-exercises: {str(e)}")
@@ -1,6 +1,18 @@
 import httpx
-from app.core.config import DB_SERVICE_URL
 from app.schemas.user_profile_schemas import UserProfileCreate
+from app.services.resilience import upstream_request
+
+# Response header of the database microservice carrying the exercise catalog revision
+CATALOG_REVISION_HEADER = "X-Catalog-Revision"
+
+# Response header of GET /workout-plans/{plan_id} carrying the owner's user ID
+PLAN_OWNER_HEADER = "X-Plan-Owner"
+
+
+def _int_header(response: httpx.Response, name: str) -> int | None:
+    # Integer header value, or None if absent (older database service) or malformed
+    value = response.headers.get(name)
+    return int(value) if value and value.isdigit() else None
 
 async def get_user_by_username(username: str) -> dict | None:
     """
@@ -12,15 +24,35 @@ async def get_user_by_username(username: str) -> dict | None:
     Returns:
         dict | None: User metadata (must include 'id') or None on failure.
     """
-    url = f"{DB_SERVICE_URL}/users/{username}"
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(url)
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPError as e:
-            print(f"[DB] GET /users/{{username}} failed: {e}")
-            return None
+    try:
+        response = await upstream_request("db", "GET", f"/users/{username}")
+        response.raise_for_status()
+        return response.json()
+    except httpx.HTTPError as e:
+        print(f"[DB] GET /users/{{username}} failed: {e}")
+        return None
+
+
+async def get_generation_context(username: str) -> dict | None:
+    """
+    Retrieves everything needed to generate a plan in one round trip:
+    the user's ID, profile and latest plan summary.
+
+    Args:
+        username (str): Unique username identifier.
+
+    Returns:
+        dict | None: {"user_id", "profile", "last_plan", "catalog_revision"} (profile,
+                     last_plan and catalog_revision may be None), or None if the user
+                     was not found or the request failed.
+    """
+    try:
+        response = await upstream_request("db", "GET", f"/users/{username}/generation-context")
+        response.raise_for_status()
+        return {**response.json(), "catalog_revision": _int_header(response, CATALOG_REVISION_HEADER)}
+    except httpx.HTTPError as e:
+        print(f"[DB] GET /users/{{username}}/generation-context failed: {e}")
+        return None
 
 
 async def get_user_profile_by_id(user_id: int) -> dict | None:
@@ -33,14 +65,12 @@ async def get_user_profile_by_id(user_id: int) -> dict | None:
     Returns:
         dict | None: Existing profile data or None if not found.
     """
-    url = f"{DB_SERVICE_URL}/users/{user_id}/profile"
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(url)
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPError:
-            return None
+    try:
+        response = await upstream_request("db", "GET", f"/users/{user_id}/profile")
+        response.raise_for_status()
+        return response.json()
+    except httpx.HTTPError:
+        return None
 
 
 async def update_user_profile(user_id: int, profile_data: UserProfileCreate) -> dict | None:
@@ -54,15 +84,33 @@ async def update_user_profile(user_id: int, profile_data: UserProfileCreate) ->
     Returns:
         dict | None: Updated profile on success, None on failure.
     """
-    url = f"{DB_SERVICE_URL}/users/{user_id}/profile"
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.put(url, json=profile_data.dict(exclude_unset=True))
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPError as e:
-            print(f"[DB] PUT /users/{{id}}/profile failed: {e}")
-            return None
+    try:
+        response = await upstream_request("db", "PUT", f"/users/{user_id}/profile", json=profile_data.dict(exclude_unset=True))
+        response.raise_for_status()
+        return response.json()
+    except httpx.HTTPError as e:
+        print(f"[DB] PUT /users/{{id}}/profile failed: {e}")
+        return None
+
+
+async def update_user_password(user_id: int, hashed_password: str) -> bool:
+    """
+    Replaces a user's stored password hash in the database microservice.
+
+    Args:
+        user_id (int): Unique user ID.
+        hashed_password (str): The new bcrypt hash.
+
+    Returns:
+        bool: True if updated successfully, False otherwise.
+    """
+    try:
+        response = await upstream_request("db", "PUT", f"/users/{user_id}/password", json={"hashed_password": hashed_password})
+        response.raise_for_status()
+        return True
+    except httpx.HTTPError as e:
+        print(f"[DB] PUT /users/{{id}}/password failed: {e}")
+        return False
 
 
 async def get_latest_user_plan(user_id: int) -> dict | None:
@@ -75,17 +123,14 @@ async def get_latest_user_plan(user_id: int) -> dict | None:
     Returns:
         dict | None: Latest workout plan data, or None if not found.
     """
-    url = f"{DB_SERVICE_URL}/users/{user_id}/plans/last"
+    try:
+        response = await upstream_request("db", "GET", f"/users/{user_id}/plans/last")
+        response.raise_for_status()
+        return response.json()  # Returns the plan data as a Python dictionary
+    except httpx.HTTPError as e:
+        print(f"[DB] GET /users/{user_id}/plans/last failed: {e}")
+        return None
 
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(url)
-            response.raise_for_status()
-            return response.json()  # Returns the plan data as a Python dictionary
-        except httpx.HTTPError as e:
-            print(f"[DB] GET /users/{user_id}/plans/last failed: {e}")
-            return None
-        
 
 async def save_workout_plan_to_db(plan_data: dict) -> int | None:
     """
@@ -98,39 +143,174 @@ async def save_workout_plan_to_db(plan_data: dict) -> int | None:
         bool: True if saved successfully, False otherwise
     """
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(f"{DB_SERVICE_URL}/workout-plans", json=plan_data)
-            response.raise_for_status()
-            return response.json().get("plan_id")
+        response = await upstream_request("db", "POST", "/workout-plans", json=plan_data)
+        response.raise_for_status()
+        return response.json().get("plan_id")
     except httpx.HTTPError as e:
         print(f"[ERROR] Failed to save workout plan: {e}")
         return None
     
     
 
-async def db_service_get(endpoint: str):
+async def create_workout_plan_in_db(plan_data: dict) -> dict | None:
+    """
+    Saves a generated workout plan in the database microservice and returns
+    the stored plan from the same request (no follow-up GET needed).
+
+    Args:
+        plan_data (dict): Structured plan including user_id, days, exercises
+
+    Returns:
+        dict | None: {"plan_id", "plan"} on success, None on failure.
+    """
+    try:
+        response = await upstream_request("db", "POST", "/workout-plans", params={"include_plan": "true"}, json=plan_data)
+        response.raise_for_status()
+        return response.json()
+    except httpx.HTTPError as e:
+        print(f"[ERROR] Failed to save workout plan: {e}")
+        return None
+
+
+async def get_user_plans_page(
+    user_id: int,
+    status: str | None = None,
+    view: str = "full",
+    limit: int | None = None,
+    cursor: str | None = None
+) -> tuple[list, str | None, int | None]:
+    """
+    Retrieves one page of a user's workout plans from the database microservice.
+
+    Args:
+        user_id (int): Unique user ID.
+        status (str | None): Optional status filter ('active', 'archived').
+        view (str): 'full' (with days and exercises) or 'summary' (plan headers only).
+        limit (int | None): Page size, or None for all plans.
+        cursor (str | None): Cursor of the page to fetch (from a previous page).
+
+    Returns:
+        tuple: (plans, next_cursor, catalog_revision); next_cursor is None on the
+               last page, catalog_revision is None if not reported.
+
+    Raises:
+        httpx.HTTPStatusError: On 4xx/5xx responses (e.g. 404 when the user has no plans).
+    """
+    params = {"user_id": user_id, "view": view}
+    if status:
+        params["status"] = status
+    if limit:
+        params["limit"] = limit
+    if cursor:
+        params["cursor"] = cursor
+
+    response = await upstream_request("db", "GET", "/workout-plans", params=params)
+    response.raise_for_status()
+    return response.json(), response.headers.get("X-Next-Cursor"), _int_header(response, CATALOG_REVISION_HEADER)
+
+
+async def get_user_plans_batch(user_id: int, plan_ids: list[int]) -> tuple[list, int | None]:
+    """
+    Retrieves several of a user's workout plans in one request.
+
+    Args:
+        user_id (int): Unique user ID; plans owned by other users are left out.
+        plan_ids (list[int]): IDs of the plans to fetch.
+
+    Returns:
+        tuple: (plans found in the order of `plan_ids`, catalog revision or None).
+
+    Raises:
+        httpx.HTTPStatusError: On 4xx/5xx responses.
+    """
+    params = {"ids": ",".join(str(plan_id) for plan_id in plan_ids)}
+    response = await upstream_request("db", "GET", f"/users/{user_id}/plans/batch", params=params, hedge=True)
+    response.raise_for_status()
+    return response.json(), _int_header(response, CATALOG_REVISION_HEADER)
+
+
+async def get_plan(plan_id: int) -> tuple[dict, int | None, int | None]:
+    """
+    Retrieves one workout plan by ID, with what the plan cache needs to store it.
+
+    Args:
+        plan_id (int): Unique plan ID.
+
+    Returns:
+        tuple: (plan, owner's user ID, catalog revision); the last two are None
+               if the database microservice does not report them.
+
+    Raises:
+        httpx.HTTPStatusError: On 4xx/5xx responses (e.g. 404 when the plan does not exist).
+    """
+    response = await upstream_request("db", "GET", f"/workout-plans/{plan_id}", hedge=True)
+    response.raise_for_status()
+    return response.json(), _int_header(response, PLAN_OWNER_HEADER), _int_header(response, CATALOG_REVISION_HEADER)
+
+
+async def open_user_plans_export(user_id: int, status: str | None = None) -> httpx.Response:
+    """
+    Opens the NDJSON export of a user's full plan history from the database microservice
+    without reading the body.
+
+    Args:
+        user_id (int): Unique user ID.
+        status (str | None): Optional status filter ('active', 'archived').
+
+    Returns:
+        httpx.Response: The streaming response; the caller iterates it and must close it.
+
+    Raises:
+        httpx.HTTPStatusError: On 4xx/5xx responses (the response is closed first).
+    """
+    params = {"status": status} if status else None
+    response = await upstream_request("db", "GET", f"/users/{user_id}/plans/export", params=params, stream=True)
+    if response.is_error:
+        await response.aread()
+        await response.aclose()
+        response.raise_for_status()
+    return response
+
+
+async def get_catalog_exercise_names() -> tuple[list, int | None]:
+    """
+    Retrieves the (exercise name, equipment) pairs of the exercise catalog.
+
+    Returns:
+        tuple: (pairs, catalog revision); the revision is None if the database
+               microservice does not report it.
+
+    Raises:
+        httpx.HTTPError: On 4xx/5xx responses and network failures.
+    """
+    response = await upstream_request("db", "GET", "/catalog-exercises/names")
+    response.raise_for_status()
+    return response.json(), _int_header(response, CATALOG_REVISION_HEADER)
+
+
+async def db_service_get(endpoint: str, hedge: bool = False):
     """
     Sends a GET request to the database microservice.
 
     Parameters:
     - endpoint: the relative URL path, e.g., "workout-plans?user_id=5"
+    - hedge: send a duplicate request if the first one is slow (for latency-sensitive reads)
 
     Returns:
     - The response JSON (parsed as dict or list)
     - Raises HTTPError if the response fails (caught in your route)
     """
-    # Build the full URL safely to avoid double slashes
-    url = f"{DB_SERVICE_URL.rstrip('/')}/{endpoint.lstrip('/')}"
+    # Build the relative path safely to avoid double slashes
+    path = f"/{endpoint.lstrip('/')}"
 
-    # Use async HTTP client to send the request
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url)
+    # Send through the resilience layer (breaker, retries, deadline)
+    response = await upstream_request("db", "GET", path, hedge=hedge)
 
-        # Raise an exception if the status code is 4xx or 5xx
-        response.raise_for_status()
+    # Raise an exception if the status code is 4xx or 5xx
+    response.raise_for_status()
 
-        # Parse and return the response body as JSON (dict or list)
-        return response.json()
+    # Parse and return the response body as JSON (dict or list)
+    return response.json()
     
 
 
@@ -143,11 +323,10 @@ async def db_service_delete(endpoint: str) -> None:
     - Raises other exceptions for network failures
     """
      
-     # Build the full URL safely to avoid double slashes   
-     url = f"{DB_SERVICE_URL.rstrip('/')}/{endpoint.lstrip('/')}"
-
-     # Use async HTTP client to send the delete request
-     async with httpx.AsyncClient() as client:
-         response = await client.delete(url)
-        # Raise an exception if the status code is 4xx or 5xx
-         response.raise_for_status()
+     # Build the relative path safely to avoid double slashes
+     path = f"/{endpoint.lstrip('/')}"
+
+     # Send the delete request through the resilience layer (breaker, deadline)
+     response = await upstream_request("db", "DELETE", path)
+     # Raise an exception if the status code is 4xx or 5xx
+     response.raise_for_status()
@@ -0,0 +1,143 @@
+# services/http_client.py
+# Application-scoped, pooled HTTP clients for calls to the other microservices.
+# One client per upstream (DB service, AI service) so connections are kept alive
+# and reused across requests instead of being opened and closed on every call.
+
+import importlib.util
+import httpx
+from typing import Dict, Optional
+from app.core.config import (
+    DB_SERVICE_URL,
+    AI_SERVICE_URL,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    HTTP_KEEPALIVE_EXPIRY,
+    HTTP2_ENABLED,
+    DB_SERVICE_TIMEOUT,
+    AI_SERVICE_TIMEOUT,
+)
+
+# HTTP/2 needs the optional 'h2' package, otherwise stay on HTTP/1.1
+_http2 = HTTP2_ENABLED and importlib.util.find_spec("h2") is not None
+
+# Upstream name -> (base URL, timeout in seconds)
+_UPSTREAMS = {
+    "db": (DB_SERVICE_URL, DB_SERVICE_TIMEOUT),
+    "ai": (AI_SERVICE_URL, AI_SERVICE_TIMEOUT),
+}
+
+# Live clients and simple request counters, keyed by upstream name
+_clients: Dict[str, httpx.AsyncClient] = {}
+_request_counts: Dict[str, int] = {}
+
+
+def _create_client(name: str) -> httpx.AsyncClient:
+    """
+    Builds a pooled AsyncClient for the given upstream using the configured
+    pool limits, keep-alive expiry, timeout and HTTP/2 setting.
+    """
+    base_url, timeout = _UPSTREAMS[name]
+
+    async def count_request(request: httpx.Request) -> None:
+        _request_counts[name] = _request_counts.get(name, 0) + 1
+
+    return httpx.AsyncClient(
+        base_url=base_url.rstrip("/"),
+        timeout=httpx.Timeout(timeout),
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+        ),
+        http2=_http2,
+        event_hooks={"request": [count_request]},
+    )
+
+
+def _get_client(name: str) -> httpx.AsyncClient:
+    # Created lazily as a fallback when the app lifespan has not started them
+    client = _clients.get(name)
+    if client is None or client.is_closed:
+        client = _create_client(name)
+        _clients[name] = client
+    return client
+
+
+def get_db_client() -> httpx.AsyncClient:
+    """
+    Returns the shared client for the database microservice.
+    Paths are relative to DB_SERVICE_URL, e.g. client.get("/users/5/profile").
+    """
+    return _get_client("db")
+
+
+def get_ai_client() -> httpx.AsyncClient:
+    """
+    Returns the shared client for the AI microservice.
+    Paths are relative to AI_SERVICE_URL, e.g. client.post("/ai/generate").
+    """
+    return _get_client("ai")
+
+
+async def start_http_clients() -> None:
+    """
+    Creates the shared clients. Called once from the FastAPI lifespan on startup.
+    """
+    for name in _UPSTREAMS:
+        _get_client(name)
+
+
+async def close_http_clients() -> None:
+    """
+    Closes the shared clients and their pooled connections on shutdown.
+    """
+    for client in list(_clients.values()):
+        await client.aclose()
+    _clients.clear()
+
+
+def _pool_connections(client: Optional[httpx.AsyncClient]) -> Optional[list]:
+    """
+    Returns the connections of the client's pool, or None if they cannot be read.
+    httpx does not expose its pool publicly, so this reads private attributes of the
+    transport and the pool; any of them may change in a future httpx release.
+    """
+    if client is None:
+        return []
+    try:
+        return list(client._transport._pool.connections)
+    except (AttributeError, TypeError):
+        return None
+
+
+def get_pool_stats() -> Dict[str, Dict[str, Optional[int]]]:
+    """
+    Returns connection pool usage per upstream for monitoring.
+
+    Returns:
+        dict: For each upstream, the number of open, active (in use) and idle
+              connections, the configured maximum and the total request count.
+              The connection counts are None if the installed httpx does not
+              allow reading its pool.
+    """
+    stats = {}
+    for name in _UPSTREAMS:
+        connections = _pool_connections(_clients.get(name))
+        open_connections = active = idle = None
+        if connections is not None:
+            try:
+                idle = sum(1 for conn in connections if conn.is_idle())
+            except (AttributeError, TypeError):
+                idle = None
+            else:
+                open_connections = len(connections)
+                active = open_connections - idle
+
+        stats[name] = {
+            "open_connections": open_connections,
+            "active_connections": active,
+            "idle_connections": idle,
+            "max_connections": HTTP_MAX_CONNECTIONS,
+            "requests_total": _request_counts.get(name, 0),
+        }
+    return stats
@@ -0,0 +1,96 @@
+# services/idempotency_service.py
+# Idempotency-Key handling: requests repeated with the same key (per user) share
+# one execution. Duplicates that arrive while the first one is still running attach
+# to it, and successful results are replayed for IDEMPOTENCY_TTL seconds.
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional, Tuple
+from fastapi import HTTPException, status
+from app.core.config import IDEMPOTENCY_TTL, IDEMPOTENCY_MAX_KEYS
+
+# Longest accepted Idempotency-Key header value
+MAX_KEY_LENGTH = 255
+
+# (username, scope, key) -> {"task": asyncio.Task, "expires_at": float | None, "waiters": int}
+# expires_at is None while the task is still running; waiters counts the requests
+# currently awaiting the task
+_entries: "OrderedDict[Tuple[str, str, str], dict]" = OrderedDict()
+
+
+async def run_idempotent(
+    username: str,
+    key: Optional[str],
+    func: Callable[[], Awaitable[Any]],
+    scope: str = ""
+) -> Tuple[Any, bool]:
+    """
+    Runs `func` at most once per (username, key).
+
+    Args:
+        username: Owner of the key, so users cannot see each other's results.
+        key: Value of the Idempotency-Key header, or None to always run `func`.
+        func: Coroutine factory producing the result.
+        scope: Separates keys of operations that return different results.
+
+    Returns:
+        (result, replayed): replayed is True if the result came from an earlier request.
+
+    Raises:
+        HTTPException: 400 if the key is too long; otherwise whatever `func` raised.
+                       Failed executions are not remembered, so a retry runs again.
+    """
+    if key is None:
+        return await func(), False
+
+    if not key or len(key) > MAX_KEY_LENGTH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} characters"
+        )
+
+    entry_key = (username, scope, key)
+    entry = _entries.get(entry_key)
+    if entry is not None and entry["expires_at"] is not None and entry["expires_at"] <= time.monotonic():
+        # Replay window is over, treat as a new request
+        del _entries[entry_key]
+        entry = None
+    replayed = entry is not None
+
+    if entry is None:
+        # Run in its own task so a disconnecting client does not cancel it for the others
+        task = asyncio.create_task(func())
+        entry = {"task": task, "expires_at": None, "waiters": 0}
+        _entries[entry_key] = entry
+        task.add_done_callback(lambda t: _on_done(entry_key, entry, t))
+
+        # Evict the least recently used keys when full
+        while len(_entries) > IDEMPOTENCY_MAX_KEYS:
+            _entries.popitem(last=False)
+    else:
+        _entries.move_to_end(entry_key)
+
+    entry["waiters"] += 1
+    try:
+        return await asyncio.shield(entry["task"]), replayed
+    finally:
+        entry["waiters"] -= 1
+
+
+def _on_done(entry_key: Tuple[str, str, str], entry: dict, task: asyncio.Task) -> None:
+    # Retrieve the exception here: if every waiter disconnected, nobody else will
+    error = None if task.cancelled() else task.exception()
+    if error is not None and not entry["waiters"]:
+        print(f"[IDEMPOTENCY] Request with no waiter left failed: {error!r}")
+
+    if _entries.get(entry_key) is not entry:
+        # Evicted (or replaced) while running
+        return
+
+    if task.cancelled() or error is not None:
+        # Only successful results are replayed
+        del _entries[entry_key]
+    else:
+        entry["expires_at"] = time.monotonic() + IDEMPOTENCY_TTL
+
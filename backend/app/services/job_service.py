@@ -0,0 +1,299 @@
+# services/job_service.py
+# Background execution of plan generation jobs (opt-in async mode of /generate-plan).
+# Jobs are queued in a bounded in-process queue, run by a fixed number of workers,
+# and their status is kept in a pluggable job store that clients poll or stream.
+
+import asyncio
+import json
+import traceback
+import time
+import uuid
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, List, Optional
+from fastapi import HTTPException, status
+from app.core.config import PLAN_JOB_WORKERS, PLAN_JOB_QUEUE_SIZE, PLAN_JOB_TTL, PLAN_JOB_STORE
+from app.services.plan_generation_service import generate_plan_for_user
+
+# Job statuses that will not change anymore
+FINISHED_STATUSES = ("succeeded", "failed")
+
+
+class JobStore(ABC):
+    """
+    Interface of a job store. Jobs are plain dicts with at least
+    'job_id', 'username', 'status', 'version', 'created_at' and 'updated_at'.
+    Implement this to keep jobs somewhere other than process memory.
+    """
+
+    @abstractmethod
+    async def create(self, job: dict) -> None:
+        ...
+
+    @abstractmethod
+    async def get(self, job_id: str) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    async def update(self, job_id: str, **fields) -> Optional[dict]:
+        ...
+
+    async def wait_for_change(self, job_id: str, version: int, timeout: float) -> None:
+        """
+        Waits until the job's version differs from `version` or the timeout passes.
+        The default implementation simply polls.
+        """
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            job = await self.get(job_id)
+            if not job or job["version"] != version:
+                return
+            await asyncio.sleep(min(0.5, max(0.0, deadline - time.monotonic())))
+
+    async def purge_expired(self) -> None:
+        """
+        Drops finished jobs older than the TTL. Called periodically by the job workers;
+        stores that expire jobs on their own can keep this no-op.
+        """
+
+
+class InMemoryJobStore(JobStore):
+    """
+    Keeps jobs in process memory. Finished jobs are dropped after PLAN_JOB_TTL seconds
+    (purged on every access, and periodically by the job workers' sweeper).
+    Suitable for local runs and single-worker deployments.
+    """
+
+    def __init__(self, ttl: float = PLAN_JOB_TTL):
+        self._ttl = ttl
+        self._jobs: Dict[str, dict] = {}
+        self._finished_at: Dict[str, float] = {}
+        self._changed: Dict[str, asyncio.Event] = {}
+
+    async def create(self, job: dict) -> None:
+        self._purge_expired()
+        self._jobs[job["job_id"]] = dict(job)
+        self._changed[job["job_id"]] = asyncio.Event()
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        self._purge_expired()
+        job = self._jobs.get(job_id)
+        return dict(job) if job else None
+
+    async def update(self, job_id: str, **fields) -> Optional[dict]:
+        job = self._jobs.get(job_id)
+        if not job:
+            return None
+
+        job.update(fields)
+        job["version"] += 1
+        if job["status"] in FINISHED_STATUSES:
+            self._finished_at[job_id] = time.monotonic()
+
+        # Wake up waiters and arm a fresh event for the next change
+        self._changed[job_id].set()
+        self._changed[job_id] = asyncio.Event()
+        return dict(job)
+
+    async def wait_for_change(self, job_id: str, version: int, timeout: float) -> None:
+        job = self._jobs.get(job_id)
+        if not job or job["version"] != version:
+            return
+        try:
+            await asyncio.wait_for(self._changed[job_id].wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def purge_expired(self) -> None:
+        self._purge_expired()
+
+    def _purge_expired(self) -> None:
+        now = time.monotonic()
+        for job_id, finished_at in list(self._finished_at.items()):
+            if now - finished_at > self._ttl:
+                self._jobs.pop(job_id, None)
+                self._changed.pop(job_id, None)
+                del self._finished_at[job_id]
+
+
+def _create_store() -> JobStore:
+    if PLAN_JOB_STORE == "memory":
+        return InMemoryJobStore()
+    raise ValueError(f"Unknown PLAN_JOB_STORE: {PLAN_JOB_STORE}")
+
+
+_store: JobStore = _create_store()
+
+# Queue of (job_id, username) waiting for a worker, and the worker tasks
+# (plus the sweeper purging expired jobs)
+_queue: Optional[asyncio.Queue] = None
+_workers: List[asyncio.Task] = []
+
+# Seconds between two purges of expired jobs by the sweeper
+_PURGE_INTERVAL = max(1.0, min(60.0, PLAN_JOB_TTL / 2))
+
+
+def set_job_store(store: JobStore) -> None:
+    """
+    Replaces the job store (e.g. with a shared, persistent implementation).
+    """
+    global _store
+    _store = store
+
+
+async def start_job_workers() -> None:
+    """
+    Creates the job queue and starts the background workers.
+    Called from the FastAPI lifespan on startup.
+    """
+    global _queue
+    if _workers:
+        return
+    _queue = asyncio.Queue(maxsize=PLAN_JOB_QUEUE_SIZE)
+    for _ in range(PLAN_JOB_WORKERS):
+        _workers.append(asyncio.create_task(_worker(_queue)))
+    _workers.append(asyncio.create_task(_sweeper()))
+
+
+async def stop_job_workers() -> None:
+    """
+    Cancels the background workers on shutdown. Queued jobs are dropped.
+    """
+    global _queue
+    for task in _workers:
+        task.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
+    _queue = None
+
+
+async def submit_plan_job(username: str) -> dict:
+    """
+    Queues a plan generation job for the user.
+
+    Returns:
+        dict: The newly created job.
+
+    Raises:
+        HTTPException: 503 if the job queue is full.
+    """
+    # Started lazily as a fallback when the app lifespan has not started them
+    if _queue is None:
+        await start_job_workers()
+
+    if _queue.full():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many plan generation jobs in progress, please retry shortly",
+            headers={"Retry-After": "5"},
+        )
+
+    now = _now()
+    job = {
+        "job_id": uuid.uuid4().hex,
+        "username": username,
+        "status": "queued",
+        "version": 0,
+        "created_at": now,
+        "updated_at": now,
+        "result": None,
+        "error": None,
+    }
+    await _store.create(job)
+    _queue.put_nowait((job["job_id"], username))
+    return job
+
+
+async def get_job(job_id: str, username: str) -> dict:
+    """
+    Returns a job owned by the user.
+    Raises HTTP 404 if it does not exist, has expired or belongs to someone else.
+    """
+    job = await _store.get(job_id)
+    if not job or job["username"] != username:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return job
+
+
+async def stream_job_events(job_id: str, username: str, keepalive: float = 15.0) -> AsyncIterator[str]:
+    """
+    Yields Server-Sent Events for a job: one 'status' event per change,
+    ending after the job has succeeded or failed.
+    """
+    job = await get_job(job_id, username)
+    while True:
+        yield f"event: status\ndata: {json.dumps(to_public_job(job))}\n\n"
+        if job["status"] in FINISHED_STATUSES:
+            return
+
+        version = job["version"]
+        while job and job["version"] == version:
+            await _store.wait_for_change(job_id, version, keepalive)
+            job = await _store.get(job_id)
+            if job and job["version"] == version:
+                # Comment line keeps proxies from closing an idle stream
+                yield ": keep-alive\n\n"
+
+        if not job:
+            # Expired while streaming
+            return
+
+
+def to_public_job(job: dict) -> dict:
+    """
+    Strips internal fields from a job before it is returned to the client.
+    """
+    return {key: value for key, value in job.items() if key not in ("username", "version")}
+
+
+async def _worker(queue: asyncio.Queue) -> None:
+    # Runs jobs one at a time until cancelled. A job that fails outside of plan
+    # generation (e.g. the job store raising) is logged and skipped, so the
+    # worker itself never dies.
+    while True:
+        job_id, username = await queue.get()
+        try:
+            await _run_job(job_id, username)
+        except Exception:
+            print(f"[JOBS] Worker failed to run job {job_id}:\n{traceback.format_exc()}")
+            await _mark_failed(job_id)
+        finally:
+            queue.task_done()
+
+
+async def _mark_failed(job_id: str) -> None:
+    # Best effort, so the job does not stay 'queued'/'running' forever
+    try:
+        await _store.update(job_id, status="failed", updated_at=_now(),
+                            error={"status_code": 500, "detail": "Failed to generate workout plan"})
+    except Exception as e:
+        print(f"[JOBS] Could not mark job {job_id} as failed: {e}")
+
+
+async def _sweeper() -> None:
+    # Purges expired jobs even while no new jobs are created
+    while True:
+        await asyncio.sleep(_PURGE_INTERVAL)
+        try:
+            await _store.purge_expired()
+        except Exception as e:
+            print(f"[JOBS] Purging expired jobs failed: {e}")
+
+
+async def _run_job(job_id: str, username: str) -> None:
+    await _store.update(job_id, status="running", updated_at=_now())
+    try:
+        result = await generate_plan_for_user(username)
+    except HTTPException as e:
+        await _store.update(job_id, status="failed", updated_at=_now(),
+                            error={"status_code": e.status_code, "detail": str(e.detail)})
+    except Exception as e:
+        print(f"[JOBS] Plan generation job {job_id} failed: {e}")
+        await _store.update(job_id, status="failed", updated_at=_now(),
+                            error={"status_code": 500, "detail": "Failed to generate workout plan"})
+    else:
+        await _store.update(job_id, status="succeeded", updated_at=_now(), result=result)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
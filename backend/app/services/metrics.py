@@ -0,0 +1,110 @@
+# services/metrics.py
+# Prometheus metrics of the backend, served at GET /metrics:
+# - request latency histograms by route template, method and status
+# - in-flight request gauges
+# - upstream call latency histograms keyed by target endpoint (see resilience.py)
+# - circuit breaker state, failures, rejections and open transitions per endpoint
+# - admission control of AI calls: queue depth, in-flight calls, waits and rejections
+# Recording a request costs a couple of dict lookups and lock-protected increments,
+# cheap enough to stay enabled in production (see benchmarks/bench_metrics_overhead.py).
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+from app.services.observability import RequestMetricsMiddleware
+
+# Latency buckets (seconds) spanning cache hits up to LLM-bound plan generation
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time spent handling HTTP requests",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being handled",
+    ["method"],
+)
+
+UPSTREAM_LATENCY = Histogram(
+    "upstream_request_duration_seconds",
+    "Time spent on calls to the DB and AI microservices, per attempt",
+    ["upstream", "endpoint", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+
+# Values of circuit_breaker_state
+BREAKER_STATE_VALUES = {"closed": 0, "half_open": 1, "open": 2}
+
+CIRCUIT_BREAKER_STATE = Gauge(
+    "circuit_breaker_state",
+    "State of the circuit breaker of an upstream endpoint: 0 closed, 1 half-open, 2 open",
+    ["upstream", "endpoint"],
+)
+
+CIRCUIT_BREAKER_FAILURES = Counter(
+    "circuit_breaker_failures_total",
+    "Failed upstream calls counted by the circuit breaker",
+    ["upstream", "endpoint"],
+)
+
+CIRCUIT_BREAKER_REJECTIONS = Counter(
+    "circuit_breaker_rejections_total",
+    "Upstream calls rejected without being sent because the breaker was open",
+    ["upstream", "endpoint"],
+)
+
+CIRCUIT_BREAKER_OPENED = Counter(
+    "circuit_breaker_opened_total",
+    "Transitions of a circuit breaker to open",
+    ["upstream", "endpoint"],
+)
+
+AI_ADMISSION_QUEUE_DEPTH = Gauge(
+    "ai_admission_queue_depth",
+    "Plan generations waiting for a free AI slot",
+)
+
+AI_ADMISSION_IN_FLIGHT = Gauge(
+    "ai_admission_in_flight",
+    "AI calls currently holding a slot",
+)
+
+AI_ADMISSION_WAIT = Histogram(
+    "ai_admission_wait_seconds",
+    "Time admitted plan generations waited for an AI slot",
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+AI_ADMISSION_REJECTIONS = Counter(
+    "ai_admission_rejections_total",
+    "Plan generations rejected by admission control",
+    ["reason"],
+)
+
+METRICS_CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+
+class MetricsMiddleware(RequestMetricsMiddleware):
+    """
+    Records the latency and in-flight count of every HTTP request into REQUEST_LATENCY
+    and REQUESTS_IN_PROGRESS (see observability.RequestMetricsMiddleware).
+    """
+
+    def __init__(self, app):
+        super().__init__(app, REQUEST_LATENCY, REQUESTS_IN_PROGRESS)
+
+
+def observe_upstream_call(upstream: str, endpoint: str, outcome: str, seconds: float) -> None:
+    """
+    Records one upstream attempt. `outcome` is the status code or 'error'.
+    """
+    UPSTREAM_LATENCY.labels(upstream, endpoint, outcome).observe(seconds)
+
+
+def render_metrics() -> bytes:
+    """
+    Returns all metrics in the Prometheus text exposition format.
+    """
+    return generate_latest()
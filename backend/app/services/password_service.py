@@ -0,0 +1,88 @@
+# services/password_service.py
+# Password hashing and verification with bcrypt, run off the event loop.
+# bcrypt takes hundreds of milliseconds per call, so every hash/verify runs in a
+# dedicated, size-limited thread pool. When too many jobs are waiting, new ones
+# are rejected with 503 instead of piling up behind a login storm.
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Tuple, TypeVar
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+from app.core.config import BCRYPT_ROUNDS, PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_QUEUE
+
+T = TypeVar("T")
+
+# Password hashing configuration using bcrypt.
+# min/max rounds are pinned to the configured cost so hashes created with a
+# different cost are reported as needing an update (re-hashed on next login).
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS,
+)
+
+# Dedicated pool so hashing never competes with the default executor
+_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+
+# Jobs submitted and not finished yet (running + waiting)
+_pending_jobs = 0
+
+
+async def _run_in_pool(func: Callable[..., T], *args) -> T:
+    """
+    Runs a blocking hashing function in the bcrypt pool.
+    Raises HTTP 503 when the wait queue is full.
+    """
+    global _pending_jobs
+    if _pending_jobs >= PASSWORD_HASH_WORKERS + PASSWORD_HASH_MAX_QUEUE:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many concurrent login requests, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
+
+    _pending_jobs += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_executor, func, *args)
+    finally:
+        _pending_jobs -= 1
+
+
+async def hash_password(password: str) -> str:
+    """
+    Hashes the user's password securely using bcrypt.
+    """
+    return await _run_in_pool(pwd_context.hash, password)
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verifies a plain-text password against its bcrypt hash.
+    """
+    return await _run_in_pool(pwd_context.verify, plain_password, hashed_password)
+
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verifies a password and, if the stored hash uses an outdated bcrypt cost,
+    returns a new hash to store.
+
+    Returns:
+        (bool, str | None): whether the password matched, and the replacement hash if one is needed.
+    """
+    return await _run_in_pool(pwd_context.verify_and_update, plain_password, hashed_password)
+
+
+def get_hashing_stats() -> dict:
+    """
+    Returns current hashing pool usage for monitoring.
+    """
+    return {
+        "workers": PASSWORD_HASH_WORKERS,
+        "max_queue": PASSWORD_HASH_MAX_QUEUE,
+        "pending_jobs": _pending_jobs,
+    }
@@ -0,0 +1,216 @@
+# services/plan_cache_service.py
+# In-process cache of serialized workout plans served by GET /plans and GET /plan/{id}.
+# Plan content never changes after creation; only 'status' does (generation archives
+# the previous active plan) and plans can be deleted. Those writes invalidate the
+# affected entries here, and a short TTL bounds staleness across backend workers.
+# Plan documents also embed exercise catalog data, so everything cached is dropped
+# when the database service reports a newer catalog revision (X-Catalog-Revision).
+
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set, Tuple
+from app.core.config import PLAN_CACHE_MAX_ENTRIES, PLAN_CACHE_MAX_BYTES, PLAN_CACHE_TTL
+
+
+class PlanCache:
+    """
+    LRU cache of plan list pages (per user and query) and single plans,
+    bounded by entry count and by the approximate JSON size of the cached data.
+
+    Entries are indexed by owner and, for list pages, by the plans they contain,
+    so invalidation only touches the affected entries.
+    """
+
+    def __init__(self, max_entries: int = PLAN_CACHE_MAX_ENTRIES,
+                 max_bytes: int = PLAN_CACHE_MAX_BYTES, ttl: float = PLAN_CACHE_TTL):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        # key -> {"value", "owner", "size", "expires_at"}
+        self._entries: "OrderedDict[Tuple, dict]" = OrderedDict()
+        self._bytes = 0
+        # owner -> keys of the entries it owns
+        self._by_owner: Dict[int, Set[Tuple]] = {}
+        # plan ID -> keys of the list pages containing it
+        self._lists_by_plan: Dict[int, Set[Tuple]] = {}
+        # keys of the plans whose owner is unknown
+        self._unowned_plans: Set[Tuple] = set()
+        # Newest catalog revision seen; cached data is from this revision
+        self.catalog_revision: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # ---------- reads ----------
+
+    def get_list(self, user_id: int, query: Tuple) -> Optional[Tuple[list, Optional[str]]]:
+        """
+        Returns (plans, next_cursor) cached for the user's listing query, or None.
+        `query` is a hashable description of the listing (status, view, limit, cursor).
+        """
+        page = self._get(("list", user_id, query))
+        return None if page is None else (page["plans"], page["next_cursor"])
+
+    def get_plan(self, plan_id: int, owner: Optional[int] = None) -> Optional[dict]:
+        """
+        Returns the cached plan, or None. With `owner`, only a plan known to belong
+        to that user is returned.
+        """
+        if owner is not None:
+            entry = self._entries.get(("plan", plan_id))
+            if entry is None or entry["owner"] != owner:
+                self.misses += 1
+                return None
+        return self._get(("plan", plan_id))
+
+    # ---------- writes ----------
+
+    def put_list(self, user_id: int, query: Tuple, plans: list, next_cursor: Optional[str] = None,
+                 catalog_revision: Optional[int] = None) -> None:
+        if not self.observe_catalog_revision(catalog_revision):
+            return
+        self._put(("list", user_id, query), {"plans": plans, "next_cursor": next_cursor}, owner=user_id)
+        # Full plans seen in a user's listing are known to belong to that user
+        for plan in plans:
+            if "days" in plan:
+                self._put(("plan", plan["id"]), plan, owner=user_id)
+
+    def put_plan(self, plan_id: int, plan: dict, owner: Optional[int] = None,
+                 catalog_revision: Optional[int] = None) -> None:
+        if not self.observe_catalog_revision(catalog_revision):
+            return
+        existing = self._entries.get(("plan", plan_id))
+        if owner is None and existing is not None:
+            owner = existing["owner"]
+        self._put(("plan", plan_id), plan, owner=owner)
+
+    # ---------- invalidation ----------
+
+    def observe_catalog_revision(self, revision: Optional[int]) -> bool:
+        """
+        Records the catalog revision reported by the database service, dropping
+        every entry when it is newer than the cached data. Returns False if the
+        revision is older (data read before a catalog change must not be cached).
+        None (revision not reported) is always accepted.
+        """
+        if revision is None:
+            return True
+        if self.catalog_revision is not None and revision < self.catalog_revision:
+            return False
+        if revision != self.catalog_revision:
+            if self._entries:
+                print(f"[PLAN CACHE] Catalog revision {self.catalog_revision} -> {revision}, dropping {len(self._entries)} entries")
+            self.clear()
+            self.catalog_revision = revision
+        return True
+
+    def invalidate_user(self, user_id: int) -> None:
+        """
+        Called after a new plan is generated for the user (older plans get archived).
+        Drops the user's lists and plans, plus active plans whose owner is unknown.
+        """
+        for key in list(self._by_owner.get(user_id, ())):
+            self._remove(key)
+        for key in list(self._unowned_plans):
+            if self._entries[key]["value"].get("status") == "active":
+                self._remove(key)
+
+    def invalidate_plan(self, plan_id: int) -> None:
+        """
+        Called after a plan is deleted. Drops the plan and every list containing it.
+        """
+        self._remove(("plan", plan_id))
+        for key in list(self._lists_by_plan.get(plan_id, ())):
+            self._remove(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._by_owner.clear()
+        self._lists_by_plan.clear()
+        self._unowned_plans.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+    # ---------- internals ----------
+
+    def _get(self, key: Tuple) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None or entry["expires_at"] <= time.monotonic():
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry["value"]
+
+    def _put(self, key: Tuple, value: Any, owner: Optional[int]) -> None:
+        size = len(json.dumps(value, default=str))
+        if size > self.max_bytes:
+            return
+
+        self._remove(key)
+        self._entries[key] = {
+            "value": value,
+            "owner": owner,
+            "size": size,
+            "expires_at": time.monotonic() + self.ttl,
+        }
+        self._bytes += size
+        self._index(key, value, owner, add=True)
+
+        # Evict least recently used entries until both limits hold
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions += 1
+
+    def _remove(self, key: Tuple) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry["size"]
+            self._index(key, entry["value"], entry["owner"], add=False)
+
+    def _index(self, key: Tuple, value: Any, owner: Optional[int], add: bool) -> None:
+        """
+        Adds the entry to (or removes it from) the owner and plan -> list indexes.
+        """
+        if owner is not None:
+            _update_index(self._by_owner, owner, key, add)
+        elif key[0] == "plan":
+            if add:
+                self._unowned_plans.add(key)
+            else:
+                self._unowned_plans.discard(key)
+        if key[0] == "list":
+            for plan in value["plans"]:
+                _update_index(self._lists_by_plan, plan["id"], key, add)
+
+
+def _update_index(index: Dict[Any, Set[Tuple]], name: Any, key: Tuple, add: bool) -> None:
+    if add:
+        index.setdefault(name, set()).add(key)
+        return
+    keys = index.get(name)
+    if keys is not None:
+        keys.discard(key)
+        if not keys:
+            del index[name]
+
+
+# Shared cache instance for the backend process
+plan_cache = PlanCache()
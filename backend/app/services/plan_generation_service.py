@@ -0,0 +1,150 @@
+# services/plan_generation_service.py
+# The plan generation pipeline shared by the synchronous /generate-plan route
+# and the background job workers.
+
+import asyncio
+import httpx
+from fastapi import HTTPException, status
+from app.services.db_service import get_generation_context, create_workout_plan_in_db, db_service_get
+from app.services.ai_service import get_generated_plan_by_ai
+from app.services.cache_service import get_allowed_exercise_names, note_catalog_revision
+from app.services.plan_cache_service import plan_cache
+from app.services.tracing import span
+from app.services.admission_service import ai_admission
+
+
+async def generate_plan_for_user(username: str) -> dict:
+    """
+    Generates, saves and returns a new workout plan for the given user.
+
+    Args:
+        username (str): The authenticated user's username.
+
+    Returns:
+        dict: {"message", "plan_id", "plan"} matching GeneratedPlanResponse.
+
+    Raises:
+        HTTPException: 404 if the user or profile is missing, 429 when the user's
+                       limits reject the generation (checked first), 503 when no
+                       AI slot is available, 502 on upstream failures.
+    """
+
+    # Per-user limits are checked before any lookups, so rejected requests cost nothing
+    async with ai_admission(username) as admission:
+        context, allowed_exercises = await _get_generation_inputs(username)
+
+        #fetch the generated plan from the ai agent, holding a global AI slot only for the call
+        async with admission.ai_slot():
+            generated_plan = await get_generated_plan_by_ai(context["profile"], context["last_plan"], allowed_exercises)
+
+    user_id = context["user_id"]
+
+    #Save the generated plan into the database microservice
+    payload = {**generated_plan, "user_id": user_id}  # Attach the correct user ID
+
+    saved = await create_workout_plan_in_db(payload)
+
+    if not saved or not saved.get("plan_id"):
+        raise HTTPException(
+             status_code=status.HTTP_502_BAD_GATEWAY,
+             detail="Failed to save the workout plan to the database."
+    )
+
+    created_plan_id = saved["plan_id"]
+
+    # Older plans were archived: drop the user's cached plans
+    plan_cache.invalidate_user(user_id)
+
+    #Return a success response to the frontend
+    if saved.get("plan"):
+        # Write-through: the new plan is served from cache on the next read
+        plan_cache.put_plan(created_plan_id, saved["plan"], owner=user_id)
+        return {"message": "Workout plan generated and saved successfully!",
+                "plan_id": created_plan_id,
+                "plan": saved["plan"]}
+
+    # Older database service without include_plan support: fetch the saved plan
+    try:
+        created_plan = await db_service_get(f"/workout-plans/{created_plan_id}", hedge=True)
+        
+    except httpx.HTTPStatusError as e:
+        raise HTTPException(
+        status_code=e.response.status_code,
+        detail=e.response.json().get("detail", str(e))
+    )
+    except Exception as e:
+        raise HTTPException(
+        status_code=502,
+        detail=f"Failed to fetch the saved workout plan: {str(e)}"
+    )
+
+
+    #Return a success response to the frontend
+    return {"message": "Workout plan generated and saved successfully!",
+            "plan_id":created_plan_id,
+            "plan": created_plan}
+
+
+
+async def _get_generation_inputs(username: str) -> tuple[dict, list]:
+    """
+    Returns the user's generation context (user ID, profile, latest plan) and the
+    exercise catalog for the AI service.
+
+    Raises:
+        HTTPException: 404 if the user or profile is missing, 502 on upstream failures.
+    """
+    # The catalog fetch needs nothing from the user, so it runs concurrently with the
+    # generation context lookup. If either fails the task group cancels the other
+    # and the first HTTP error is returned.
+    try:
+        async with asyncio.TaskGroup() as tg:
+            #Fetch the allowed exercises name and equipment list to the ai agent
+            catalog_task = tg.create_task(_get_catalog())
+
+            #Fetch user id, profile and latest workout plan in one request
+            context = await get_generation_context(username)
+            if not context or "user_id" not in context:
+                raise HTTPException(status_code=404, detail="User not found.")
+
+            if not context.get("profile"):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="User profile not found. Please complete your profile before generating a plan."
+                )
+
+    except ExceptionGroup as eg:
+        raise _first_http_exception(eg)
+
+    allowed_exercises = catalog_task.result()
+
+    # The catalog changed since it was cached (e.g. an exercise was renamed): refetch it
+    if note_catalog_revision(context.get("catalog_revision")):
+        allowed_exercises = await _get_catalog()
+    # Cached plans embed catalog data too
+    plan_cache.observe_catalog_revision(context.get("catalog_revision"))
+
+    # Note: last_plan might be None if it's a new user — that's OK
+    return context, allowed_exercises
+
+
+async def _get_catalog():
+    # Own span, so cache hits and misses of the catalog show up in Server-Timing
+    with span("catalog"):
+        return await get_allowed_exercise_names()
+
+
+def _first_http_exception(eg: BaseExceptionGroup) -> HTTPException:
+    """
+    Picks the HTTPException to return from a failed task group.
+    Unexpected errors are reported as 502 (upstream failure).
+    """
+    for exc in eg.exceptions:
+        if isinstance(exc, BaseExceptionGroup):
+            return _first_http_exception(exc)
+        if isinstance(exc, HTTPException):
+            return exc
+    return HTTPException(
+        status_code=status.HTTP_502_BAD_GATEWAY,
+        detail=f"Failed to prepare plan generation: {eg.exceptions[0]}"
+    )
@@ -0,0 +1,332 @@
+# services/resilience.py
+# Resilience layer used by every upstream helper (db_service, ai_service, user routes):
+# - a circuit breaker per upstream endpoint, so a failing dependency is cut off quickly
+# - jittered retries for idempotent requests
+# - optional hedged requests for tail-latency-sensitive reads
+# - a per-request deadline that caps every hop; each hop's timeout is forwarded in a header
+
+import asyncio
+import contextvars
+import random
+import re
+import time
+from typing import Dict, Optional
+import httpx
+from app.core.config import (
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_RESET_TIMEOUT,
+    RETRY_MAX_ATTEMPTS,
+    RETRY_BASE_DELAY,
+    HEDGE_DELAY,
+    DB_SERVICE_TIMEOUT,
+    AI_SERVICE_TIMEOUT,
+)
+from app.services.http_client import get_db_client, get_ai_client
+from app.services.tracing import TRACE_HEADER, current_trace_id, span, record_downstream_timing
+from app.services.metrics import (
+    BREAKER_STATE_VALUES,
+    CIRCUIT_BREAKER_STATE,
+    CIRCUIT_BREAKER_FAILURES,
+    CIRCUIT_BREAKER_REJECTIONS,
+    CIRCUIT_BREAKER_OPENED,
+    observe_upstream_call,
+)
+
+# Header carrying the remaining latency budget (milliseconds) to the next hop
+DEADLINE_HEADER = "X-Request-Deadline-Ms"
+
+# Methods that are safe to retry or hedge
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# Upstream status codes treated as failures (retried and counted by the breaker)
+RETRYABLE_STATUS_CODES = (502, 503, 504)
+
+_CLIENTS = {"db": get_db_client, "ai": get_ai_client}
+_HOP_TIMEOUTS = {"db": DB_SERVICE_TIMEOUT, "ai": AI_SERVICE_TIMEOUT}
+
+# Absolute deadline (time.monotonic()) of the request being handled, if any
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("request_deadline", default=None)
+
+
+class CircuitOpenError(httpx.TransportError):
+    """
+    Raised instead of calling an upstream endpoint whose breaker is open.
+    Subclasses httpx.TransportError so existing httpx error handling applies.
+    """
+
+
+class DeadlineExceededError(httpx.TimeoutException):
+    """
+    Raised when the request's latency budget is used up before an upstream call.
+    """
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    closed    -> calls pass; BREAKER_FAILURE_THRESHOLD failures in a row open it
+    open      -> calls fail fast for BREAKER_RESET_TIMEOUT seconds
+    half_open -> a single probe call is let through; success closes, failure re-opens
+
+    The state and counters are also exported as Prometheus metrics labelled with
+    the upstream and endpoint (e.g. "db", "GET /users/{id}/profile").
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        reset_timeout: float = BREAKER_RESET_TIMEOUT,
+        upstream: str = "",
+        endpoint: str = "",
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.total_failures = 0
+        self.total_rejections = 0
+
+        self._state_gauge = CIRCUIT_BREAKER_STATE.labels(upstream, endpoint)
+        self._failures = CIRCUIT_BREAKER_FAILURES.labels(upstream, endpoint)
+        self._rejections = CIRCUIT_BREAKER_REJECTIONS.labels(upstream, endpoint)
+        self._opened = CIRCUIT_BREAKER_OPENED.labels(upstream, endpoint)
+        self._set_state("closed")
+
+    def _set_state(self, state: str) -> None:
+        if state == "open":
+            self._opened.inc()
+        self.state = state
+        self._state_gauge.set(BREAKER_STATE_VALUES[state])
+
+    def allow(self) -> bool:
+        if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self._set_state("half_open")
+            self.probe_in_flight = False
+
+        if self.state == "closed":
+            return True
+        if self.state == "half_open" and not self.probe_in_flight:
+            self.probe_in_flight = True
+            return True
+
+        self.total_rejections += 1
+        self._rejections.inc()
+        return False
+
+    def record_success(self) -> None:
+        if self.state != "closed":
+            self._set_state("closed")
+        self.consecutive_failures = 0
+        self.probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self.total_failures += 1
+        self._failures.inc()
+        self.consecutive_failures += 1
+        self.probe_in_flight = False
+        if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+            if self.state != "open":
+                self._set_state("open")
+            self.opened_at = time.monotonic()
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "failures_total": self.total_failures,
+            "rejections_total": self.total_rejections,
+        }
+
+
+# "<upstream> <METHOD> <path template>" -> breaker
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def _endpoint_name(upstream: str, method: str, path: str) -> str:
+    # Collapse IDs and usernames so every user shares one breaker per route
+    template = path.split("?", 1)[0]
+    template = re.sub(r"/\d+(?=/|$)", "/{id}", template)
+    template = re.sub(r"^/users/(?!\{id\})[^/]+", "/users/{username}", template)
+    return f"{upstream} {method} {template}"
+
+
+def _get_breaker(name: str) -> CircuitBreaker:
+    breaker = _breakers.get(name)
+    if breaker is None:
+        upstream, endpoint = name.split(" ", 1)
+        breaker = _breakers[name] = CircuitBreaker(upstream=upstream, endpoint=endpoint)
+    return breaker
+
+
+def set_request_deadline(seconds: float) -> None:
+    """
+    Sets the latency budget of the current request (called by the deadline middleware).
+    """
+    _deadline.set(time.monotonic() + seconds)
+
+
+def remaining_budget() -> Optional[float]:
+    """
+    Returns the seconds left in the current request's budget, or None if there is no deadline.
+    """
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+async def upstream_request(
+    upstream: str,
+    method: str,
+    path: str,
+    *,
+    hedge: bool = False,
+    stream: bool = False,
+    **kwargs
+) -> httpx.Response:
+    """
+    Sends a request to an upstream service ("db" or "ai") through its shared client,
+    guarded by the endpoint's circuit breaker.
+
+    - Idempotent methods are retried with jittered exponential backoff on network
+      errors and 502/503/504 responses.
+    - With hedge=True (idempotent methods only), a duplicate request is sent if the
+      first has not answered within HEDGE_DELAY; the first response wins.
+    - Each attempt's timeout is capped by the remaining request deadline and is
+      forwarded in the X-Request-Deadline-Ms header.
+    - Each attempt is recorded as a span of the request's trace, and the trace ID
+      is forwarded in the X-Trace-Id header.
+    - With stream=True the body is not read: the caller iterates the response and
+      must close it. Streamed requests are sent once (no retries or hedging).
+
+    Returns:
+        httpx.Response: The upstream response (4xx responses are returned, not raised).
+
+    Raises:
+        CircuitOpenError: If the endpoint's breaker is open before the first attempt.
+                          If it opens between retries, the last attempt's outcome
+                          is returned or raised instead.
+        DeadlineExceededError: If the request's budget is used up.
+        httpx.HTTPError: On network failures after all retries.
+    """
+    method = method.upper()
+    breaker = _get_breaker(_endpoint_name(upstream, method, path))
+    idempotent = method in IDEMPOTENT_METHODS
+    attempts = RETRY_MAX_ATTEMPTS if idempotent and not stream else 1
+
+    # Outcome of the previous failed attempt (a network error or a 5xx response)
+    last_error: Optional[httpx.TransportError] = None
+    last_response: Optional[httpx.Response] = None
+
+    for attempt in range(1, attempts + 1):
+        if not breaker.allow():
+            # Opened by our own earlier failures (or concurrent ones): report what
+            # actually went wrong rather than the breaker
+            if last_response is not None:
+                return last_response
+            if last_error is not None:
+                raise last_error
+            raise CircuitOpenError(f"Circuit open for {upstream} {method} {path}")
+
+        try:
+            if hedge and idempotent and not stream:
+                response = await _hedged_send(upstream, method, path, **kwargs)
+            else:
+                response = await _send(upstream, method, path, stream=stream, **kwargs)
+        except DeadlineExceededError:
+            # Our own budget ran out, not the upstream's fault
+            breaker.probe_in_flight = False
+            raise
+        except httpx.TransportError as e:
+            breaker.record_failure()
+            if attempt == attempts:
+                raise
+            last_error, last_response = e, None
+        except BaseException:
+            # Cancelled or unexpected error: free the half-open probe slot
+            breaker.probe_in_flight = False
+            raise
+        else:
+            if response.status_code not in RETRYABLE_STATUS_CODES:
+                breaker.record_success()
+                return response
+            breaker.record_failure()
+            if attempt == attempts:
+                return response
+            last_error, last_response = None, response
+
+        # Full jitter backoff, never sleeping past the deadline
+        delay = random.uniform(0, RETRY_BASE_DELAY * (2 ** (attempt - 1)))
+        budget = remaining_budget()
+        if budget is not None and budget <= delay:
+            raise DeadlineExceededError("Request deadline exceeded before retry") from last_error
+        await asyncio.sleep(delay)
+
+
+async def _send(upstream: str, method: str, path: str, stream: bool = False, **kwargs) -> httpx.Response:
+    # One attempt, with the timeout capped by the remaining request budget
+    timeout = _HOP_TIMEOUTS[upstream]
+    headers = dict(kwargs.pop("headers", None) or {})
+
+    budget = remaining_budget()
+    if budget is not None:
+        if budget <= 0:
+            raise DeadlineExceededError("Request deadline exceeded")
+        timeout = min(timeout, budget)
+
+    # The upstream gets the time this attempt will actually wait, not the whole
+    # request budget, so it stops working when we stop waiting
+    headers[DEADLINE_HEADER] = str(int(timeout * 1000))
+
+    trace_id = current_trace_id()
+    if trace_id:
+        headers[TRACE_HEADER] = trace_id
+
+    client = _CLIENTS[upstream]()
+    endpoint = _endpoint_name(upstream, method, path).split(" ", 1)[1]
+    outcome = "error"
+    start = time.perf_counter()
+    with span(upstream, method=method, path=path.split("?", 1)[0]) as attributes:
+        try:
+            if stream:
+                request = client.build_request(method, path, headers=headers, timeout=timeout, **kwargs)
+                response = await client.send(request, stream=True)
+            else:
+                response = await client.request(method, path, headers=headers, timeout=timeout, **kwargs)
+            outcome = attributes["status_code"] = response.status_code
+        finally:
+            observe_upstream_call(upstream, endpoint, str(outcome), time.perf_counter() - start)
+
+    # Break the hop down further with the upstream's own timings
+    record_downstream_timing(upstream, response.headers.get("Server-Timing"), time.perf_counter())
+    return response
+
+
+async def _hedged_send(upstream: str, method: str, path: str, **kwargs) -> httpx.Response:
+    # Send once; if no answer within HEDGE_DELAY send a duplicate and take the first to finish
+    primary = asyncio.create_task(_send(upstream, method, path, **kwargs))
+    done, _ = await asyncio.wait({primary}, timeout=HEDGE_DELAY)
+    if done:
+        return primary.result()
+
+    hedged = asyncio.create_task(_send(upstream, method, path, **kwargs))
+    pending = {primary, hedged}
+    error: Optional[BaseException] = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+def get_breaker_stats() -> Dict[str, dict]:
+    """
+    Returns the state and counters of every upstream endpoint's circuit breaker.
+    """
+    return {name: breaker.stats() for name, breaker in sorted(_breakers.items())}
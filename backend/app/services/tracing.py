@@ -0,0 +1,52 @@
+# services/tracing.py
+# Lightweight request tracing for the backend:
+# - every request gets a trace ID (taken from the X-Trace-Id header or generated)
+#   which is forwarded to the DB and AI microservices
+# - spans are recorded for upstream calls and notable steps of a request
+# - the per-hop breakdown is returned in a Server-Timing header and the finished
+#   trace is handed to the configured exporter (stdout, a JSON-lines file, or none)
+# The trace itself is the shared observability module; this adds the backend's parts.
+
+import re
+from typing import Optional
+from app.core.config import TRACE_EXPORTER, TRACE_FILE
+from app.services.observability import (
+    TRACE_HEADER,
+    Trace,
+    current_trace,
+    current_trace_id,
+    server_timing_header,
+    span,
+    start_trace,
+    write_trace,
+)
+
+SERVICE_NAME = "backend"
+
+# One Server-Timing entry of a downstream response: name;dur=12.3[;desc="..."]
+_SERVER_TIMING_ENTRY = re.compile(r"^\s*([^;,\s]+)\s*;.*?dur=([0-9.]+)")
+
+
+def record_downstream_timing(prefix: str, header: Optional[str], end: float) -> None:
+    """
+    Copies a downstream service's Server-Timing entries into the current trace as
+    '<prefix>.<name>' spans ending at `end`, so the backend's Server-Timing header
+    also shows where time went inside the DB and AI services.
+    """
+    trace = current_trace()
+    if trace is None or not header:
+        return
+    for entry in header.split(","):
+        match = _SERVER_TIMING_ENTRY.match(entry)
+        if not match or match.group(1) == "total":
+            continue
+        duration = float(match.group(2)) / 1000
+        trace.add_span(f"{prefix}.{match.group(1)}", end - duration, end, downstream=True)
+
+
+def export_trace(trace: Trace, method: str, path: str, status_code: int) -> None:
+    """
+    Writes the finished trace as one JSON line to the configured exporter
+    (TRACE_EXPORTER: 'stdout', 'file' -> TRACE_FILE, or 'none').
+    """
+    write_trace(trace, SERVICE_NAME, method, path, status_code, TRACE_EXPORTER, TRACE_FILE)
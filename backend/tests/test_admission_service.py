@@ -0,0 +1,118 @@
+# tests/test_admission_service.py
+# Run from the backend/ directory: python -m pytest
+
+import asyncio
+import pytest
+from fastapi import HTTPException
+from app.services import admission_service, plan_generation_service
+
+
+@pytest.fixture(autouse=True)
+def fresh_buckets(monkeypatch):
+    monkeypatch.setattr(admission_service, "_buckets", type(admission_service._buckets)())
+
+
+def _tokens(username: str) -> float:
+    return admission_service._buckets[username][0]
+
+
+def test_token_spent_when_call_completes():
+    async def generate():
+        async with admission_service.ai_admission("alice") as admission:
+            async with admission.ai_slot():
+                pass
+
+    asyncio.run(generate())
+    assert _tokens("alice") == pytest.approx(admission_service.PLAN_RATE_LIMIT_BURST - 1, abs=0.01)
+
+
+def test_token_refunded_when_call_fails():
+    async def generate():
+        async with admission_service.ai_admission("bob") as admission:
+            async with admission.ai_slot():
+                raise HTTPException(status_code=502)
+
+    with pytest.raises(HTTPException):
+        asyncio.run(generate())
+    assert _tokens("bob") == pytest.approx(admission_service.PLAN_RATE_LIMIT_BURST, abs=0.01)
+
+
+def test_token_refunded_when_call_is_cancelled():
+    async def generate():
+        async with admission_service.ai_admission("carol") as admission:
+            async with admission.ai_slot():
+                await asyncio.sleep(60)
+
+    async def cancel_generation():
+        task = asyncio.create_task(generate())
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_generation())
+    assert _tokens("carol") == pytest.approx(admission_service.PLAN_RATE_LIMIT_BURST, abs=0.01)
+    assert "carol" not in admission_service._user_active
+
+
+def test_user_limits_are_checked_before_the_lookups(monkeypatch):
+    lookups = []
+
+    async def get_generation_context(username):
+        lookups.append(username)
+        return {"user_id": 1, "profile": {"goal": "strength"}, "last_plan": None}
+
+    monkeypatch.setattr(plan_generation_service, "get_generation_context", get_generation_context)
+    admission_service._buckets["dave"] = (0.0, admission_service.time.monotonic())
+
+    with pytest.raises(HTTPException) as rejected:
+        asyncio.run(plan_generation_service.generate_plan_for_user("dave"))
+
+    assert rejected.value.status_code == 429
+    assert lookups == []
+
+
+def test_global_slot_is_only_held_by_the_ai_call(monkeypatch):
+    slots_in_use = {}
+
+    async def get_generation_context(username):
+        slots_in_use["lookup"] = admission_service._in_flight
+        return {"user_id": 1, "profile": {"goal": "strength"}, "last_plan": None}
+
+    async def get_allowed_exercise_names():
+        return []
+
+    async def get_generated_plan_by_ai(profile, last_plan, allowed_exercises):
+        slots_in_use["ai"] = admission_service._in_flight
+        return {}
+
+    async def create_workout_plan_in_db(payload):
+        slots_in_use["save"] = admission_service._in_flight
+        return {"plan_id": 1, "plan": {"id": 1}}
+
+    monkeypatch.setattr(plan_generation_service, "get_generation_context", get_generation_context)
+    monkeypatch.setattr(plan_generation_service, "get_allowed_exercise_names", get_allowed_exercise_names)
+    monkeypatch.setattr(plan_generation_service, "get_generated_plan_by_ai", get_generated_plan_by_ai)
+    monkeypatch.setattr(plan_generation_service, "create_workout_plan_in_db", create_workout_plan_in_db)
+
+    asyncio.run(plan_generation_service.generate_plan_for_user("erin"))
+
+    assert slots_in_use == {"lookup": 0, "ai": 1, "save": 0}
+    assert _tokens("erin") == pytest.approx(admission_service.PLAN_RATE_LIMIT_BURST - 1, abs=0.01)
+
+
+def test_token_refunded_when_a_lookup_fails(monkeypatch):
+    async def get_generation_context(username):
+        return {"user_id": 1, "profile": None, "last_plan": None}
+
+    async def get_allowed_exercise_names():
+        return []
+
+    monkeypatch.setattr(plan_generation_service, "get_generation_context", get_generation_context)
+    monkeypatch.setattr(plan_generation_service, "get_allowed_exercise_names", get_allowed_exercise_names)
+
+    with pytest.raises(HTTPException) as rejected:
+        asyncio.run(plan_generation_service.generate_plan_for_user("frank"))
+
+    assert rejected.value.status_code == 404
+    assert _tokens("frank") == pytest.approx(admission_service.PLAN_RATE_LIMIT_BURST, abs=0.01)
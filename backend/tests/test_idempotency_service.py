@@ -0,0 +1,53 @@
+# tests/test_idempotency_service.py
+# Run from the backend/ directory: python -m pytest
+
+import asyncio
+import gc
+import pytest
+from fastapi import HTTPException
+from app.services import idempotency_service
+
+
+@pytest.fixture(autouse=True)
+def fresh_entries(monkeypatch):
+    monkeypatch.setattr(idempotency_service, "_entries", type(idempotency_service._entries)())
+
+
+def test_failure_is_logged_when_the_only_waiter_cancels(capsys):
+    unhandled = []
+
+    async def scenario():
+        asyncio.get_running_loop().set_exception_handler(lambda loop, context: unhandled.append(context))
+        fail = asyncio.Event()
+
+        async def generate():
+            await fail.wait()
+            raise HTTPException(status_code=502, detail="AI service unavailable")
+
+        waiter = asyncio.create_task(idempotency_service.run_idempotent("alice", "key-1", generate))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        # The execution outlives the client and fails with nobody awaiting it
+        fail.set()
+        await asyncio.sleep(0.01)
+
+    asyncio.run(scenario())
+    gc.collect()
+
+    assert unhandled == []
+    assert "[IDEMPOTENCY] Request with no waiter left failed" in capsys.readouterr().out
+    # Failed executions are not remembered
+    assert idempotency_service._entries == {}
+
+
+def test_failure_seen_by_a_waiter_is_not_logged(capsys):
+    async def generate():
+        raise HTTPException(status_code=502)
+
+    with pytest.raises(HTTPException):
+        asyncio.run(idempotency_service.run_idempotent("bob", "key-1", generate))
+
+    assert "[IDEMPOTENCY]" not in capsys.readouterr().out
@@ -0,0 +1,107 @@
+# tests/test_plan_cache_service.py
+# Run from the backend/ directory: python -m pytest
+
+import asyncio
+import httpx
+import pytest
+from app.routers import plan_routes
+from app.services import resilience
+from app.services.db_service import CATALOG_REVISION_HEADER, PLAN_OWNER_HEADER
+from app.services.plan_cache_service import PlanCache
+
+
+def _plan(plan_id: int, status: str = "active") -> dict:
+    return {"id": plan_id, "status": status, "days": []}
+
+
+def test_plan_read_by_id_is_invalidated_with_its_owner(monkeypatch):
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/workout-plans/7"
+        return httpx.Response(200, json=_plan(7, "archived"),
+                              headers={PLAN_OWNER_HEADER: "3", CATALOG_REVISION_HEADER: "1"})
+
+    def client():
+        return httpx.AsyncClient(base_url="http://upstream", transport=httpx.MockTransport(handler))
+
+    cache = PlanCache()
+    monkeypatch.setitem(resilience._CLIENTS, "db", client)
+    monkeypatch.setattr(plan_routes, "plan_cache", cache)
+
+    asyncio.run(plan_routes.get_plan_by_id(7))
+    assert cache.get_plan(7, owner=3) is not None
+
+    # Even an archived plan goes once its owner generates a new plan
+    cache.invalidate_user(3)
+    assert cache.get_plan(7) is None
+
+
+def test_invalidate_user_only_touches_the_users_entries():
+    cache = PlanCache()
+    cache.put_list(1, ("q",), [_plan(10), _plan(11, "archived")])
+    cache.put_list(2, ("q",), [_plan(20)])
+    cache.put_plan(30, _plan(30), owner=None)
+    cache.put_plan(31, _plan(31, "archived"), owner=None)
+
+    cache.invalidate_user(1)
+
+    assert cache.get_list(1, ("q",)) is None
+    assert cache.get_plan(10) is None and cache.get_plan(11) is None
+    # Active plans of unknown owner may be the user's previous plan
+    assert cache.get_plan(30) is None
+    assert cache.get_list(2, ("q",)) is not None
+    assert cache.get_plan(20, owner=2) is not None
+    assert cache.get_plan(31) is not None
+    assert 1 not in cache._by_owner
+
+
+def test_invalidate_plan_drops_only_the_lists_containing_it():
+    cache = PlanCache()
+    cache.put_list(1, ("page", 1), [_plan(10), _plan(11)])
+    cache.put_list(1, ("page", 2), [_plan(12)])
+
+    cache.invalidate_plan(11)
+
+    assert cache.get_plan(11) is None
+    assert cache.get_list(1, ("page", 1)) is None
+    assert cache.get_list(1, ("page", 2)) is not None
+    assert 11 not in cache._lists_by_plan and 10 not in cache._lists_by_plan
+
+
+def test_indexes_follow_evictions():
+    cache = PlanCache(max_entries=2)
+    cache.put_list(1, ("q",), [{"id": 10, "status": "active"}])
+    cache.put_plan(20, _plan(20), owner=2)
+    cache.put_plan(30, _plan(30), owner=None)
+
+    assert cache.stats()["evictions"] == 1
+    assert 1 not in cache._by_owner and 10 not in cache._lists_by_plan
+    assert cache._by_owner == {2: {("plan", 20)}}
+    assert cache._unowned_plans == {("plan", 30)}
+
+
+def test_newer_catalog_revision_drops_everything():
+    cache = PlanCache()
+    cache.put_list(1, ("q",), [_plan(10)], catalog_revision=4)
+    cache.put_plan(20, _plan(20), owner=2, catalog_revision=4)
+
+    # Same revision (or none reported) keeps the entries
+    assert cache.observe_catalog_revision(4) and cache.observe_catalog_revision(None)
+    assert cache.stats()["entries"] == 3
+
+    cache.put_plan(30, _plan(30), owner=3, catalog_revision=5)
+
+    assert cache.catalog_revision == 5
+    assert cache.get_list(1, ("q",)) is None and cache.get_plan(20) is None
+    assert cache.get_plan(30) is not None
+    assert cache._by_owner == {3: {("plan", 30)}} and cache._lists_by_plan == {}
+
+
+def test_data_from_an_older_catalog_revision_is_not_cached():
+    cache = PlanCache()
+    cache.observe_catalog_revision(5)
+
+    cache.put_plan(20, _plan(20), owner=2, catalog_revision=4)
+    cache.put_list(2, ("q",), [_plan(20)], catalog_revision=4)
+
+    assert cache.catalog_revision == 5
+    assert cache.stats()["entries"] == 0
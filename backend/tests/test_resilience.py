@@ -0,0 +1,114 @@
+# tests/test_resilience.py
+# Run from the backend/ directory: python -m pytest
+
+import asyncio
+import httpx
+import pytest
+from app.core.config import AI_SERVICE_TIMEOUT, DB_SERVICE_TIMEOUT
+from app.services import resilience
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    """
+    Routes upstream calls to an in-process transport and returns the list of
+    (forwarded deadline in ms, read timeout in seconds) of every request sent.
+    """
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        deadline_ms = int(request.headers[resilience.DEADLINE_HEADER])
+        requests.append((deadline_ms, request.extensions["timeout"]["read"]))
+        return httpx.Response(200, json={})
+
+    def client():
+        return httpx.AsyncClient(base_url="http://upstream", transport=httpx.MockTransport(handler))
+
+    monkeypatch.setitem(resilience._CLIENTS, "db", client)
+    monkeypatch.setitem(resilience._CLIENTS, "ai", client)
+    return requests
+
+
+async def _call(upstream: str, budget):
+    if budget is not None:
+        resilience.set_request_deadline(budget)
+    await resilience.upstream_request(upstream, "POST", "/ai/generate" if upstream == "ai" else "/users")
+
+
+@pytest.mark.parametrize("upstream, hop_timeout", [("ai", AI_SERVICE_TIMEOUT), ("db", DB_SERVICE_TIMEOUT)])
+@pytest.mark.parametrize("budget", [None, 1.0, 45.0, 3600.0])
+def test_forwarded_deadline_never_exceeds_client_timeout(sent, upstream, hop_timeout, budget):
+    asyncio.run(_call(upstream, budget))
+
+    (deadline_ms, read_timeout), = sent
+    assert deadline_ms <= read_timeout * 1000
+    assert read_timeout <= hop_timeout
+    if budget is not None:
+        assert read_timeout <= budget
+
+
+def _metric(text: str, name: str, **labels) -> float:
+    from prometheus_client.parser import text_string_to_metric_families
+
+    for family in text_string_to_metric_families(text):
+        for sample in family.samples:
+            if sample.name == name and sample.labels == labels:
+                return sample.value
+    raise AssertionError(f"{name}{labels} not found in /metrics")
+
+
+def test_breaker_state_and_counters_are_exported_in_metrics(monkeypatch):
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    def failing_client():
+        return httpx.AsyncClient(base_url="http://upstream", transport=httpx.MockTransport(lambda request: httpx.Response(503)))
+
+    monkeypatch.setitem(resilience._CLIENTS, "db", failing_client)
+    monkeypatch.setattr(resilience, "RETRY_BASE_DELAY", 0)
+    monkeypatch.setattr(resilience, "_breakers", {})
+
+    async def trip_breaker():
+        breaker = resilience._get_breaker("db POST /breaker-test/{id}")
+        for _ in range(breaker.failure_threshold):
+            await resilience.upstream_request("db", "POST", "/breaker-test/1")
+        with pytest.raises(resilience.CircuitOpenError):
+            await resilience.upstream_request("db", "POST", "/breaker-test/2")
+
+    asyncio.run(trip_breaker())
+
+    text = TestClient(app).get("/metrics").text
+    labels = {"upstream": "db", "endpoint": "POST /breaker-test/{id}"}
+    assert _metric(text, "circuit_breaker_state", **labels) == 2
+    assert _metric(text, "circuit_breaker_opened_total", **labels) == 1
+    assert _metric(text, "circuit_breaker_failures_total", **labels) == resilience.BREAKER_FAILURE_THRESHOLD
+    assert _metric(text, "circuit_breaker_rejections_total", **labels) == 1
+
+
+@pytest.mark.parametrize("failure", ["timeout", "503"])
+def test_retry_on_a_reopened_breaker_reports_the_real_failure(monkeypatch, failure):
+    def handler(request: httpx.Request) -> httpx.Response:
+        if failure == "timeout":
+            raise httpx.ReadTimeout("upstream timed out", request=request)
+        return httpx.Response(503)
+
+    def client():
+        return httpx.AsyncClient(base_url="http://upstream", transport=httpx.MockTransport(handler))
+
+    monkeypatch.setitem(resilience._CLIENTS, "db", client)
+    monkeypatch.setattr(resilience, "RETRY_BASE_DELAY", 0)
+    monkeypatch.setattr(resilience, "_breakers", {})
+
+    # One failure away from opening: the first attempt opens it, the retry is rejected
+    breaker = resilience._get_breaker("db GET /users/{id}/profile")
+    breaker.consecutive_failures = breaker.failure_threshold - 1
+
+    async def call():
+        return await resilience.upstream_request("db", "GET", "/users/5/profile")
+
+    if failure == "timeout":
+        with pytest.raises(httpx.ReadTimeout):
+            asyncio.run(call())
+    else:
+        assert asyncio.run(call()).status_code == 503
+    assert breaker.state == "open"
@@ -0,0 +1,75 @@
+# benchmarks/bench_login_hashing.py
+# Measures login (bcrypt verify) throughput per core and event-loop stalls,
+# comparing hashing inline on the event loop vs the bounded bcrypt pool.
+#
+# Usage (from the repo root):
+#   python benchmarks/bench_login_hashing.py --logins 64 --rounds 12
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+# Import the backend's "app" package
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+
+async def _measure_loop_lag(stop: asyncio.Event, interval: float = 0.005) -> float:
+    # Worst delay between when a tick was due and when the loop actually ran it
+    worst = 0.0
+    while not stop.is_set():
+        due = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - due)
+    return worst
+
+
+async def _run(logins: int, verify) -> tuple:
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(_measure_loop_lag(stop))
+
+    start = time.perf_counter()
+    await asyncio.gather(*[verify() for _ in range(logins)])
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    return elapsed, await lag_task
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Login hashing throughput benchmark")
+    parser.add_argument("--logins", type=int, default=64, help="concurrent logins to simulate")
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt cost factor")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="bcrypt pool size")
+    args = parser.parse_args()
+
+    # Settings are read at import time
+    os.environ["BCRYPT_ROUNDS"] = str(args.rounds)
+    os.environ["PASSWORD_HASH_WORKERS"] = str(args.workers)
+    os.environ["PASSWORD_HASH_MAX_QUEUE"] = str(args.logins)
+    from app.services import password_service
+
+    stored_hash = password_service.pwd_context.hash("correct horse")
+
+    async def inline_verify():
+        # Old behaviour: synchronous bcrypt inside the async handler
+        return password_service.pwd_context.verify("correct horse", stored_hash)
+
+    async def pooled_verify():
+        return await password_service.verify_password("correct horse", stored_hash)
+
+    cores = os.cpu_count() or 1
+    print(f"bcrypt rounds={args.rounds} logins={args.logins} workers={args.workers} cores={cores}")
+    for name, verify in (("inline", inline_verify), ("pool", pooled_verify)):
+        elapsed, worst_lag = asyncio.run(_run(args.logins, verify))
+        throughput = args.logins / elapsed
+        print(
+            f"{name:>6}: {throughput:7.1f} logins/s  "
+            f"{throughput / cores:6.1f} logins/s/core  "
+            f"max event-loop stall {worst_lag * 1000:8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
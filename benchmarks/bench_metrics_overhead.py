@@ -0,0 +1,77 @@
+# benchmarks/bench_metrics_overhead.py
+# Per-request overhead of the Prometheus instrumentation: the same minimal FastAPI
+# route is called through the ASGI interface with and without MetricsMiddleware,
+# and the cost of recording one upstream call is timed on its own.
+#
+# Usage (from the repo root):
+#   python benchmarks/bench_metrics_overhead.py --requests 20000
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+# Import the backend's "app" package
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from fastapi import FastAPI
+from app.services.metrics import MetricsMiddleware, observe_upstream_call
+
+
+def _build_app(instrumented: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/plan/{plan_id}")
+    async def get_plan(plan_id: int):
+        return {"id": plan_id}
+
+    if instrumented:
+        app.add_middleware(MetricsMiddleware)
+    return app
+
+
+async def _time_per_request(app, requests: int) -> float:
+    # Drives the app directly through ASGI so no HTTP client cost is measured
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": "/plan/7", "raw_path": b"/plan/7",
+        "query_string": b"", "root_path": "", "headers": [], "server": ("bench", 80), "client": ("bench", 1),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    for _ in range(500):  # warm-up (builds the middleware stack, creates label children)
+        await app(dict(scope), receive, send)
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - start) / requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prometheus instrumentation overhead benchmark")
+    parser.add_argument("--requests", type=int, default=20000, help="requests to send per mode")
+    args = parser.parse_args()
+
+    plain = asyncio.run(_time_per_request(_build_app(False), args.requests))
+    instrumented = asyncio.run(_time_per_request(_build_app(True), args.requests))
+
+    start = time.perf_counter()
+    for _ in range(args.requests):
+        observe_upstream_call("db", "GET /workout-plans/{id}", "200", 0.003)
+    upstream = (time.perf_counter() - start) / args.requests
+
+    print(f"request without metrics: {plain * 1e6:8.2f} us")
+    print(f"request with metrics:    {instrumented * 1e6:8.2f} us")
+    print(f"middleware overhead:     {(instrumented - plain) * 1e6:8.2f} us/request ({(instrumented / plain - 1) * 100:.1f}%)")
+    print(f"upstream call record:    {upstream * 1e6:8.2f} us/call")
+
+
+if __name__ == "__main__":
+    main()
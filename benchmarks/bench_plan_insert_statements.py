@@ -0,0 +1,102 @@
+# benchmarks/bench_plan_insert_statements.py
+# Regression benchmark for plan inserts: counts the SQL statements (cursor
+# executions) and wall time of one create_workout_plan call for plans of
+# increasing size, on a fresh SQLite database (or --database-url).
+# A batched executemany counts once per round trip, as the database sees it.
+# Catalog lookups are served from the in-memory index; an occasional revision
+# check adds one statement.
+# Exits with status 1 if any plan needs more than --max-statements, so it can
+# guard against a return to per-exercise catalog lookups.
+#
+# Usage (from the repo root, with the database requirements installed):
+#   python benchmarks/bench_plan_insert_statements.py
+#   python benchmarks/bench_plan_insert_statements.py --repeat 50 --max-statements 5
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+DATABASE_DIR = os.path.join(os.path.dirname(__file__), "..", "database")
+
+# (days, exercises per day) of the measured plans
+PLAN_SHAPES = [(3, 4), (7, 4), (7, 8)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Statements per workout plan insert")
+    parser.add_argument("--repeat", type=int, default=20, help="inserts per plan shape")
+    parser.add_argument("--max-statements", type=int, default=5, help="fail above this many statements per insert")
+    parser.add_argument("--database-url", default=None, help="sync SQLAlchemy URL (default: fresh SQLite file)")
+    args = parser.parse_args()
+
+    # The database service reads its configuration at import time
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    os.environ["DB_ASYNC"] = "false"
+    os.environ["TRACE_EXPORTER"] = "none"
+    sys.path.insert(0, DATABASE_DIR)
+
+    from sqlalchemy import event
+    from app.db_connection import SessionLocal, engine
+    from app.models import ExerciseCatalog, User
+    from app.routers.plan_routes import _create_workout_plan
+    from app.schemas.plan_schemas import WorkoutPlanCreate
+    from app.scripts.setup_db import setup_database
+    from app.services.catalog import load_catalog_index
+
+    setup_database()
+    db = SessionLocal()
+    # As at service startup: the catalog index is resident before the first insert
+    load_catalog_index(db)
+    catalog = [(e.name, e.equipment) for e in db.query(ExerciseCatalog).order_by(ExerciseCatalog.id)]
+    user = User(username=f"bench_insert_{int(time.time())}", hashed_password="not-a-real-hash")
+    db.add(user)
+    db.commit()
+    user_id = user.id
+    db.close()
+
+    statements = 0
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count_statement(*_):
+        nonlocal statements
+        statements += 1
+
+    print(f"{'days x exercises':<18}{'statements':>12}{'mean ms':>10}")
+    failed = False
+    for days, per_day in PLAN_SHAPES:
+        plan = WorkoutPlanCreate(
+            user_id=user_id, duration_weeks=4, goal="Build muscle", experience_level="Intermediate",
+            days=[
+                {"day_number": d + 1, "day_name": f"Day {d + 1}", "focus": None, "exercises": [
+                    # Vary the case to exercise case-insensitive matching
+                    {"exercise_name": name.upper() if i % 2 else name, "equipment": equipment.lower(),
+                     "sets": 3, "reps": 10, "notes": None}
+                    for i, (name, equipment) in enumerate(catalog[(d + j) % len(catalog)] for j in range(per_day))
+                ]}
+                for d in range(days)
+            ],
+        )
+
+        counts, elapsed = [], 0.0
+        for _ in range(args.repeat):
+            db = SessionLocal()
+            statements = 0
+            start = time.perf_counter()
+            _create_workout_plan(db, plan, include_plan=False)
+            elapsed += time.perf_counter() - start
+            counts.append(statements)
+            db.close()
+
+        worst = max(counts)
+        failed |= worst > args.max_statements
+        print(f"{f'{days} x {per_day}':<18}{worst:>12}{elapsed / args.repeat * 1000:>10.2f}")
+
+    if failed:
+        print(f"\nFAIL: more than {args.max_statements} statements per plan insert")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+# benchmarks/bench_plan_loading.py
+# Compares the ways a full plan listing can be built:
+#   - joined: from the normalized tables with the joinedload chain (one cartesian query)
+#   - selectin: from the normalized tables with selectinload (one query per level)
+#   - documents: from the materialized plan documents (what GET /workout-plans serves)
+# The first two are the PLAN_LOADER_STRATEGY settings, still used to build documents.
+# For users holding 10/100/500 seven-day plans it reports, per full listing:
+#   - statements, rows and values (rows x columns) fetched from the database
+#   - wall time (mean of --repeat calls)
+#   - peak Python memory (tracemalloc) during one call
+# Runs on a fresh SQLite file by default, or on --database-url (a scratch database).
+#
+# Usage (from the repo root, with the database requirements installed):
+#   python benchmarks/bench_plan_loading.py
+#   python benchmarks/bench_plan_loading.py --sizes 10 100 500 --repeat 5
+
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+
+DATABASE_DIR = os.path.join(os.path.dirname(__file__), "..", "database")
+
+# Shape of every seeded plan
+DAYS_PER_PLAN = 7
+EXERCISES_PER_DAY = 4
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Plan listing: joined vs selectin eager loading vs documents")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 500], help="plans per user")
+    parser.add_argument("--repeat", type=int, default=5, help="timed listings per size and source")
+    parser.add_argument("--database-url", default=None, help="sync SQLAlchemy URL (default: fresh SQLite file)")
+    args = parser.parse_args()
+
+    # The database service reads its configuration at import time
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    os.environ["DB_ASYNC"] = "false"
+    sys.path.insert(0, DATABASE_DIR)
+
+    from sqlalchemy import event
+    from app.db_connection import SessionLocal, engine
+    from app.models import ExerciseCatalog, User, WorkoutPlan
+    from app.routers.plan_routes import _create_workout_plan, _get_user_workout_plans
+    from app.schemas.plan_schemas import WorkoutPlanCreate
+    from app.scripts.setup_db import setup_database
+    from app.services import plan_loading
+    from app.services.catalog import load_catalog_index
+    from app.services.serializers import serialize_plan
+
+    setup_database()
+    db = SessionLocal()
+    load_catalog_index(db)
+    catalog = [(e.name, e.equipment) for e in db.query(ExerciseCatalog).order_by(ExerciseCatalog.id)]
+    db.close()
+
+    def seed_user(plan_count: int) -> int:
+        db = SessionLocal()
+        user = User(username=f"bench_loading_{uuid.uuid4().hex[:8]}", hashed_password="not-a-real-hash")
+        db.add(user)
+        db.commit()
+        user_id = user.id
+        db.close()
+
+        plan = WorkoutPlanCreate(
+            user_id=user_id, duration_weeks=4, goal="Build muscle", experience_level="Intermediate",
+            days=[
+                {"day_number": d + 1, "day_name": f"Day {d + 1}", "focus": None, "exercises": [
+                    {"exercise_name": name, "equipment": equipment, "sets": 3, "reps": 10, "notes": None}
+                    for name, equipment in (catalog[(d + j) % len(catalog)] for j in range(EXERCISES_PER_DAY))
+                ]}
+                for d in range(DAYS_PER_PLAN)
+            ],
+        )
+        for _ in range(plan_count):
+            db = SessionLocal()
+            _create_workout_plan(db, plan, include_plan=False)
+            db.close()
+        return user_id
+
+    captured = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    def list_plans(user_id: int, source: str):
+        db = SessionLocal()
+        try:
+            if source == "documents":
+                return _get_user_workout_plans(db, user_id, None, "full", None, None)
+            plan_loading.PLAN_LOADER_STRATEGY = source
+            plans = (
+                db.query(WorkoutPlan)
+                .options(plan_loading.plan_load_options(many=True))
+                .filter(WorkoutPlan.user_id == user_id)
+                .order_by(WorkoutPlan.created_at.desc(), WorkoutPlan.id.desc())
+                .all()
+            )
+            return [serialize_plan(plan) for plan in plans]
+        finally:
+            db.close()
+
+    def fetched(statements):
+        # Re-run the listing's statements to count the rows and values (rows x columns) returned
+        rows = values = 0
+        with engine.connect() as connection:
+            for sql, params in statements:
+                result = connection.exec_driver_sql(sql, params).all()
+                rows += len(result)
+                values += sum(len(row) for row in result)
+        return rows, values
+
+    print(f"{DAYS_PER_PLAN} days x {EXERCISES_PER_DAY} exercises per plan, {args.repeat} listings per cell\n")
+    print(f"{'plans':>6}  {'source':<10}{'statements':>11}{'rows':>9}{'values':>10}{'mean ms':>10}{'peak MiB':>10}")
+    for size in args.sizes:
+        user_id = seed_user(size)
+        for source in ("joined", "selectin", "documents"):
+            list_plans(user_id, source)  # warm-up
+
+            captured.clear()
+            list_plans(user_id, source)
+            statements = list(captured)
+
+            elapsed = 0.0
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                list_plans(user_id, source)
+                elapsed += time.perf_counter() - start
+
+            gc.collect()
+            tracemalloc.start()
+            list_plans(user_id, source)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            rows, values = fetched(statements)
+            print(f"{size:>6}  {source:<10}{len(statements):>11}{rows:>9}{values:>10}"
+                  f"{elapsed / args.repeat * 1000:>10.1f}{peak / 2**20:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+# benchmarks/loadtest/load_generator.py
+# Open-loop load generator for the backend API. New user flows are started at a
+# fixed rate, whether or not earlier flows have finished, so a slow server shows
+# up as higher latency rather than as fewer requests sent. Each flow is:
+#   register -> login -> update profile -> generate plan -> list plans
+# Latency is recorded per route and reported as p50/p95/p99; the report is also
+# saved as JSON (with the git commit) so runs can be compared across commits.
+#
+# Usage (from the repo root, against an already running backend):
+#   python benchmarks/loadtest/load_generator.py --target http://localhost:8000 --rps 5 --duration 30
+# To start a local stack with stub services first, use run_loadtest.py instead.
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import subprocess
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+import httpx
+
+# Default directory of saved reports
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "..", "results")
+
+PROFILE = {
+    "age": 30,
+    "height_cm": 178,
+    "weight_kg": 76,
+    "experience_level": "Intermediate",
+    "fitness_goal": "Build muscle",
+    "equipment": ["Barbell", "Dumbbell", "Bodyweight", "Cable Machine"],
+    "health_notes": "No injuries",
+}
+
+
+class RouteStats:
+    """
+    Latencies (seconds) and status codes recorded per route.
+    """
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    def record(self, route: str, seconds: float, status: str) -> None:
+        self.latencies[route].append(seconds)
+        self.statuses[route][status] += 1
+
+    def summary(self, elapsed: float) -> Dict[str, dict]:
+        report = {}
+        for route, latencies in self.latencies.items():
+            ordered = sorted(latencies)
+            statuses = dict(self.statuses[route])
+            errors = sum(count for status, count in statuses.items() if not status.startswith("2"))
+            report[route] = {
+                "requests": len(ordered),
+                "errors": errors,
+                "statuses": statuses,
+                "throughput_rps": round(len(ordered) / elapsed, 2) if elapsed else 0.0,
+                "mean_ms": round(sum(ordered) / len(ordered) * 1000, 2),
+                "p50_ms": _percentile_ms(ordered, 50),
+                "p95_ms": _percentile_ms(ordered, 95),
+                "p99_ms": _percentile_ms(ordered, 99),
+                "max_ms": round(ordered[-1] * 1000, 2),
+            }
+        return report
+
+
+def _percentile_ms(ordered: List[float], percentile: float) -> float:
+    # Nearest-rank percentile of an already sorted list
+    index = max(0, math.ceil(percentile / 100 * len(ordered)) - 1)
+    return round(ordered[index] * 1000, 2)
+
+
+async def _timed(client: httpx.AsyncClient, stats: RouteStats, route: str, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
+    start = time.perf_counter()
+    try:
+        response = await client.request(method, url, **kwargs)
+    except httpx.HTTPError as e:
+        stats.record(route, time.perf_counter() - start, type(e).__name__)
+        return None
+    stats.record(route, time.perf_counter() - start, str(response.status_code))
+    return response
+
+
+async def run_flow(client: httpx.AsyncClient, stats: RouteStats) -> None:
+    """
+    One user's journey through the API. Stops at the first failed step.
+    """
+    username = f"load_{uuid.uuid4().hex[:12]}"
+    credentials = {"username": username, "password": "load-test-password"}
+
+    response = await _timed(client, stats, "POST /register", "POST", "/register", json=credentials)
+    if response is None or response.is_error:
+        return
+
+    response = await _timed(client, stats, "POST /login", "POST", "/login", json=credentials)
+    if response is None or response.is_error:
+        return
+    headers = {"Authorization": f"Bearer {response.json()['token']}"}
+
+    response = await _timed(client, stats, "PUT /profile", "PUT", "/profile", json=PROFILE, headers=headers)
+    if response is None or response.is_error:
+        return
+
+    response = await _timed(client, stats, "POST /generate-plan", "POST", "/generate-plan", headers=headers)
+    if response is None or response.is_error:
+        return
+
+    await _timed(client, stats, "GET /plans", "GET", "/plans", headers=headers)
+
+
+async def generate_load(target: str, rps: float, duration: float, max_in_flight: int, timeout: float) -> dict:
+    """
+    Starts `rps` flows per second for `duration` seconds and waits for all of them.
+
+    Returns:
+        dict: The run's settings, timing and per-route summary.
+    """
+    stats = RouteStats()
+    limits = httpx.Limits(max_connections=max_in_flight, max_keepalive_connections=max_in_flight)
+    in_flight = asyncio.Semaphore(max_in_flight)
+    skipped = 0
+
+    async def flow():
+        try:
+            await run_flow(client, stats)
+        finally:
+            in_flight.release()
+
+    async with httpx.AsyncClient(base_url=target, limits=limits, timeout=timeout) as client:
+        tasks = []
+        total_flows = int(rps * duration)
+        start = time.perf_counter()
+        for i in range(total_flows):
+            # Fixed schedule: flow i starts at i / rps regardless of earlier flows
+            delay = start + i / rps - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if in_flight.locked():
+                # Client-side cap reached; counted so overload stays visible
+                skipped += 1
+                continue
+            await in_flight.acquire()
+            tasks.append(asyncio.create_task(flow()))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - start
+
+    return {
+        "target": target,
+        "target_rps": rps,
+        "duration_s": duration,
+        "elapsed_s": round(elapsed, 2),
+        "flows_started": len(tasks),
+        "flows_skipped": skipped,
+        "routes": stats.summary(elapsed),
+    }
+
+
+def _git_revision() -> Dict[str, object]:
+    repo = os.path.join(os.path.dirname(__file__), "..", "..")
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=repo, capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=repo, capture_output=True, text=True).stdout.strip())
+        return {"commit": commit, "dirty": dirty}
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "dirty": None}
+
+
+def save_report(result: dict, output: Optional[str] = None, extra: Optional[dict] = None) -> str:
+    """
+    Writes the run as JSON (with git revision and environment) and returns the path.
+    """
+    revision = _git_revision()
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git": revision,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        **(extra or {}),
+        **result,
+    }
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        output = os.path.join(RESULTS_DIR, f"loadtest-{stamp}-{(revision['commit'] or 'unknown')[:8]}.json")
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    return os.path.normpath(output)
+
+
+def print_report(result: dict) -> None:
+    print(f"\n{result['flows_started']} flows in {result['elapsed_s']}s "
+          f"(target {result['target_rps']} flows/s, {result['flows_skipped']} skipped)\n")
+    print(f"{'route':<22}{'reqs':>7}{'errors':>8}{'rps':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for route, s in result["routes"].items():
+        print(f"{route:<22}{s['requests']:>7}{s['errors']:>8}{s['throughput_rps']:>8}"
+              f"{s['p50_ms']:>10}{s['p95_ms']:>10}{s['p99_ms']:>10}{s['max_ms']:>10}")
+
+
+def add_load_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--rps", type=float, default=2.0, help="new user flows started per second")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to keep starting flows")
+    parser.add_argument("--max-in-flight", type=int, default=500, help="max concurrent flows (client-side cap)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="per-request timeout (seconds)")
+    parser.add_argument("--output", default=None, help="report path (default: benchmarks/results/loadtest-<time>-<commit>.json)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load generator for the backend API")
+    parser.add_argument("--target", default="http://localhost:8000", help="backend base URL")
+    add_load_arguments(parser)
+    args = parser.parse_args()
+
+    result = asyncio.run(generate_load(args.target, args.rps, args.duration, args.max_in_flight, args.timeout))
+    print_report(result)
+    print(f"\nreport saved to {save_report(result, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
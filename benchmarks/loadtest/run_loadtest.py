@@ -0,0 +1,110 @@
+# benchmarks/loadtest/run_loadtest.py
+# Runs the full three-service stack locally without Postgres or an LLM, then drives
+# it with load_generator.py:
+#   - database service on a fresh SQLite file (schema + seed via setup_db)
+#   - stub AI service with configurable latency (stub_ai_service.py)
+#   - the real backend pointed at both
+# Each service runs in its own uvicorn process, since every service has its own
+# top-level "app" package.
+#
+# Usage (from the repo root, with the backend and database requirements installed):
+#   python benchmarks/loadtest/run_loadtest.py --rps 5 --duration 30 --ai-latency 0.8
+#   python benchmarks/loadtest/run_loadtest.py --bcrypt-rounds 4   # make login/register cheap
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+import httpx
+from load_generator import add_load_arguments, generate_load, print_report, save_report
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+
+def _start(name: str, args: List[str], cwd: str, env: Dict[str, str], log_dir: str) -> subprocess.Popen:
+    log = open(os.path.join(log_dir, f"{name}.log"), "w")
+    return subprocess.Popen(args, cwd=cwd, env={**os.environ, **env}, stdout=log, stderr=subprocess.STDOUT)
+
+
+def _wait_until_up(name: str, url: str, process: subprocess.Popen, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{name} exited with code {process.returncode} (see its log)")
+        try:
+            if httpx.get(url, timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{name} did not come up at {url} within {timeout}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test of the local stack with stub AI and SQLite")
+    parser.add_argument("--base-port", type=int, default=18000, help="backend port; DB and AI use the next two")
+    parser.add_argument("--ai-latency", type=float, default=0.8, help="mean stub LLM latency (seconds)")
+    parser.add_argument("--ai-jitter", type=float, default=0.2, help="stub LLM latency jitter (seconds)")
+    parser.add_argument("--bcrypt-rounds", type=int, default=None, help="override BCRYPT_ROUNDS of the backend")
+    parser.add_argument("--keep-logs", action="store_true", help="print where service logs were written")
+    add_load_arguments(parser)
+    args = parser.parse_args()
+
+    backend_port, db_port, ai_port = args.base_port, args.base_port + 1, args.base_port + 2
+    work_dir = tempfile.mkdtemp(prefix="loadtest-")
+    database_url = f"sqlite:///{os.path.join(work_dir, 'loadtest.db')}"
+    python = sys.executable
+
+    backend_env = {
+        "DB_SERVICE_URL": f"http://127.0.0.1:{db_port}",
+        "AI_SERVICE_URL": f"http://127.0.0.1:{ai_port}",
+    }
+    if args.bcrypt_rounds is not None:
+        backend_env["BCRYPT_ROUNDS"] = str(args.bcrypt_rounds)
+
+    # Schema and exercise catalog first, so the services start on a ready database
+    subprocess.run(
+        [python, "-c", "from app.scripts.setup_db import setup_database; setup_database()"],
+        cwd=os.path.join(REPO_ROOT, "database"), env={**os.environ, "DATABASE_URL": database_url},
+        check=True, stdout=subprocess.DEVNULL,
+    )
+
+    uvicorn = [python, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--log-level", "warning", "--port"]
+    processes = {}
+    try:
+        processes["database"] = _start("database", uvicorn + [str(db_port)], os.path.join(REPO_ROOT, "database"),
+                                       {"DATABASE_URL": database_url}, work_dir)
+        processes["stub-ai"] = _start("stub-ai", [python, os.path.join(os.path.dirname(__file__), "stub_ai_service.py"),
+                                                  "--port", str(ai_port), "--latency", str(args.ai_latency),
+                                                  "--jitter", str(args.ai_jitter)], REPO_ROOT, {}, work_dir)
+        processes["backend"] = _start("backend", uvicorn + [str(backend_port)], os.path.join(REPO_ROOT, "backend"),
+                                      backend_env, work_dir)
+
+        for name, port in (("database", db_port), ("stub-ai", ai_port), ("backend", backend_port)):
+            _wait_until_up(name, f"http://127.0.0.1:{port}/", processes[name])
+
+        result = asyncio.run(generate_load(f"http://127.0.0.1:{backend_port}", args.rps, args.duration,
+                                           args.max_in_flight, args.timeout))
+    finally:
+        for process in processes.values():
+            process.terminate()
+        for process in processes.values():
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+    print_report(result)
+    stack = {"stack": {"database": "sqlite", "ai": "stub", "ai_latency_s": args.ai_latency,
+                       "ai_jitter_s": args.ai_jitter, "bcrypt_rounds": args.bcrypt_rounds}}
+    print(f"\nreport saved to {save_report(result, args.output, stack)}")
+    if args.keep_logs:
+        print(f"service logs in {work_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# benchmarks/loadtest/stub_ai_service.py
+# Stand-in for the AI microservice during load tests. Answers POST /ai/generate
+# with a valid WorkoutPlan built from the allowed exercises it receives, after a
+# configurable, jittered delay that mimics LLM latency. No API key needed.
+#
+# Usage (from the repo root):
+#   python benchmarks/loadtest/stub_ai_service.py --port 18002 --latency 0.8 --jitter 0.2
+
+import argparse
+import asyncio
+import random
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+import uvicorn
+from fastapi import FastAPI
+from pydantic import BaseModel
+
+# Days of the generated plan and exercises per day
+PLAN_DAYS = 3
+EXERCISES_PER_DAY = 4
+
+
+class StubPlanRequest(BaseModel):
+    # Same payload as the real service's AIPlanRequest; only the catalog is used
+    user_profile: dict
+    last_plan: Optional[dict] = None
+    allowed_exercises: List[Tuple[str, str]]
+
+
+def create_app(latency: float, jitter: float) -> FastAPI:
+    app = FastAPI(title="Stub AI Workout Microservice")
+
+    @app.get("/")
+    def health_check():
+        return {"status": "Stub AI microservice is running"}
+
+    @app.post("/ai/generate")
+    async def generate_workout_plan(request_data: StubPlanRequest):
+        # Simulated LLM latency
+        await asyncio.sleep(max(0.0, random.uniform(latency - jitter, latency + jitter)))
+
+        exercises = request_data.allowed_exercises
+        days = []
+        for day_number in range(1, PLAN_DAYS + 1):
+            picked = random.sample(exercises, min(EXERCISES_PER_DAY, len(exercises)))
+            days.append({
+                "day_number": day_number,
+                "day_name": f"Day {day_number}",
+                "focus": "Full Body",
+                "exercises": [
+                    {"exercise_name": name, "equipment": equipment, "sets": 3, "reps": 10, "notes": None}
+                    for name, equipment in picked
+                ],
+            })
+
+        return {
+            "goal": request_data.user_profile.get("fitness_goal"),
+            "experience_level": request_data.user_profile.get("experience_level"),
+            "duration_weeks": 4,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "status": "active",
+            "days": days,
+        }
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stub AI service for load tests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=18002)
+    parser.add_argument("--latency", type=float, default=0.8, help="mean simulated LLM latency (seconds)")
+    parser.add_argument("--jitter", type=float, default=0.2, help="uniform jitter around the latency (seconds)")
+    args = parser.parse_args()
+
+    uvicorn.run(create_app(args.latency, args.jitter), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,57 @@
-from fastapi import FastAPI, HTTPException, Depends
-from sqlalchemy.orm import Session
-from app.db_connection import SessionLocal
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, Response
+from sqlalchemy.exc import SQLAlchemyError
+from starlette.concurrency import run_in_threadpool
+from app.db_connection import SessionLocal, dispose_engines
 from app.routers.user_routes import router as user_router
 from app.routers.plan_routes import router as plan_router
 from app.routers.reference_data_routes import router as data_routes
+from app.services.catalog import load_catalog_index
+from app.services.metrics import MetricsMiddleware, METRICS_CONTENT_TYPE, render_metrics
+from app.services.tracing import TRACE_HEADER, start_trace, server_timing_header, export_trace
 
-app = FastAPI(title="Database Microservice")
+# Load the exercise catalog into memory on startup; close pooled connections on shutdown
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await run_in_threadpool(_load_catalog)
+    yield
+    await dispose_engines()
 
-# Dependency for DB session per request
-def get_db():
+def _load_catalog():
+    # Not fatal: the index is loaded on first use if the database is not ready yet
     db = SessionLocal()
     try:
-        yield db
+        load_catalog_index(db)
+    except SQLAlchemyError as e:
+        print(f"Exercise catalog not loaded at startup: {e}")
     finally:
         db.close()
 
+app = FastAPI(title="Database Microservice", lifespan=lifespan)
+
+# Trace every request (joining the caller's trace ID) and report the time spent
+# in SQL and serialization in a Server-Timing header
+@app.middleware("http")
+async def request_tracing(request: Request, call_next):
+    trace = start_trace(request.headers.get(TRACE_HEADER))
+    response = await call_next(request)
+    response.headers["Server-Timing"] = server_timing_header(trace)
+    response.headers[TRACE_HEADER] = trace.trace_id
+    export_trace(trace, request.method, request.url.path, response.status_code)
+    return response
+
+# Request latency and in-flight metrics (outermost, so it times the whole request)
+app.add_middleware(MetricsMiddleware)
+
 @app.get("/")
 def health_check():
     return {"status": "Database microservice is running"}
 
+# Prometheus metrics (request latency, in-flight requests, pool checkout waits)
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return Response(content=render_metrics(), media_type=METRICS_CONTENT_TYPE)
+
 # Register all routes from user_routes.py
 app.include_router(user_router)
 app.include_router(plan_router)
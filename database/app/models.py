@@ -1,5 +1,5 @@
 # Import SQLAlchemy tools for defining the table columns and types
-from sqlalchemy import Column, Integer, String, ForeignKey, JSON, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, JSON, DateTime, Index, func, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.orm import declarative_base
 from datetime import datetime
@@ -28,6 +28,12 @@ class User(Base):
      # Relationship to profile (one-to-one)
     profile = relationship("UserProfile", back_populates="user", uselist=False)
 
+    # Usernames are looked up case-insensitively (lower(username) = ...), which the
+    # plain username index cannot serve
+    __table_args__ = (
+        Index("ix_users_username_lower", func.lower(username)),
+    )
+
 
 # Represents the extended profile data for each user
 class UserProfile(Base):
@@ -86,6 +92,24 @@ class WorkoutPlan(Base):
         order_by="WorkoutDay.day_number"
     )
 
+    # Relationship: One WorkoutPlan -> One materialized PlanDocument
+    document = relationship(
+        "PlanDocument",
+        cascade="all, delete-orphan",
+        uselist=False
+    )
+
+    __table_args__ = (
+        # "Latest plan" and plan listings: filter by user, newest first (keyset on created_at, id)
+        Index("ix_workout_plans_user_id_created_at", user_id, created_at.desc(), id.desc()),
+        # Archiving the user's active plans on every plan insert; only active rows are indexed
+        Index(
+            "ix_workout_plans_user_id_active", user_id,
+            postgresql_where=text("status = 'active'"),
+            sqlite_where=text("status = 'active'"),
+        ),
+    )
+
 
 
 
@@ -100,8 +124,8 @@ class WorkoutDay(Base):
     # Primary key: Unique ID for each workout day
     id = Column(Integer, primary_key=True, index=True)
 
-    # Foreign key to the WorkoutPlan this day belongs to
-    plan_id = Column(Integer, ForeignKey("workout_plans.id", ondelete="CASCADE"), nullable=False)
+    # Foreign key to the WorkoutPlan this day belongs to (indexed: days are loaded by plan)
+    plan_id = Column(Integer, ForeignKey("workout_plans.id", ondelete="CASCADE"), nullable=False, index=True)
 
     # Day number inside the plan (1, 2, 3, etc.)
     day_number = Column(Integer, nullable=False)
@@ -138,11 +162,12 @@ class WorkoutExercise(Base):
     # Primary key: Unique ID for each workout exercise instance
     id = Column(Integer, primary_key=True, index=True)
 
-    # Foreign key to the WorkoutDay this exercise belongs to
-    day_id = Column(Integer, ForeignKey("workout_days.id", ondelete="CASCADE"), nullable=False)
+    # Foreign key to the WorkoutDay this exercise belongs to (indexed: exercises are loaded by day)
+    day_id = Column(Integer, ForeignKey("workout_days.id", ondelete="CASCADE"), nullable=False, index=True)
 
-    # Foreign key to the ExerciseCatalog entry (the real exercise data)
-    exercise_catalog_id = Column(Integer, ForeignKey("exercise_catalog.id"), nullable=False)
+    # Foreign key to the ExerciseCatalog entry (the real exercise data; indexed to find
+    # the plans whose documents must be rebuilt when an entry is renamed)
+    exercise_catalog_id = Column(Integer, ForeignKey("exercise_catalog.id"), nullable=False, index=True)
 
     # Number of sets for this exercise
     sets = Column(Integer, nullable=True)  # Optional because some exercises could be "stretch" without sets
@@ -190,4 +215,36 @@ class ExerciseCatalog(Base):
     workout_instances = relationship(
         "WorkoutExercise",
         back_populates="catalogical_exercise"
-    )
\ No newline at end of file
+    )
+
+class CatalogRevision(Base):
+    """
+    Single-row counter bumped whenever the exercise catalog changes (seed script).
+    Services keep the catalog in memory and reload it when the revision moves.
+    """
+
+    __tablename__ = "catalog_revision"  # Table name in PostgreSQL
+
+    # Always 1: there is exactly one row
+    id = Column(Integer, primary_key=True)
+
+    # Incremented by every catalog change
+    revision = Column(Integer, nullable=False, default=0)
+
+
+class PlanDocument(Base):
+    """
+    Pre-serialized copy of a WorkoutPlan in the WorkoutPlanResponse shape, written
+    when the plan is created and served by plan reads instead of rebuilding it from
+    workout_days / workout_exercises / exercise_catalog.
+    The normalized tables stay the source of truth: `status` is always taken from
+    workout_plans, and documents are rebuilt when a referenced catalog entry is renamed.
+    """
+
+    __tablename__ = "plan_documents"  # Table name in PostgreSQL
+
+    # One document per plan; deleted with the plan
+    plan_id = Column(Integer, ForeignKey("workout_plans.id", ondelete="CASCADE"), primary_key=True)
+
+    # The serialized plan (plain JSON, not JSONB: it is only ever read back whole)
+    document = Column(JSON, nullable=False)
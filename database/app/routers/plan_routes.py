@@ -1,20 +1,34 @@
-from fastapi import APIRouter, HTTPException, Depends, Path, Query, status
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func
+from fastapi import APIRouter, HTTPException, Depends, Path, Query, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, insert, literal_column, or_
 from app.db_connection import get_db
-from app.models import WorkoutPlan,WorkoutDay, WorkoutExercise, ExerciseCatalog
-from app.schemas.plan_schemas import LastWorkoutPlanResponse,WorkoutPlanCreate,WorkoutPlanResponse
+from app.models import WorkoutPlan,WorkoutDay, WorkoutExercise, ExerciseCatalog, PlanDocument
+from app.schemas.plan_schemas import LastWorkoutPlanResponse,WorkoutPlanCreate,WorkoutPlanResponse,WorkoutPlanSummaryResponse
+from collections import defaultdict
 from datetime import datetime
-from typing import List, Optional
-from app.services.serializers import serialize_plan
+from typing import List, Optional, Tuple, Union
+from app.services.catalog import CATALOG_REVISION_HEADER, catalog_key, current_catalog_revision, resolve_catalog_entries
+from app.services.plan_documents import plan_documents
+from app.services.serializers import serialize_plan_summary
+from app.services.pagination import encode_plan_cursor, decode_plan_cursor
+from app.services.plan_export import user_plans_ndjson
+from app.services.tracing import span
 
 
 router = APIRouter()
 
+# Max plan IDs accepted by one batch request
+MAX_BATCH_IDS = 100
+
+# Response header carrying the ID of the user owning the plan (GET /workout-plans/{plan_id})
+PLAN_OWNER_HEADER = "X-Plan-Owner"
+
 @router.get("/users/{user_id}/plans/last", response_model=LastWorkoutPlanResponse)
-def get_latest_workout_plan_for_user(
+async def get_latest_workout_plan_for_user(
     user_id: int = Path(..., description="ID of the user to fetch the latest workout plan for"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Retrieve the latest workout plan created for a given user.
@@ -28,7 +42,10 @@ def get_latest_workout_plan_for_user(
     Returns:
         WorkoutPlanResponse: Details of the latest workout plan.
     """
+    return await db.run_sync(_get_latest_workout_plan_for_user, user_id)
+
 
+def _get_latest_workout_plan_for_user(db: Session, user_id: int) -> WorkoutPlan:
     # Query the most recent workout plan for the given user
     latest_plan = (
         db.query(WorkoutPlan)
@@ -44,20 +61,102 @@ def get_latest_workout_plan_for_user(
     return latest_plan
 
 
+@router.get("/users/{user_id}/plans/export")
+async def export_workout_plans_for_user(
+    user_id: int = Path(..., description="ID of the user whose plan history is exported"),
+    status: Optional[str] = Query(None, description="Filter by status: active or archived")
+):
+    """
+    Streams the user's complete plan history as newline-delimited JSON
+    (application/x-ndjson), newest first, one full plan per line.
+
+    - Each line has the same shape as GET /workout-plans/{id}.
+    - Rows are read through a server-side cursor, so memory stays flat regardless
+      of how many plans the user has.
+    - A user without plans gets an empty body.
+    """
+    return StreamingResponse(
+        user_plans_ndjson(user_id, status),
+        media_type="application/x-ndjson"
+    )
+
+
+@router.get("/users/{user_id}/plans/batch", response_model=List[WorkoutPlanResponse])
+async def get_workout_plans_batch(
+    response: Response,
+    user_id: int = Path(..., description="ID of the user who must own the plans"),
+    ids: str = Query(..., description=f"Comma-separated plan IDs (at most {MAX_BATCH_IDS})"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Retrieve several workout plans of a user in one request.
+
+    - All plans are loaded with one IN query, and their materialized documents
+      (days and exercises) with one more.
+    - Plans that do not exist or belong to another user are left out.
+    - Results follow the order of `ids` (duplicates are returned once).
+    - The catalog revision is returned in the X-Catalog-Revision header.
+    """
+    response.headers[CATALOG_REVISION_HEADER] = str(await current_catalog_revision(db))
+    return await db.run_sync(_get_workout_plans_batch, user_id, ids)
+
+
+def _get_workout_plans_batch(db: Session, user_id: int, ids: str) -> List[dict]:
+    plan_ids = parse_plan_ids(ids)
+
+    plans = (
+        db.query(WorkoutPlan)
+        .filter(WorkoutPlan.id.in_(plan_ids), WorkoutPlan.user_id == user_id)
+        .all()
+    )
+
+    # Return in request order
+    plans_by_id = {plan.id: plan for plan in plans}
+    with span("serialize", plans=len(plans)):
+        return plan_documents(db, [plans_by_id[plan_id] for plan_id in plan_ids if plan_id in plans_by_id])
+
+
+def parse_plan_ids(ids: str) -> List[int]:
+    """
+    Parses a comma-separated list of plan IDs, dropping duplicates but keeping order.
+    Raises HTTP 422 if an ID is not an integer or too many IDs are given.
+    """
+    try:
+        plan_ids = list(dict.fromkeys(int(part) for part in ids.split(",") if part.strip()))
+    except ValueError:
+        raise HTTPException(status_code=422, detail="ids must be a comma-separated list of integers")
+
+    if not plan_ids or len(plan_ids) > MAX_BATCH_IDS:
+        raise HTTPException(status_code=422, detail=f"ids must contain between 1 and {MAX_BATCH_IDS} plan IDs")
+    return plan_ids
+
+
 @router.post("/workout-plans")
-def create_workout_plan(plan_data: WorkoutPlanCreate, db: Session = Depends(get_db)):
+async def create_workout_plan(
+    plan_data: WorkoutPlanCreate,
+    include_plan: bool = Query(False, description="Also return the saved plan (same shape as GET /workout-plans/{id})"),
+    db: AsyncSession = Depends(get_db)
+):
     """
     Creates a full workout plan:
     - Archives existing active plans for the user
     - Inserts WorkoutPlan
-    - Inserts associated WorkoutDays
-    - For each day, inserts WorkoutExercises and links to ExerciseCatalog
+    - Resolves all exercises against ExerciseCatalog in one query
+      (400 listing every exercise that is not in the catalog)
+    - Inserts associated WorkoutDays and WorkoutExercises with one bulk insert each
+
+    With `include_plan=true` the response also contains the serialized plan, built from
+    the objects just created, so callers do not need to fetch it again.
     """
+    return await db.run_sync(_create_workout_plan, plan_data, include_plan)
 
+
+def _create_workout_plan(db: Session, plan_data: WorkoutPlanCreate, include_plan: bool) -> dict:
     #Archive existing active plans for this user
+    # ('active' is inlined rather than bound so the partial index on active plans applies)
     db.query(WorkoutPlan).filter(
         WorkoutPlan.user_id == plan_data.user_id,
-        WorkoutPlan.status == "active"
+        WorkoutPlan.status == literal_column("'active'")
     ).update({WorkoutPlan.status: "archived"})
 
     #Insert the base WorkoutPlan
@@ -72,107 +171,194 @@ def create_workout_plan(plan_data: WorkoutPlanCreate, db: Session = Depends(get_
     db.add(new_plan)
     db.flush()  # So new_plan.id is generated and usable for WorkoutDays
 
-    #Insert WorkoutDays and associated exercises
-    for day in plan_data.days:
-        new_day = WorkoutDay(
-            plan_id=new_plan.id,
-            day_number=day.day_number,
-            day_name=day.day_name,
-            focus=day.focus
-        )
-        db.add(new_day)
-        db.flush()  # Get new_day.id to attach exercises
+    # Resolve every exercise of the plan against the catalog in one query
+    # (400 listing all unknown exercises at once)
+    catalog = resolve_catalog_entries(
+        db, [(ex.exercise_name, ex.equipment) for day in plan_data.days for ex in day.exercises]
+    )
 
+    #Insert all WorkoutDays in one statement
+    day_ids = []
+    if plan_data.days:
+        inserted = db.execute(
+            insert(WorkoutDay)
+            .returning(WorkoutDay.id, WorkoutDay.day_number, WorkoutDay.day_name, WorkoutDay.focus)
+            # Send NULLs explicitly, otherwise rows with and without NULLs go out as separate batches
+            .execution_options(render_nulls=True),
+            [
+                {"plan_id": new_plan.id, "day_number": day.day_number, "day_name": day.day_name, "focus": day.focus}
+                for day in plan_data.days
+            ]
+        ).all()
+
+        # Match IDs to input days by content rather than by position: asking for
+        # RETURNING in parameter order makes SQLite fall back to one INSERT per row.
+        # Days with identical content are interchangeable, so any match among them is correct.
+        ids_by_day = defaultdict(list)
+        for day_id, day_number, day_name, focus in inserted:
+            ids_by_day[(day_number, day_name, focus)].append(day_id)
+        day_ids = [ids_by_day[(day.day_number, day.day_name, day.focus)].pop() for day in plan_data.days]
+
+    # Exercise rows for one bulk insert, and the serialized days for include_plan
+    exercise_rows = []
+    serialized_days = []
+    for day, day_id in zip(plan_data.days, day_ids):
+        serialized_exercises = []
         for ex in day.exercises:
-            # Find matching exercise in ExerciseCatalog by name + equipment
-            catalog_entry = db.query(ExerciseCatalog).filter(
-                func.lower(ExerciseCatalog.name) == ex.exercise_name.lower(),
-                func.lower(ExerciseCatalog.equipment) == (ex.equipment or "").lower()
-            ).first()
-
-            if not catalog_entry:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Exercise '{ex.exercise_name}' with equipment '{ex.equipment}' not found in catalog"
-                )
-
-            workout_ex = WorkoutExercise(
-                day_id=new_day.id,
-                exercise_catalog_id=catalog_entry.id,
-                sets=ex.sets,
-                reps=ex.reps,
-                notes=ex.notes
-            )
-            db.add(workout_ex)
+            catalog_id, name, equipment = catalog[catalog_key(ex.exercise_name, ex.equipment)]
+            exercise_rows.append({
+                "day_id": day_id,
+                "exercise_catalog_id": catalog_id,
+                "sets": ex.sets,
+                "reps": ex.reps,
+                "notes": ex.notes
+            })
+
+            # Canonical name/equipment come from the catalog, as in serialize_plan
+            serialized_exercises.append({
+                "exercise_name": name,
+                "equipment": equipment,
+                "sets": ex.sets,
+                "reps": ex.reps,
+                "notes": ex.notes
+            })
+
+        serialized_days.append({
+            "day_number": day.day_number,
+            "day_name": day.day_name,
+            "focus": day.focus,
+            "exercises": serialized_exercises
+        })
+
+    #Insert all WorkoutExercises in one batched statement
+    if exercise_rows:
+        db.execute(insert(WorkoutExercise).execution_options(render_nulls=True), exercise_rows)
+
+    # Capture the plan before commit expires the ORM objects
+    plan_id = new_plan.id
+    serialized_plan = {
+        "id": plan_id,
+        "goal": new_plan.goal,
+        "duration_weeks": new_plan.duration_weeks,
+        "status": new_plan.status,
+        "experience_level": new_plan.experience_level,
+        "created_at": new_plan.created_at.isoformat(),
+        "days": sorted(serialized_days, key=lambda d: d["day_number"])
+    }
+
+    # Materialized document served by plan reads (status is overlaid on read)
+    db.add(PlanDocument(plan_id=plan_id, document=serialized_plan))
 
     #Commit all changes
     db.commit()
 
-    return {"message": "Workout plan created successfully", "plan_id": new_plan.id}
-
+    response = {"message": "Workout plan created successfully", "plan_id": plan_id}
+    if include_plan:
+        response["plan"] = serialized_plan
+    return response
 
 
-
-@router.get("/workout-plans", response_model=List[WorkoutPlanResponse])
-def get_user_workout_plans(
+@router.get("/workout-plans", response_model=Union[List[WorkoutPlanResponse], List[WorkoutPlanSummaryResponse]])
+async def get_user_workout_plans(
+    response: Response,
     user_id: int = Query(..., description="ID of the user"),
     status: Optional[str] = Query(None, description="Filter by status: active or archived"),
-    db: Session = Depends(get_db)
+    view: str = Query("full", pattern="^(full|summary)$", description="'full' (with days and exercises) or 'summary' (plan headers only)"),
+    limit: Optional[int] = Query(None, ge=1, le=100, description="Page size; omit to return all plans"),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    db: AsyncSession = Depends(get_db)
 ):
     """
-    Returns all workout plans for a given user.
+    Returns workout plans for a given user, newest first.
     Supports optional filtering by status.
-    Includes nested days and exercises.
+
+    - view=full includes nested days and exercises, read from the plans' materialized
+      documents; view=summary returns only plan headers.
+    - Keyset pagination on (created_at, id): pass `limit`, then pass the X-Next-Cursor
+      response header as `cursor` to get the next page. The header is absent on the last page.
+    - Returns 404 if the user has no plans (first page only).
+    - The catalog revision is returned in the X-Catalog-Revision header.
     """
-    # Build base query
-    query = db.query(WorkoutPlan).options(
-        joinedload(WorkoutPlan.days).joinedload(WorkoutDay.exercises).joinedload(WorkoutExercise.catalogical_exercise)
-    ).filter(WorkoutPlan.user_id == user_id)
+    response.headers[CATALOG_REVISION_HEADER] = str(await current_catalog_revision(db))
+    plans, next_cursor = await db.run_sync(_get_user_workout_plans, user_id, status, view, limit, cursor)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return plans
+
+
+def _get_user_workout_plans(
+    db: Session, user_id: int, status: Optional[str], view: str, limit: Optional[int], cursor: Optional[str]
+) -> Tuple[List[dict], Optional[str]]:
+    # Build base query (full plans are read from their documents after paging)
+    query = db.query(WorkoutPlan).filter(WorkoutPlan.user_id == user_id)
 
     # Apply status filter if provided
     if status:
         query = query.filter(WorkoutPlan.status == status)
 
-    plans = query.order_by(WorkoutPlan.created_at.desc()).all()
-
-    if not plans:
+    # Continue after the last plan of the previous page
+    if cursor:
+        cursor_created_at, cursor_id = decode_plan_cursor(cursor)
+        query = query.filter(or_(
+            WorkoutPlan.created_at < cursor_created_at,
+            and_(WorkoutPlan.created_at == cursor_created_at, WorkoutPlan.id < cursor_id)
+        ))
+
+    query = query.order_by(WorkoutPlan.created_at.desc(), WorkoutPlan.id.desc())
+
+    next_cursor = None
+    if limit:
+        # Fetch one extra row to know whether another page exists
+        plans = query.limit(limit + 1).all()
+        if len(plans) > limit:
+            plans = plans[:limit]
+            next_cursor = encode_plan_cursor(plans[-1])
+    else:
+        plans = query.all()
+
+    if not plans and not cursor:
         raise HTTPException(status_code=404, detail="No workout plans found for this user")
 
-
-    return [serialize_plan(plan) for plan in plans]
+    with span("serialize", plans=len(plans)):
+        if view == "full":
+            return plan_documents(db, plans), next_cursor
+        return [serialize_plan_summary(plan) for plan in plans], next_cursor
 
 
 @router.get("/workout-plans/{plan_id}", response_model=WorkoutPlanResponse)
-def get_workout_plan_by_id(plan_id: int, db: Session = Depends(get_db)):
+async def get_workout_plan_by_id(plan_id: int, response: Response, db: AsyncSession = Depends(get_db)):
     """
     Retrieve a single workout plan by its unique ID.
 
-    - Includes nested workout days, exercises, and catalog details.
+    - Includes nested workout days, exercises, and catalog details, served from the
+      plan's materialized document (built at insert time) with the current status.
     - Returns the full structured response as defined by WorkoutPlanResponse.
+    - The owner's user ID is returned in the X-Plan-Owner header and the catalog
+      revision in the X-Catalog-Revision header (for the backend's plan cache).
     - If no plan is found with the given ID, returns 404.
     """
+    response.headers[CATALOG_REVISION_HEADER] = str(await current_catalog_revision(db))
+    document, owner = await db.run_sync(_get_workout_plan_by_id, plan_id)
+    response.headers[PLAN_OWNER_HEADER] = str(owner)
+    return document
+
 
-    # Query the database for the workout plan, eager-loading all related data:
-    # - Workout days (WorkoutDay)
-    # - Exercises for each day (WorkoutExercise)
-    # - Catalog details for each exercise (ExerciseCatalog)
-    plan = db.query(WorkoutPlan).options(
-        joinedload(WorkoutPlan.days)
-        .joinedload(WorkoutDay.exercises)
-        .joinedload(WorkoutExercise.catalogical_exercise)
-    ).filter(WorkoutPlan.id == plan_id).first()
+def _get_workout_plan_by_id(db: Session, plan_id: int) -> Tuple[dict, int]:
+    # Query the database for the workout plan header; days, exercises and catalog
+    # details come from its materialized document
+    plan = db.query(WorkoutPlan).filter(WorkoutPlan.id == plan_id).first()
 
     # Return 404 if no such plan exists
     if not plan:
         raise HTTPException(status_code=404, detail="Workout plan not found")
 
-    # Serialize the ORM object into a nested response dict
-    return serialize_plan(plan)
-
+    # Materialized document with the current status, and the plan's owner
+    with span("serialize"):
+        return plan_documents(db, [plan])[0], plan.user_id
 
 
 @router.delete("/workout-plans/{plan_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_workout_plan(plan_id: int, db: Session = Depends(get_db)):
+async def delete_workout_plan(plan_id: int, db: AsyncSession = Depends(get_db)):
     """
     Delete a workout plan by ID.
 
@@ -180,6 +366,10 @@ def delete_workout_plan(plan_id: int, db: Session = Depends(get_db)):
     - Returns 204 on success
     - Returns 404 if plan does not exist
     """
+    return await db.run_sync(_delete_workout_plan, plan_id)
+
+
+def _delete_workout_plan(db: Session, plan_id: int) -> None:
     # Fetch the plan by ID
     plan = db.query(WorkoutPlan).filter(WorkoutPlan.id == plan_id).first()
 
@@ -188,5 +378,3 @@ def delete_workout_plan(plan_id: int, db: Session = Depends(get_db)):
 
     db.delete(plan)
     db.commit()
-
-
@@ -1,20 +1,24 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.db_connection import get_db
 from typing import List,Tuple
-from app.models import ExerciseCatalog
+from app.services.catalog import CATALOG_REVISION_HEADER, cached_catalog_index, get_catalog_index
 
 router = APIRouter()
 
 @router.get("/catalog-exercises/names", response_model=List[Tuple[str, str]])
-def get_catalog_exercises_names(db: Session = Depends(get_db)):
+async def get_catalog_exercises_names(db: AsyncSession = Depends(get_db)):
     """
     Returns a tuple list of pairs that each one include exercise name and equipment from the ExerciseCatalog table.
     Used to constrain exercise selection in AI-generated workout plans.
+    The body is pre-encoded when the catalog is loaded; the catalog revision is
+    returned in the X-Catalog-Revision header.
     """
-
-    # Query the 'name' and 'equipment' columns from the ExerciseCatalog
-    results = db.query(ExerciseCatalog.name,ExerciseCatalog.equipment).all()  # returns List[Tuple[str, str]]
-
-    return results
-
+    # Served from the in-memory catalog index; the session is only used when the
+    # catalog revision is due for a check
+    index = cached_catalog_index() or await db.run_sync(get_catalog_index)
+    return Response(
+        content=index.names_json,
+        media_type="application/json",
+        headers={CATALOG_REVISION_HEADER: str(index.revision)},
+    )
@@ -1,20 +1,23 @@
 # routers/user_routes.py
 # Contains all user-related API endpoints: user registration and profile creation/update
 
-from fastapi import APIRouter, Depends, HTTPException, Path,status
+from fastapi import APIRouter, Depends, HTTPException, Path, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.db_connection import SessionLocal,get_db
-from app.models import User, UserProfile
-from app.schemas.auth_schemas import UserCreate, UserResponse,UserInDB
+from app.models import User, UserProfile, WorkoutPlan
+from app.schemas.auth_schemas import UserCreate, UserResponse,UserInDB,PasswordUpdate
 from app.schemas.user_profile_schemas import UserProfileCreate,UserProfileResponse
-from sqlalchemy import func
+from app.schemas.plan_schemas import GenerationContextResponse
+from app.services.catalog import CATALOG_REVISION_HEADER, current_catalog_revision
+from sqlalchemy import func, select
 
 # Create a router object to group user-related endpoints
 router = APIRouter()
 
 
 @router.post("/users", response_model=UserResponse,status_code=201)
-def create_user(user: UserCreate, db: Session = Depends(get_db)):
+async def create_user(user: UserCreate, db: AsyncSession = Depends(get_db)):
     """
     Register a new user in the system.
 
@@ -22,7 +25,10 @@ def create_user(user: UserCreate, db: Session = Depends(get_db)):
     - Returns: the created user's `id` and `username`
     - Rejects: if the username is already taken
     """
+    return await db.run_sync(_create_user, user)
 
+
+def _create_user(db: Session, user: UserCreate) -> User:
     # Check if username is already taken
     existing_user = db.query(User).filter(func.lower(User.username) == user.username.lower()).first()
     if existing_user:
@@ -41,26 +47,55 @@ def create_user(user: UserCreate, db: Session = Depends(get_db)):
 
     return new_user
 
+
 @router.get("/users/{username}",response_model=UserInDB)
-def get_user_by_username(username: str, db: Session = Depends(get_db)):
+async def get_user_by_username(username: str, db: AsyncSession = Depends(get_db)):
     """
     Used by the backend service for login verification.
 
     Returns the user object (including hashed password) by username.
     """
+    return await db.run_sync(_get_user_by_username, username)
+
+
+def _get_user_by_username(db: Session, username: str) -> User:
     db_user = db.query(User).filter(func.lower(User.username) == username.lower()).first()
 
     if not db_user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    return db_user  
+    return db_user
+
+
+@router.put("/users/{user_id}/password", status_code=status.HTTP_204_NO_CONTENT)
+async def update_password(
+    password_data: PasswordUpdate,
+    user_id: int = Path(..., description="User ID whose password hash is being replaced"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Replaces the stored password hash of a user.
+
+    Used by the backend to re-hash passwords on login when the bcrypt cost changes.
+    Raises 404 if the user does not exist.
+    """
+    return await db.run_sync(_update_password, user_id, password_data)
+
+
+def _update_password(db: Session, user_id: int, password_data: PasswordUpdate) -> None:
+    user = db.query(User).filter(User.id == user_id).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    user.hashed_password = password_data.hashed_password
+    db.commit()
 
 
 @router.put("/users/{user_id}/profile")
-def update_profile(
+async def update_profile(
     profile_data: UserProfileCreate,
     user_id: int = Path(..., description="User ID whose profile is being updated"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Create or update a user profile.
@@ -70,7 +105,10 @@ def update_profile(
     - If not, creates a new profile linked to the user.
     - Returns: a confirmation message.
     """
+    return await db.run_sync(_update_profile, user_id, profile_data)
 
+
+def _update_profile(db: Session, user_id: int, profile_data: UserProfileCreate) -> UserProfile:
     # Ensure the user exists before updating/creating a profile
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
@@ -90,9 +128,9 @@ def update_profile(
 
 
 @router.get("/users/{user_id}/profile", response_model=UserProfileResponse)
-def get_profile(
+async def get_profile(
     user_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Retrieves the profile of a given user by ID.
@@ -103,6 +141,10 @@ def get_profile(
     Raises:
         404: If the user or profile does not exist.
     """
+    return await db.run_sync(_get_profile, user_id)
+
+
+def _get_profile(db: Session, user_id: int) -> UserProfile:
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
@@ -112,3 +154,48 @@ def get_profile(
 
     return user.profile
 
+
+@router.get("/users/{username}/generation-context", response_model=GenerationContextResponse)
+async def get_generation_context(username: str, response: Response, db: AsyncSession = Depends(get_db)):
+    """
+    Returns everything the backend needs to generate a plan in a single query:
+    the user's ID, their profile and a summary of their latest workout plan.
+
+    - `profile` is null if the user has not created a profile yet.
+    - `last_plan` is null if the user has no plans yet.
+    - The X-Catalog-Revision header carries the current catalog revision, so the
+      backend can drop its cached catalog when it has changed.
+
+    Raises:
+        404: If the user does not exist.
+    """
+    response.headers[CATALOG_REVISION_HEADER] = str(await current_catalog_revision(db))
+    return await db.run_sync(_get_generation_context, username)
+
+
+def _get_generation_context(db: Session, username: str) -> dict:
+    # Correlated subquery selecting the id of the user's most recent plan
+    latest_plan_id = (
+        select(WorkoutPlan.id)
+        .where(WorkoutPlan.user_id == User.id)
+        .order_by(WorkoutPlan.created_at.desc(), WorkoutPlan.id.desc())
+        .limit(1)
+        .correlate(User)
+        .scalar_subquery()
+    )
+
+    # User + profile + latest plan joined in one statement
+    row = (
+        db.query(User.id, UserProfile, WorkoutPlan)
+        .outerjoin(UserProfile, UserProfile.user_id == User.id)
+        .outerjoin(WorkoutPlan, WorkoutPlan.id == latest_plan_id)
+        .filter(func.lower(User.username) == username.lower())
+        .first()
+    )
+
+    if not row:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+
+    user_id, profile, last_plan = row
+
+    return {"user_id": user_id, "profile": profile, "last_plan": last_plan}
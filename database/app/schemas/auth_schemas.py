@@ -35,4 +35,8 @@ class UserInDB(BaseModel):
     hashed_password: str  
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+# Request body for replacing a user's password hash (e.g. after a bcrypt cost change)
+class PasswordUpdate(BaseModel):
+    hashed_password: str
@@ -1,6 +1,7 @@
 from typing import List, Optional
 from pydantic import BaseModel,Field
 from datetime import datetime
+from app.schemas.user_profile_schemas import UserProfileResponse
 
 class LastWorkoutPlanResponse(BaseModel):
     duration_weeks: Optional[int]
@@ -13,6 +14,13 @@ class LastWorkoutPlanResponse(BaseModel):
         from_attributes = True  
 
 
+# Everything the backend needs to generate a plan, returned in one round trip
+class GenerationContextResponse(BaseModel):
+    user_id: int
+    profile: Optional[UserProfileResponse]
+    last_plan: Optional[LastWorkoutPlanResponse]
+
+
 class ExerciseInPlan(BaseModel):
     exercise_name: str
     equipment: str
@@ -56,4 +64,16 @@ class WorkoutPlanResponse(BaseModel):
     days: List[WorkoutDayResponse]
 
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True
+
+# Plan header only, returned by GET /workout-plans?view=summary
+class WorkoutPlanSummaryResponse(BaseModel):
+    id: int
+    goal: Optional[str]
+    experience_level: Optional[str]
+    duration_weeks: Optional[int]
+    created_at: datetime
+    status: str
+
+    class Config:
+        from_attributes = True
@@ -1,13 +1,12 @@
 # init_db.py
-# This script creates all tables defined in models.py using SQLAlchemy
+# This script creates all tables defined in models.py by applying the migrations
+# in migrations/ (see setup_db.py, which also seeds the exercise catalog)
 
-from app.models import Base
-from app.db_connection import engine
-from app.models import User, UserProfile, WorkoutPlan, WorkoutDay, WorkoutExercise, ExerciseCatalog  # all models we create in the database
+from app.scripts.setup_db import upgrade_schema
 
 
 # Create all tables in the database
-# This will check if they exist already, and only create if they don't
-Base.metadata.create_all(bind=engine)
+# Already applied migrations are skipped, so this is safe to run again
+upgrade_schema()
 
-print("all tables created successfully!")
\ No newline at end of file
+print("all tables created successfully!")
@@ -8,6 +8,7 @@
 from sqlalchemy.orm import Session
 from app.db_connection import SessionLocal
 from app.models import ExerciseCatalog
+from app.services.catalog import bump_catalog_revision
 
 
 
@@ -52,11 +53,6 @@ seed_data = [
         "primary_muscle": "Biceps",
         "difficulty": "Beginner"
     },
-    {   "name": "Barbell Curl",
-        "equipment": "Barbell",
-        "primary_muscle": "Biceps",  
-        "difficulty": "Beginner"
-    },
     {   "name": "Push Ups", 
         "equipment": "Bodyweight", 
         "primary_muscle": "Chest", 
@@ -81,6 +77,7 @@ def seed_exercise_catalog():
     """
     db: Session = SessionLocal()
 
+    added = 0
     try:
         for ex in seed_data:
             exists = db.query(ExerciseCatalog).filter_by(
@@ -92,6 +89,11 @@ def seed_exercise_catalog():
                 continue
 
             db.add(ExerciseCatalog(**ex))
+            added += 1
+
+        # Tell running services to reload their in-memory catalog
+        if added:
+            bump_catalog_revision(db)
 
         db.commit()
     except Exception as e:
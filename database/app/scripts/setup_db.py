@@ -4,17 +4,61 @@ Initializes the database schema and seeds required tables.
 Safe to run multiple times.
 """
 
+import os
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
 from app.models import Base
-from app.db_connection import engine
+from app.db_connection import SessionLocal, engine
 from app.scripts.seed_exercises import seed_exercise_catalog
+from app.services.plan_documents import backfill_plan_documents
+
+# database/ directory, where alembic.ini and migrations/ live
+DATABASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+# Revision matching the schema that create_all produced before migrations existed
+BASELINE_REVISION = "0001"
+
+
+def upgrade_schema():
+    """
+    Applies all pending migrations (alembic upgrade head).
+
+    Databases created by the old create_all setup have the tables but no
+    alembic_version: they are stamped at the baseline revision first, so only
+    the later migrations run on them.
+    """
+    config = Config(os.path.join(DATABASE_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(DATABASE_DIR, "migrations"))
+    # Keep the application's logging setup (alembic.ini is for the alembic CLI)
+    config.config_file_name = None
+
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        inspector = inspect(connection)
+        if inspector.has_table("users") and not inspector.has_table("alembic_version"):
+            # catalog_revision was added just before migrations; older databases lack it
+            Base.metadata.tables["catalog_revision"].create(connection, checkfirst=True)
+            command.stamp(config, BASELINE_REVISION)
+        command.upgrade(config, "head")
+
 
 def setup_database():
-    print("Creating tables (if not exist)...")
-    Base.metadata.create_all(bind=engine)
+    print("Applying database migrations...")
+    upgrade_schema()
 
     print("Seeding exercise catalog...")
     seed_exercise_catalog()
 
+    # Plans stored before materialized documents existed
+    db = SessionLocal()
+    try:
+        created = backfill_plan_documents(db)
+    finally:
+        db.close()
+    if created:
+        print(f"Built {created} plan documents.")
+
     print("Database setup complete.")
 
 if __name__ == "__main__":
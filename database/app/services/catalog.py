@@ -0,0 +1,164 @@
+import json
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+from fastapi import HTTPException
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+from app.models import CatalogRevision, ExerciseCatalog
+
+# How often (seconds) the catalog revision is re-read to notice catalog changes.
+# 0 checks on every request.
+CATALOG_REVISION_CHECK_INTERVAL = float(os.getenv("CATALOG_REVISION_CHECK_INTERVAL", "5"))
+
+# Response header carrying the catalog revision, so callers that cache the
+# catalog (the backend) notice changes
+CATALOG_REVISION_HEADER = "X-Catalog-Revision"
+
+# Case-insensitive lookup key of a catalog entry: (lower(name), lower(equipment))
+CatalogKey = Tuple[str, str]
+
+
+def catalog_key(name: str, equipment: str) -> CatalogKey:
+    return name.lower(), (equipment or "").lower()
+
+
+class CatalogIndex:
+    """
+    Immutable in-memory copy of the exercise catalog at one revision:
+    - entries: catalog_key -> (catalog id, canonical name, canonical equipment)
+    - names_json: the pre-encoded /catalog-exercises/names response body
+    """
+
+    def __init__(self, revision: int, rows: List[Tuple[int, str, str]]):
+        self.revision = revision
+        self.entries: Dict[CatalogKey, Tuple[int, str, str]] = {
+            catalog_key(name, equipment): (catalog_id, name, equipment) for catalog_id, name, equipment in rows
+        }
+        self.names_json = json.dumps([[name, equipment] for _, name, equipment in rows]).encode()
+
+
+# Current index (replaced as a whole, so readers never see a half-built one)
+_index: Optional[CatalogIndex] = None
+_checked_at = 0.0
+
+# Guards only the swap of _index, never I/O: with the async engine, the queries of
+# load_catalog_index run as greenlets on the event loop thread, and a thread lock
+# held across them deadlocks the loop as soon as two reloads overlap
+_publish_lock = threading.Lock()
+
+
+def _read_revision(db: Session) -> int:
+    return db.scalar(select(CatalogRevision.revision).where(CatalogRevision.id == 1)) or 0
+
+
+def load_catalog_index(db: Session) -> CatalogIndex:
+    """
+    (Re)loads the whole catalog into memory. Called at startup and when the
+    catalog revision has changed.
+
+    Concurrent reloads are allowed; each builds its own index and an index is
+    only published if it is not older than the current one.
+    """
+    global _index, _checked_at
+    # Revision first: if the catalog changes in between, the index is labelled
+    # with the older revision and simply reloaded at the next check
+    revision = _read_revision(db)
+    rows = db.execute(
+        select(ExerciseCatalog.id, ExerciseCatalog.name, ExerciseCatalog.equipment).order_by(ExerciseCatalog.id)
+    ).all()
+    index = CatalogIndex(revision, [tuple(row) for row in rows])
+
+    with _publish_lock:
+        if _index is None or index.revision >= _index.revision:
+            _index = index
+        _checked_at = time.monotonic()
+        return _index
+
+
+def cached_catalog_index() -> Optional[CatalogIndex]:
+    """
+    Returns the in-memory index if its revision was checked recently, else None
+    (the caller then goes through get_catalog_index with a session).
+    """
+    if _index is not None and time.monotonic() - _checked_at < CATALOG_REVISION_CHECK_INTERVAL:
+        return _index
+    return None
+
+
+def get_catalog_index(db: Session, force_check: bool = False) -> CatalogIndex:
+    """
+    Returns the in-memory catalog index, re-reading the revision counter at most
+    every CATALOG_REVISION_CHECK_INTERVAL seconds (or now, with force_check) and
+    reloading the catalog only if the revision changed.
+    """
+    global _checked_at
+    index = None if force_check else cached_catalog_index()
+    if index is not None:
+        return index
+
+    if _index is None or _read_revision(db) != _index.revision:
+        return load_catalog_index(db)
+    _checked_at = time.monotonic()
+    return _index
+
+
+async def current_catalog_revision(db) -> int:
+    """
+    Returns the catalog revision for the X-Catalog-Revision header, from the
+    in-memory index (revalidated like get_catalog_index). Call it before reading
+    the data the header is sent with, so the header is never newer than the data.
+
+    Args:
+        db: The route's session (AsyncSession or the sync session runner).
+    """
+    index = cached_catalog_index() or await db.run_sync(get_catalog_index)
+    return index.revision
+
+
+def bump_catalog_revision(db: Session) -> None:
+    """
+    Marks the catalog as changed so every service process reloads its index.
+    Call inside the transaction that changes the catalog.
+    """
+    updated = db.execute(
+        update(CatalogRevision).where(CatalogRevision.id == 1).values(revision=CatalogRevision.revision + 1)
+    ).rowcount
+    if not updated:
+        db.add(CatalogRevision(id=1, revision=1))
+
+
+def resolve_catalog_entries(db: Session, pairs: Iterable[Tuple[str, str]]) -> Dict[CatalogKey, Tuple[int, str, str]]:
+    """
+    Resolves (exercise name, equipment) pairs against the in-memory catalog index,
+    matching both case-insensitively. Normally no query is run.
+
+    Args:
+        db (Session): Database session, used only if the index must be revalidated.
+        pairs: (name, equipment) pairs as sent by the caller; duplicates are fine.
+
+    Returns:
+        dict: catalog_key(name, equipment) -> (catalog id, canonical name, canonical equipment).
+
+    Raises:
+        HTTPException: 400 listing every pair that is not in the catalog.
+    """
+    wanted = {catalog_key(name, equipment): (name, equipment) for name, equipment in pairs}
+    if not wanted:
+        return {}
+
+    index = get_catalog_index(db)
+    if any(key not in index.entries for key in wanted):
+        # The catalog may have changed since the last revision check
+        index = get_catalog_index(db, force_check=True)
+
+    missing = [pair for key, pair in wanted.items() if key not in index.entries]
+    if missing:
+        raise HTTPException(
+            status_code=400,
+            detail="Exercises not found in catalog: " + ", ".join(
+                f"'{name}' with equipment '{equipment}'" for name, equipment in missing
+            )
+        )
+    return {key: index.entries[key] for key in wanted}
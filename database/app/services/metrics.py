@@ -0,0 +1,82 @@
+import time
+from prometheus_client import CONTENT_TYPE_LATEST, Gauge, Histogram, generate_latest
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from app.services.observability import RequestMetricsMiddleware
+
+# Latency buckets (seconds) for requests
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Pool checkout waits are near zero unless the pool is exhausted
+POOL_WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time spent handling HTTP requests",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being handled",
+    ["method"],
+)
+
+POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a connection from the SQLAlchemy pool",
+    buckets=POOL_WAIT_BUCKETS,
+)
+
+POOL_CHECKED_OUT = Gauge(
+    "db_pool_connections_checked_out",
+    "Connections currently checked out of the SQLAlchemy pool",
+)
+
+METRICS_CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+
+class _CheckoutTimingMixin:
+    """
+    Records how long each pool checkout waits for a connection (including opening
+    a new one), i.e. the time a request is blocked on the pool.
+    """
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start)
+
+
+class InstrumentedQueuePool(_CheckoutTimingMixin, QueuePool):
+    """QueuePool of the sync engine with checkout wait timing."""
+
+
+class InstrumentedAsyncQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool of the async engine with checkout wait timing."""
+
+
+def instrument_pool(engine) -> None:
+    """
+    Exposes the engine pool's checked-out connection count as a gauge (read at scrape time).
+    """
+    POOL_CHECKED_OUT.set_function(lambda: engine.pool.checkedout())
+
+
+class MetricsMiddleware(RequestMetricsMiddleware):
+    """
+    Records the latency and in-flight count of every HTTP request into REQUEST_LATENCY
+    and REQUESTS_IN_PROGRESS (see observability.RequestMetricsMiddleware).
+    """
+
+    def __init__(self, app):
+        super().__init__(app, REQUEST_LATENCY, REQUESTS_IN_PROGRESS)
+
+
+def render_metrics() -> bytes:
+    """
+    Returns all metrics in the Prometheus text exposition format.
+    """
+    return generate_latest()
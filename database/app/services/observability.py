@@ -0,0 +1,190 @@
+# services/observability.py
+# Request tracing and HTTP request metrics shared by the backend, database and AI
+# services:
+# - a trace per request (trace ID joined across services via the X-Trace-Id header)
+#   with flat spans, summed up in a Server-Timing header and exported as JSON lines
+# - an ASGI middleware recording request latency and in-flight requests
+#
+# VENDORED FILE: the source is shared/observability.py at the repo root. Each
+# service is built from its own folder, so the file is copied into
+# <service>/app/services/observability.py by `python shared/vendor.py`; edit the
+# source and re-run that script. The test suite of every service (and of shared/)
+# fails if a copy is not byte-identical to the source.
+# Service-specific parts (metric definitions, SQL spans, downstream timings, the
+# exporter configuration) live in each service's metrics.py and tracing.py.
+
+import contextvars
+import json
+import re
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+# Header carrying the trace ID between services (set by the backend)
+TRACE_HEADER = "X-Trace-Id"
+
+# Accepted incoming trace IDs (anything else is replaced by a fresh one)
+_TRACE_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+_export_lock = threading.Lock()
+
+
+class Trace:
+    """
+    Spans recorded while handling one request. Spans are flat: each has a name,
+    its start offset and duration (ms) relative to the start of the request, and
+    free-form attributes.
+    """
+
+    def __init__(self, trace_id: str):
+        self.trace_id = trace_id
+        self.started_at = time.perf_counter()
+        self.spans: List[dict] = []
+
+    def add_span(self, name: str, start: float, end: float, **attributes) -> None:
+        self.spans.append({
+            "name": name,
+            "start_ms": round((start - self.started_at) * 1000, 3),
+            "duration_ms": round((end - start) * 1000, 3),
+            **({"attributes": attributes} if attributes else {}),
+        })
+
+
+# Trace of the request being handled, if any. Sync routes run in a worker thread
+# with a copy of the request's context, so they see the same Trace object.
+_current: contextvars.ContextVar[Optional[Trace]] = contextvars.ContextVar("trace", default=None)
+
+
+def start_trace(trace_id: Optional[str] = None) -> Trace:
+    """
+    Starts the trace of the current request (called by the tracing middleware).
+    An incoming trace ID is kept so spans of all services can be joined.
+    """
+    if not trace_id or not _TRACE_ID_PATTERN.match(trace_id):
+        trace_id = uuid.uuid4().hex
+    trace = Trace(trace_id)
+    _current.set(trace)
+    return trace
+
+
+def current_trace() -> Optional[Trace]:
+    return _current.get()
+
+
+def current_trace_id() -> Optional[str]:
+    trace = _current.get()
+    return trace.trace_id if trace else None
+
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[dict]:
+    """
+    Records the enclosed block as a span of the current trace (no-op outside a request).
+    Yields a dict; keys added to it are stored as span attributes.
+    """
+    trace = _current.get()
+    extra: Dict[str, object] = {}
+    start = time.perf_counter()
+    try:
+        yield extra
+    finally:
+        if trace is not None:
+            trace.add_span(name, start, time.perf_counter(), **attributes, **extra)
+
+
+def server_timing_header(trace: Trace) -> str:
+    """
+    Builds the Server-Timing header value: total time per span name (with the
+    number of spans when more than one), followed by the whole request.
+    """
+    totals: Dict[str, List[float]] = {}
+    for recorded in trace.spans:
+        totals.setdefault(recorded["name"], []).append(recorded["duration_ms"])
+
+    entries = []
+    for name, durations in totals.items():
+        entry = f"{name};dur={sum(durations):.1f}"
+        if len(durations) > 1:
+            entry += f';desc="{len(durations)} calls"'
+        entries.append(entry)
+    entries.append(f"total;dur={(time.perf_counter() - trace.started_at) * 1000:.1f}")
+    return ", ".join(entries)
+
+
+def write_trace(
+    trace: Trace,
+    service: str,
+    method: str,
+    path: str,
+    status_code: int,
+    exporter: str,
+    trace_file: str,
+) -> None:
+    """
+    Writes the finished trace as one JSON line to the exporter
+    ('stdout', 'file' -> trace_file, or 'none').
+    """
+    if exporter == "none":
+        return
+
+    line = json.dumps({
+        "service": service,
+        "trace_id": trace.trace_id,
+        "method": method,
+        "path": path,
+        "status_code": status_code,
+        "duration_ms": round((time.perf_counter() - trace.started_at) * 1000, 3),
+        "spans": trace.spans,
+    })
+    with _export_lock:
+        if exporter == "file":
+            with open(trace_file, "a") as f:
+                f.write(line + "\n")
+        else:
+            print(line, file=sys.stdout, flush=True)
+
+
+class RequestMetricsMiddleware:
+    """
+    ASGI middleware recording the latency and in-flight count of every HTTP request
+    into the given Prometheus histogram (labels: method, route, status) and gauge
+    (label: method).
+
+    Requests are labelled with the matched route template (e.g. /plan/{plan_id}),
+    never the raw path, so label cardinality stays bounded. Written as plain ASGI
+    rather than @app.middleware("http") to keep the per-request cost minimal.
+    """
+
+    def __init__(self, app, latency, in_progress):
+        self.app = app
+        self.latency = latency
+        self.in_progress = in_progress
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_progress = self.in_progress.labels(method)
+        in_progress.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_progress.dec()
+            # FastAPI stores the matched route in the scope during routing
+            route = scope.get("route")
+            template = getattr(route, "path_format", None) or "unmatched"
+            self.latency.labels(method, template, str(status_code)).observe(time.perf_counter() - start)
@@ -0,0 +1,27 @@
+import base64
+import json
+from datetime import datetime
+from typing import Tuple
+from fastapi import HTTPException
+from app.models import WorkoutPlan
+
+
+def encode_plan_cursor(plan: WorkoutPlan) -> str:
+    """
+    Encodes the keyset position (created_at, id) of a plan as an opaque URL-safe cursor.
+    """
+    raw = json.dumps([plan.created_at.isoformat(), plan.id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_plan_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decodes a cursor produced by encode_plan_cursor.
+    Raises HTTP 400 if the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, plan_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), int(plan_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
@@ -0,0 +1,149 @@
+import os
+from typing import Dict, Iterable, List
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+from app.models import ExerciseCatalog, PlanDocument, WorkoutDay, WorkoutExercise, WorkoutPlan
+from app.services.catalog import bump_catalog_revision
+from app.services.plan_loading import plan_load_options
+from app.services.serializers import serialize_plan
+
+# Plans rebuilt per batch when backfilling or after a catalog rename
+PLAN_DOCUMENT_REBUILD_BATCH_SIZE = int(os.getenv("PLAN_DOCUMENT_REBUILD_BATCH_SIZE", "200"))
+
+# Catalog columns copied into plan documents
+_DOCUMENT_CATALOG_FIELDS = ("name", "equipment")
+
+# Session.info key of catalog entries renamed in the current transaction
+_RENAMED_CATALOG_IDS = "renamed_catalog_ids"
+
+
+def plan_documents(db: Session, plans: List[WorkoutPlan]) -> List[dict]:
+    """
+    Returns the full serialized form of each plan (same shape as serialize_plan),
+    in the order given, read from the materialized documents with the current
+    status overlaid.
+
+    Plans without a document yet (created before documents existed and not
+    backfilled) are built from the normalized tables instead.
+    """
+    if not plans:
+        return []
+
+    plan_ids = [plan.id for plan in plans]
+    documents: Dict[int, dict] = dict(
+        db.execute(
+            select(PlanDocument.plan_id, PlanDocument.document).where(PlanDocument.plan_id.in_(plan_ids))
+        ).all()
+    )
+
+    missing = [plan_id for plan_id in plan_ids if plan_id not in documents]
+    if missing:
+        documents.update(build_plan_documents(db, missing))
+
+    # Status is the only field that changes after creation
+    return [{**documents[plan.id], "status": plan.status} for plan in plans]
+
+
+def build_plan_documents(db: Session, plan_ids: Iterable[int]) -> Dict[int, dict]:
+    """
+    Serializes plans from the normalized tables. Returns plan ID -> document.
+    """
+    plans = (
+        db.query(WorkoutPlan)
+        .options(plan_load_options(many=True))
+        .filter(WorkoutPlan.id.in_(list(plan_ids)))
+        .all()
+    )
+    return {plan.id: serialize_plan(plan) for plan in plans}
+
+
+def rebuild_plan_documents(db: Session, plan_ids: Iterable[int]) -> int:
+    """
+    Rewrites the documents of the given plans from the normalized tables (creating
+    missing ones), in batches. Does not commit. Returns the number of plans rebuilt.
+    """
+    plan_ids = list(plan_ids)
+    rebuilt = 0
+    for start in range(0, len(plan_ids), PLAN_DOCUMENT_REBUILD_BATCH_SIZE):
+        batch = plan_ids[start:start + PLAN_DOCUMENT_REBUILD_BATCH_SIZE]
+        built = build_plan_documents(db, batch)
+        existing = {
+            document.plan_id: document
+            for document in db.query(PlanDocument).filter(PlanDocument.plan_id.in_(batch))
+        }
+        for plan_id, document in built.items():
+            if plan_id in existing:
+                existing[plan_id].document = document
+            else:
+                db.add(PlanDocument(plan_id=plan_id, document=document))
+        rebuilt += len(built)
+        db.flush()
+    return rebuilt
+
+
+def backfill_plan_documents(db: Session) -> int:
+    """
+    Creates the documents of plans that have none (plans stored before documents
+    were introduced) and commits. Returns the number of documents created.
+    """
+    missing = db.scalars(
+        select(WorkoutPlan.id)
+        .outerjoin(PlanDocument, PlanDocument.plan_id == WorkoutPlan.id)
+        .where(PlanDocument.plan_id.is_(None))
+    ).all()
+    created = rebuild_plan_documents(db, missing)
+    db.commit()
+    return created
+
+
+def plans_using_catalog_entries(db: Session, catalog_ids: Iterable[int]) -> List[int]:
+    """
+    Returns the IDs of the plans with at least one exercise from the given catalog entries.
+    """
+    return db.scalars(
+        select(WorkoutDay.plan_id)
+        .join(WorkoutExercise, WorkoutExercise.day_id == WorkoutDay.id)
+        .where(WorkoutExercise.exercise_catalog_id.in_(list(catalog_ids)))
+        .distinct()
+    ).all()
+
+
+def _record_catalog_renames(session: Session, flush_context) -> None:
+    # Runs after every flush, while attribute history is still available
+    for obj in session.dirty:
+        if isinstance(obj, ExerciseCatalog):
+            state = inspect(obj)
+            if any(state.attrs[field].history.has_changes() for field in _DOCUMENT_CATALOG_FIELDS):
+                session.info.setdefault(_RENAMED_CATALOG_IDS, set()).add(obj.id)
+
+
+def _rebuild_after_catalog_renames(session: Session) -> None:
+    # Runs before commit (and before commit's own flush, so flush first to see
+    # pending renames); the rebuilt documents commit with the rename
+    session.flush()
+    renamed = session.info.pop(_RENAMED_CATALOG_IDS, None)
+    if not renamed:
+        return
+
+    rebuild_plan_documents(session, plans_using_catalog_entries(session, renamed))
+
+    # Renames also change the in-memory catalog index of every service process
+    bump_catalog_revision(session)
+
+
+def _forget_catalog_renames(session: Session) -> None:
+    session.info.pop(_RENAMED_CATALOG_IDS, None)
+
+
+def register_plan_document_hooks() -> None:
+    """
+    Keeps plan documents in sync with catalog renames made through any ORM Session
+    (sync or async): changing the name or equipment of an ExerciseCatalog entry
+    rebuilds the documents of every plan that uses it, in the same transaction.
+    Bulk UPDATE statements on exercise_catalog bypass the ORM and are not seen;
+    call rebuild_plan_documents for the affected plans in that case.
+    """
+    if not event.contains(Session, "after_flush", _record_catalog_renames):
+        event.listen(Session, "after_flush", _record_catalog_renames)
+        event.listen(Session, "before_commit", _rebuild_after_catalog_renames)
+        event.listen(Session, "after_rollback", _forget_catalog_renames)
@@ -0,0 +1,75 @@
+import json
+import os
+from typing import AsyncIterator, Iterator, Optional, Union
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+from app.db_connection import DB_ASYNC, AsyncSessionLocal, SessionLocal
+from app.models import WorkoutPlan, WorkoutDay, WorkoutExercise
+from app.services.serializers import serialize_plan
+
+# Number of plans fetched from the server-side cursor per batch
+PLAN_EXPORT_BATCH_SIZE = int(os.getenv("PLAN_EXPORT_BATCH_SIZE", "100"))
+
+
+def user_plans_ndjson(user_id: int, status: Optional[str] = None) -> Union[Iterator[str], AsyncIterator[str]]:
+    """
+    Returns the NDJSON export stream of a user's plans for the configured
+    database mode (async engine, or sync engine iterated in the threadpool).
+    """
+    if DB_ASYNC:
+        return astream_user_plans_ndjson(user_id, status)
+    return stream_user_plans_ndjson(user_id, status)
+
+
+def _export_query(user_id: int, status: Optional[str]):
+    query = (
+        select(WorkoutPlan)
+        .where(WorkoutPlan.user_id == user_id)
+        .options(
+            selectinload(WorkoutPlan.days)
+            .selectinload(WorkoutDay.exercises)
+            .joinedload(WorkoutExercise.catalogical_exercise)
+        )
+        .order_by(WorkoutPlan.created_at.desc(), WorkoutPlan.id.desc())
+        .execution_options(yield_per=PLAN_EXPORT_BATCH_SIZE)
+    )
+    if status:
+        query = query.where(WorkoutPlan.status == status)
+    return query
+
+
+def stream_user_plans_ndjson(user_id: int, status: Optional[str] = None) -> Iterator[str]:
+    """
+    Yields every workout plan of a user, newest first, as newline-delimited JSON
+    (one serialize_plan document per line).
+
+    Plans are read through a server-side cursor in batches of PLAN_EXPORT_BATCH_SIZE,
+    with days and exercises loaded per batch (selectinload; joined eager loading of
+    collections cannot be combined with yield_per), so memory use does not grow with
+    the length of the history.
+
+    The generator owns its session: it outlives the request handler, so it cannot
+    use the per-request session from get_db.
+    """
+    db = SessionLocal()
+    try:
+        # The identity map holds objects weakly, so a serialized batch is released
+        # as soon as the next one is loaded
+        for partition in db.scalars(_export_query(user_id, status)).partitions():
+            for plan in partition:
+                yield json.dumps(serialize_plan(plan)) + "\n"
+    finally:
+        db.close()
+
+
+async def astream_user_plans_ndjson(user_id: int, status: Optional[str] = None) -> AsyncIterator[str]:
+    """
+    Async counterpart of stream_user_plans_ndjson, reading through the async
+    engine's server-side cursor (AsyncSession.stream_scalars).
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.stream_scalars(_export_query(user_id, status))
+        async for partition in result.partitions():
+            # Relationships were eager-loaded with the batch, so serializing does no I/O
+            for plan in partition:
+                yield json.dumps(serialize_plan(plan)) + "\n"
@@ -0,0 +1,31 @@
+import os
+from sqlalchemy.orm import joinedload, selectinload
+from app.models import WorkoutPlan, WorkoutDay, WorkoutExercise
+
+# How plan reads eager-load days, exercises and catalog entries:
+# - auto: by query shape (default). Listings load the collections with selectinload
+#   (one extra query per level, no plans x days x exercises cartesian product);
+#   a single plan is small enough that one joined query is cheaper.
+# - selectin: selectinload for the collections everywhere
+# - joined: joinedload everywhere (one query; cartesian rows de-duplicated in Python)
+# The catalog entry of an exercise is many-to-one, so it is always joined.
+PLAN_LOADER_STRATEGY = os.getenv("PLAN_LOADER_STRATEGY", "auto").lower()
+
+
+def plan_load_options(many: bool):
+    """
+    Returns the loader option that eager-loads a plan's days, exercises and their
+    catalog entries, chosen by PLAN_LOADER_STRATEGY.
+
+    Args:
+        many (bool): True if the query returns several plans (listings, batches).
+    """
+    strategy = PLAN_LOADER_STRATEGY
+    if strategy == "auto":
+        strategy = "selectin" if many else "joined"
+
+    if strategy == "joined":
+        days = joinedload(WorkoutPlan.days).joinedload(WorkoutDay.exercises)
+    else:
+        days = selectinload(WorkoutPlan.days).selectinload(WorkoutDay.exercises)
+    return days.joinedload(WorkoutExercise.catalogical_exercise)
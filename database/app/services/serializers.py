@@ -30,4 +30,19 @@ def serialize_plan(plan: WorkoutPlan) -> Dict:
                 ]
             } for day in plan.days
         ]
-    }
\ No newline at end of file
+    }
+
+
+def serialize_plan_summary(plan: WorkoutPlan) -> Dict:
+    """
+    Transforms a WorkoutPlan into its header fields only (no days or exercises),
+    matching the WorkoutPlanSummaryResponse Pydantic schema.
+    """
+    return {
+        "id": plan.id,
+        "goal": plan.goal,
+        "duration_weeks": plan.duration_weeks,
+        "status": plan.status,
+        "experience_level": plan.experience_level,
+        "created_at": plan.created_at.isoformat() if plan.created_at else None
+    }
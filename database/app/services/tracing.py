@@ -0,0 +1,44 @@
+import os
+import time
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.services.observability import (
+    TRACE_HEADER,
+    Trace,
+    current_trace,
+    server_timing_header,
+    span,
+    start_trace,
+    write_trace,
+)
+
+SERVICE_NAME = "database"
+
+# Where finished traces are written: "none", "stdout" or "file" (-> TRACE_FILE)
+TRACE_EXPORTER = os.getenv("TRACE_EXPORTER", "none")
+TRACE_FILE = os.getenv("TRACE_FILE", "traces.jsonl")
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Records every SQL statement executed through the engine as an 'sql' span.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("trace_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        start = conn.info["trace_query_start"].pop()
+        trace = current_trace()
+        if trace is not None:
+            # Statements are parameterized, so no values end up in the trace
+            trace.add_span("sql", start, time.perf_counter(), statement=" ".join(statement.split())[:200])
+
+
+def export_trace(trace: Trace, method: str, path: str, status_code: int) -> None:
+    """
+    Writes the finished trace as one JSON line to the configured exporter.
+    """
+    write_trace(trace, SERVICE_NAME, method, path, status_code, TRACE_EXPORTER, TRACE_FILE)
@@ -0,0 +1,64 @@
+# migrations/env.py
+# Alembic environment of the database service: migrations run against DATABASE_URL
+# with the sync driver, and autogenerate compares against the models in app/models.py.
+
+from logging.config import fileConfig
+from alembic import context
+from sqlalchemy import create_engine, pool
+from app.db_connection import DATABASE_URL
+from app.models import Base
+
+config = context.config
+
+# Logging setup from alembic.ini (skipped when called from setup_db, which passes no file)
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def run_migrations_offline() -> None:
+    """
+    Emits the migration SQL to stdout instead of running it (alembic upgrade --sql).
+    """
+    context.configure(
+        url=config.get_main_option("sqlalchemy.url") or DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """
+    Runs the migrations on a dedicated connection (or the one passed by setup_db).
+    """
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _run(connection)
+        return
+
+    connectable = create_engine(config.get_main_option("sqlalchemy.url") or DATABASE_URL, poolclass=pool.NullPool)
+    with connectable.connect() as connection:
+        _run(connection)
+
+
+def _run(connection) -> None:
+    # render_as_batch: SQLite can only alter tables by copying them
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        render_as_batch=connection.dialect.name == "sqlite",
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,114 @@
+"""initial schema
+
+The schema as created by Base.metadata.create_all before migrations were
+introduced. Existing databases are stamped at this revision by setup_db.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 03:14:51.553560
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('catalog_revision',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('revision', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('exercise_catalog',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('primary_muscle', sa.String(), nullable=True),
+    sa.Column('secondary_muscle', sa.String(), nullable=True),
+    sa.Column('equipment', sa.String(), nullable=False),
+    sa.Column('difficulty', sa.String(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    op.create_index('ix_exercise_catalog_id', 'exercise_catalog', ['id'], unique=False)
+
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('username', sa.String(), nullable=False),
+    sa.Column('hashed_password', sa.String(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_users_id', 'users', ['id'], unique=False)
+    op.create_index('ix_users_username', 'users', ['username'], unique=True)
+
+    op.create_table('user_profiles',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('age', sa.Integer(), nullable=True),
+    sa.Column('height_cm', sa.Integer(), nullable=True),
+    sa.Column('weight_kg', sa.Integer(), nullable=True),
+    sa.Column('experience_level', sa.String(), nullable=True),
+    sa.Column('fitness_goal', sa.String(), nullable=True),
+    sa.Column('equipment', sa.JSON(), nullable=True),
+    sa.Column('health_notes', sa.String(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id')
+    )
+    op.create_index('ix_user_profiles_id', 'user_profiles', ['id'], unique=False)
+
+    op.create_table('workout_plans',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('duration_weeks', sa.Integer(), nullable=True),
+    sa.Column('goal', sa.String(), nullable=True),
+    sa.Column('experience_level', sa.String(), nullable=True),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_workout_plans_id', 'workout_plans', ['id'], unique=False)
+
+    op.create_table('workout_days',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('plan_id', sa.Integer(), nullable=False),
+    sa.Column('day_number', sa.Integer(), nullable=False),
+    sa.Column('day_name', sa.String(), nullable=True),
+    sa.Column('focus', sa.String(), nullable=True),
+    sa.ForeignKeyConstraint(['plan_id'], ['workout_plans.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_workout_days_id', 'workout_days', ['id'], unique=False)
+
+    op.create_table('workout_exercises',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('day_id', sa.Integer(), nullable=False),
+    sa.Column('exercise_catalog_id', sa.Integer(), nullable=False),
+    sa.Column('sets', sa.Integer(), nullable=True),
+    sa.Column('reps', sa.Integer(), nullable=True),
+    sa.Column('notes', sa.String(), nullable=True),
+    sa.ForeignKeyConstraint(['day_id'], ['workout_days.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['exercise_catalog_id'], ['exercise_catalog.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_workout_exercises_id', 'workout_exercises', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('workout_exercises')
+    op.drop_table('workout_days')
+    op.drop_table('workout_plans')
+    op.drop_table('user_profiles')
+    op.drop_table('users')
+    op.drop_table('exercise_catalog')
+    op.drop_table('catalog_revision')
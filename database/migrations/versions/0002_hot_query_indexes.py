@@ -0,0 +1,48 @@
+"""hot query indexes
+
+Indexes for the queries run on every request:
+- lower(username): users are looked up case-insensitively (login, generation context)
+- (user_id, created_at DESC, id DESC): latest plan and keyset-paginated plan listings
+- user_id WHERE status = 'active': archiving the active plans on every plan insert
+- workout_days.plan_id, workout_exercises.day_id: loading and cascading a plan's children
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 03:14:53.325005
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_users_username_lower', 'users', [sa.text('lower(username)')], unique=False)
+    op.create_index(
+        'ix_workout_plans_user_id_created_at', 'workout_plans',
+        ['user_id', sa.text('created_at DESC'), sa.text('id DESC')], unique=False
+    )
+    op.create_index(
+        'ix_workout_plans_user_id_active', 'workout_plans', ['user_id'], unique=False,
+        postgresql_where=sa.text("status = 'active'"), sqlite_where=sa.text("status = 'active'")
+    )
+    op.create_index('ix_workout_days_plan_id', 'workout_days', ['plan_id'], unique=False)
+    op.create_index('ix_workout_exercises_day_id', 'workout_exercises', ['day_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_workout_exercises_day_id', table_name='workout_exercises')
+    op.drop_index('ix_workout_days_plan_id', table_name='workout_days')
+    op.drop_index('ix_workout_plans_user_id_active', table_name='workout_plans')
+    op.drop_index('ix_workout_plans_user_id_created_at', table_name='workout_plans')
+    op.drop_index('ix_users_username_lower', table_name='users')
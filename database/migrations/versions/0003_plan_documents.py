@@ -0,0 +1,41 @@
+"""plan documents
+
+Materialized plan documents (plan_documents) and the index used to find the
+plans referencing a catalog entry. Existing plans get their documents from
+setup_db (backfill_plan_documents) after the upgrade.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 04:02:11.418290
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('plan_documents',
+    sa.Column('plan_id', sa.Integer(), nullable=False),
+    sa.Column('document', sa.JSON(), nullable=False),
+    sa.ForeignKeyConstraint(['plan_id'], ['workout_plans.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('plan_id')
+    )
+    op.create_index(
+        'ix_workout_exercises_exercise_catalog_id', 'workout_exercises', ['exercise_catalog_id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_workout_exercises_exercise_catalog_id', table_name='workout_exercises')
+    op.drop_table('plan_documents')
@@ -0,0 +1,18 @@
+# tests/conftest.py
+# Points the database service at a fresh SQLite file (async engine on) before
+# any app module is imported, and migrates and seeds it once per test session.
+
+import os
+import tempfile
+
+# TEST_DATABASE_URL may point at a scratch database instead (tests insert rows)
+os.environ["DATABASE_URL"] = os.getenv("TEST_DATABASE_URL") or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'tests.db')}"
+os.environ["DB_ASYNC"] = "true"
+
+import pytest
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    from app.scripts.setup_db import setup_database
+    setup_database()
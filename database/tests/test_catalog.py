@@ -0,0 +1,51 @@
+# tests/test_catalog.py
+# Run from the database/ directory: python -m pytest
+
+import asyncio
+import threading
+from app.db_connection import AsyncSessionLocal, SessionLocal
+from app.services import catalog
+
+
+def _run_with_timeout(coroutine_function, timeout: float = 10.0):
+    # A deadlocked event loop ignores asyncio timeouts, so run it in its own
+    # thread and give up on the thread instead
+    outcome = {}
+
+    def run():
+        try:
+            outcome["result"] = asyncio.run(coroutine_function())
+        except BaseException as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "event loop deadlocked"
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["result"]
+
+
+def test_concurrent_reloads_through_run_sync_do_not_deadlock():
+    async def reload_concurrently():
+        async def reload():
+            async with AsyncSessionLocal() as db:
+                return await db.run_sync(catalog.load_catalog_index)
+
+        return await asyncio.gather(*(reload() for _ in range(5)))
+
+    indexes = _run_with_timeout(reload_concurrently)
+    assert all(index.entries for index in indexes)
+    assert catalog.cached_catalog_index() is not None
+
+
+def test_reload_never_publishes_an_older_revision():
+    db = SessionLocal()
+    try:
+        current = catalog.load_catalog_index(db)
+        catalog._index = catalog.CatalogIndex(current.revision + 1, [])
+        assert catalog.load_catalog_index(db).revision == current.revision + 1
+    finally:
+        catalog._index = None
+        db.close()
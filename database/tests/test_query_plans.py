@@ -0,0 +1,149 @@
+# tests/test_query_plans.py
+# Checks that the hot queries of the database service use their indexes
+# (plan reads by ID are primary-key lookups on workout_plans and plan_documents).
+# The real route helpers are run against the migrated test database while their
+# SQL is captured, and every captured statement is EXPLAINed with its own parameters.
+#
+# Run from the database/ directory: python -m pytest
+# Set TEST_DATABASE_URL to a scratch Postgres database to check Postgres plans;
+# sequential scans are disabled for the EXPLAINs there, since on a small table the
+# planner would rightly prefer them even when the index is usable.
+
+import json
+import uuid
+import pytest
+from sqlalchemy import event
+from app.db_connection import SessionLocal, engine
+from app.models import User
+from app.routers.plan_routes import (
+    _create_workout_plan,
+    _get_latest_workout_plan_for_user,
+    _get_user_workout_plans,
+)
+from app.routers.user_routes import _get_generation_context, _get_user_by_username
+from app.schemas.plan_schemas import WorkoutPlanCreate
+from app.services.catalog import load_catalog_index
+from app.services.plan_documents import build_plan_documents, plans_using_catalog_entries
+
+# (check name, indexes the captured statements must use between them)
+EXPECTED_INDEXES = {
+    "user by username": {"ix_users_username_lower"},
+    "generation context": {"ix_users_username_lower", "ix_workout_plans_user_id_created_at"},
+    "latest plan": {"ix_workout_plans_user_id_created_at"},
+    "list plans (keyset page)": {"ix_workout_plans_user_id_created_at"},
+    "archive active plans": {"ix_workout_plans_user_id_active"},
+    "plan documents from tables": {"ix_workout_days_plan_id", "ix_workout_exercises_day_id"},
+    "plans using a catalog entry": {"ix_workout_exercises_exercise_catalog_id"},
+}
+
+
+def _indexes_used(connection, statement: str, parameters) -> set:
+    """
+    Returns the names of the indexes in the plan of one statement.
+    """
+    if connection.dialect.name == "postgresql":
+        plan = connection.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        found = set()
+
+        def walk(node):
+            if isinstance(node, dict):
+                if "Index Name" in node:
+                    found.add(node["Index Name"])
+                for value in node.values():
+                    walk(value)
+            elif isinstance(node, list):
+                for value in node:
+                    walk(value)
+
+        walk(plan)
+        return found
+
+    # SQLite: rows like "SEARCH users USING INDEX ix_users_username_lower (<expr>=?)"
+    rows = connection.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).all()
+    found = set()
+    for row in rows:
+        words = row[-1].split()
+        if "INDEX" in words:
+            found.add(words[words.index("INDEX") + 1])
+    return found
+
+
+@pytest.fixture(scope="module")
+def captured():
+    """
+    (statement, parameters) of every statement run through the sync engine
+    since the last clear().
+    """
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not executemany:
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    yield statements
+    event.remove(engine, "before_cursor_execute", capture)
+
+
+@pytest.fixture(scope="module")
+def checks(captured):
+    """
+    Check name -> callable running the helper under test with captured SQL.
+    """
+    db = SessionLocal()
+    load_catalog_index(db)
+    username = f"Explain_{uuid.uuid4().hex[:8]}"
+    user = User(username=username, hashed_password="not-a-real-hash")
+    db.add(user)
+    db.commit()
+    user_id = user.id
+    db.close()
+
+    plan = WorkoutPlanCreate(
+        user_id=user_id, duration_weeks=4, goal="Build muscle", experience_level="Intermediate",
+        days=[{"day_number": 1, "day_name": "Day 1", "focus": None, "exercises": [
+            {"exercise_name": "Deadlift", "equipment": "Barbell", "sets": 3, "reps": 5, "notes": None},
+        ]}],
+    )
+
+    def run(helper, *helper_args):
+        db = SessionLocal()
+        try:
+            captured.clear()
+            return helper(db, *helper_args)
+        finally:
+            db.close()
+
+    # Three plans so that listings have a second page
+    plan_ids = [run(_create_workout_plan, plan, False)["plan_id"] for _ in range(3)]
+    _, cursor = run(_get_user_workout_plans, user_id, None, "summary", 1, None)
+
+    return {
+        "user by username": lambda: run(_get_user_by_username, username.upper()),
+        "generation context": lambda: run(_get_generation_context, username.lower()),
+        "latest plan": lambda: run(_get_latest_workout_plan_for_user, user_id),
+        "list plans (keyset page)": lambda: run(_get_user_workout_plans, user_id, None, "full", 1, cursor),
+        "archive active plans": lambda: run(_create_workout_plan, plan, False),
+        "plan documents from tables": lambda: run(build_plan_documents, plan_ids[:2]),
+        "plans using a catalog entry": lambda: run(plans_using_catalog_entries, [1]),
+    }
+
+
+@pytest.mark.parametrize("name", list(EXPECTED_INDEXES))
+def test_hot_query_uses_its_index(name, checks, captured):
+    checks[name]()
+    statements = list(captured)
+    assert statements, f"{name}: no SQL captured"
+
+    used = set()
+    with engine.connect() as connection:
+        if connection.dialect.name == "postgresql":
+            connection.exec_driver_sql("SET enable_seqscan = off")
+        for statement, parameters in statements:
+            used |= _indexes_used(connection, statement, parameters)
+        connection.rollback()
+
+    missing = EXPECTED_INDEXES[name] - used
+    assert not missing, f"{name} uses {', '.join(sorted(used)) or 'no index'}; missing {', '.join(sorted(missing))}"
@@ -0,0 +1,17 @@
+# tests/test_vendored_observability.py
+# Run from the service directory: python -m pytest
+
+import os
+import subprocess
+import sys
+import pytest
+
+VENDOR_SCRIPT = os.path.join(os.path.dirname(__file__), "..", "..", "shared", "vendor.py")
+
+
+@pytest.mark.skipif(not os.path.exists(VENDOR_SCRIPT), reason="shared/ is not part of this checkout (e.g. a service image)")
+def test_vendored_observability_matches_shared_source():
+    # app/services/observability.py is copied from shared/observability.py;
+    # a copy edited in place (or a source edited without re-vendoring) fails here
+    result = subprocess.run([sys.executable, VENDOR_SCRIPT, "--check"], capture_output=True, text=True)
+    assert result.returncode == 0, result.stdout + "run: python shared/vendor.py"
@@ -0,0 +1,19 @@
+# shared/tests/test_vendored_copies.py
+# Run from the repo root: python -m pytest shared
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vendor import VENDORED, outdated_copies
+
+
+def test_every_service_has_a_copy():
+    for source, copies in VENDORED.items():
+        services = {copy.split("/", 1)[0] for copy in copies}
+        assert services == {"backend", "database", "ai-service"}, source
+
+
+def test_copies_are_byte_identical_to_the_source():
+    assert outdated_copies() == [], "run: python shared/vendor.py"
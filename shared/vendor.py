@@ -0,0 +1,67 @@
+# shared/vendor.py
+# Copies the shared modules into every service that uses them. Each service's
+# Docker build context is its own folder, so shared code cannot be imported from
+# the repo root and is vendored instead: edit the file in shared/, then run this.
+#
+# Usage (from the repo root):
+#   python shared/vendor.py          # write the copies
+#   python shared/vendor.py --check  # exit with status 1 if a copy differs
+
+import argparse
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Shared source (relative to shared/) -> copies (relative to the repo root)
+VENDORED = {
+    "observability.py": [
+        "backend/app/services/observability.py",
+        "database/app/services/observability.py",
+        "ai-service/app/services/observability.py",
+    ],
+}
+
+
+def outdated_copies() -> list:
+    """
+    Returns the copies (paths relative to the repo root) that differ from their source.
+    """
+    outdated = []
+    for source, copies in VENDORED.items():
+        with open(os.path.join(ROOT, "shared", source), "rb") as f:
+            content = f.read()
+        for copy in copies:
+            path = os.path.join(ROOT, copy)
+            if not os.path.exists(path):
+                outdated.append(copy)
+                continue
+            with open(path, "rb") as f:
+                if f.read() != content:
+                    outdated.append(copy)
+    return outdated
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Copy shared modules into the services")
+    parser.add_argument("--check", action="store_true", help="only report copies that differ from their source")
+    args = parser.parse_args()
+
+    outdated = outdated_copies()
+    if args.check:
+        for copy in outdated:
+            print(f"out of date: {copy}")
+        sys.exit(1 if outdated else 0)
+
+    for source, copies in VENDORED.items():
+        with open(os.path.join(ROOT, "shared", source), "rb") as f:
+            content = f.read()
+        for copy in copies:
+            if copy in outdated:
+                with open(os.path.join(ROOT, copy), "wb") as f:
+                    f.write(content)
+                print(f"updated {copy}")
+
+
+if __name__ == "__main__":
+    main()